@@ -8,6 +8,8 @@ from app.db.base import Base
 from app.db.models.user import User
 from app.db.models.quiz import Quiz
 from app.db.models.feedback import Feedback
+from app.db.models.llm_cache import LLMResponseCacheEntry
+from app.db.models.job import Job
 
 
 # this is the Alembic Config object, which provides
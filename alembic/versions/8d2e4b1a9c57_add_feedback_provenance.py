@@ -0,0 +1,34 @@
+"""add feedback provenance
+
+Revision ID: 8d2e4b1a9c57
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-18 10:41:05.530127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e4b1a9c57'
+down_revision: Union[str, Sequence[str], None] = '3f1c9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('feedbacks', sa.Column('source', sa.String(), server_default='llm', nullable=False))
+    op.add_column('feedbacks', sa.Column('source_feedback_id', sa.UUID(), nullable=True))
+    op.add_column('feedbacks', sa.Column('cache_similarity', sa.Float(), nullable=True))
+    op.create_foreign_key('fk_feedbacks_source_feedback_id', 'feedbacks', 'feedbacks', ['source_feedback_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('fk_feedbacks_source_feedback_id', 'feedbacks', type_='foreignkey')
+    op.drop_column('feedbacks', 'cache_similarity')
+    op.drop_column('feedbacks', 'source_feedback_id')
+    op.drop_column('feedbacks', 'source')
@@ -0,0 +1,28 @@
+"""add role to users
+
+Revision ID: a7e3d5c92f18
+Revises: f4c8a2e6b913
+Create Date: 2026-10-18 21:12:47.305126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7e3d5c92f18'
+down_revision: Union[str, Sequence[str], None] = 'f4c8a2e6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('role', sa.String(), server_default='student', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'role')
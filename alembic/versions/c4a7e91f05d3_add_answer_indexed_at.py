@@ -0,0 +1,35 @@
+"""add answers.indexed_at for write-behind indexing
+
+Revision ID: c4a7e91f05d3
+Revises: 8d2e4b1a9c57
+Create Date: 2026-10-18 12:03:27.904611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e91f05d3'
+down_revision: Union[str, Sequence[str], None] = '8d2e4b1a9c57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('answers', sa.Column('indexed_at', sa.TIMESTAMP(), nullable=True))
+    # Existing answers were indexed inline before this migration.
+    op.execute("UPDATE answers SET indexed_at = created_at")
+    op.create_index(
+        'ix_answers_pending_index', 'answers', ['created_at'],
+        unique=False, postgresql_where=sa.text('indexed_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_answers_pending_index', table_name='answers')
+    op.drop_column('answers', 'indexed_at')
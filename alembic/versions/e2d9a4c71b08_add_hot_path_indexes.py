@@ -0,0 +1,45 @@
+"""add indexes for quiz, question and answer lookups
+
+Revision ID: e2d9a4c71b08
+Revises: 5b8f2c6e1d40
+Create Date: 2026-10-18 15:22:48.370512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2d9a4c71b08'
+down_revision: Union[str, Sequence[str], None] = '5b8f2c6e1d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, and
+    # can't run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_quizzes_user_id_created_at', 'quizzes', ['user_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_questions_quiz_id', 'questions', ['quiz_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_answers_quiz_id_user_id', 'answers', ['quiz_id', 'user_id'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_answers_quiz_id_user_id', table_name='answers', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_questions_quiz_id', table_name='questions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_quizzes_user_id_created_at', table_name='quizzes', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,28 @@
+"""add available_at to jobs for retry backoff
+
+Revision ID: f4c8a2e6b913
+Revises: e2d9a4c71b08
+Create Date: 2026-10-18 18:05:31.640218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a2e6b913'
+down_revision: Union[str, Sequence[str], None] = 'e2d9a4c71b08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('available_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('jobs', 'available_at')
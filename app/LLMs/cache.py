@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.db.models.llm_cache import LLMResponseCacheEntry
+from app.db.session import SessionLocal
+
+
+def response_cache_key(model: str, prompt: str, params: dict) -> str:
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    raw = json.dumps([model, prompt_hash, params], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _utcnow() -> datetime:
+    # expires_at is a naive TIMESTAMP holding UTC.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class CacheBackend(ABC):
+    """Persistent tier behind the in-memory LRU."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, model: str, value: str, ttl_seconds: Optional[float]) -> None:
+        ...
+
+
+class SQLCacheBackend(CacheBackend):
+    """Stores responses in the `llm_response_cache` table (Postgres or SQLite)."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def get(self, key: str) -> Optional[str]:
+        with self.session_factory() as db:
+            entry = db.get(LLMResponseCacheEntry, key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at < _utcnow():
+                db.delete(entry)
+                db.commit()
+                return None
+            return entry.response
+
+    def set(self, key: str, model: str, value: str, ttl_seconds: Optional[float]) -> None:
+        expires_at = _utcnow() + timedelta(seconds=ttl_seconds) if ttl_seconds else None
+        with self.session_factory() as db:
+            db.merge(LLMResponseCacheEntry(key=key, model=model, response=value, expires_at=expires_at))
+            db.commit()
+
+
+class ResponseCache:
+    """
+    Exact-match cache for LLM completions.
+
+    A bounded in-memory LRU with TTL sits in front of an optional
+    persistent backend. Concurrent misses for the same key are collapsed
+    so only one upstream call runs (single-flight); followers wait on the
+    leader's result.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: Optional[float] = 86400, backend: Optional[CacheBackend] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._lru: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._lru.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at and expires_at < time.monotonic():
+                del self._lru[key]
+                return None
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _set_memory(self, key: str, value: str):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            self._lru[key] = (expires_at, value)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _settle(self, key: str, future: Future, value: Optional[str] = None, error: Optional[BaseException] = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(value)
+
+    def _count_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def _from_backend(self, key: str) -> Optional[str]:
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        if value is not None:
+            self._set_memory(key, value)
+            with self._lock:
+                self.backend_hits += 1
+        return value
+
+    def get_or_compute(self, key: str, model: str, compute: Callable[[], str]) -> str:
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+
+        future, leader = self._claim(key)
+        if not leader:
+            return future.result()
+
+        try:
+            value = self._from_backend(key)
+            if value is None:
+                self._count_miss()
+                value = compute()
+                self._set_memory(key, value)
+                if self.backend is not None:
+                    self.backend.set(key, model, value, self.ttl_seconds)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, value)
+        return value
+
+    async def aget_or_compute(self, key: str, model: str, compute: Callable[[], Awaitable[str]]) -> str:
+        value = self._get_memory(key)
+        if value is not None:
+            return value
+
+        future, leader = self._claim(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            value = await asyncio.to_thread(self._from_backend, key) if self.backend is not None else None
+            if value is None:
+                self._count_miss()
+                value = await compute()
+                self._set_memory(key, value)
+                if self.backend is not None:
+                    await asyncio.to_thread(self.backend.set, key, model, value, self.ttl_seconds)
+        except BaseException as e:
+            self._settle(key, future, error=e)
+            raise
+        self._settle(key, future, value)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.backend_hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "hits": self.hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "hit_rate": round((self.hits + self.backend_hits) / lookups, 4) if lookups else 0,
+        }
@@ -1,18 +1,170 @@
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
-from typing import Any
+import threading
+from contextlib import nullcontext
+from typing import Any, AsyncIterator
 from app.core.config import settings
+from app.LLMs.cache import ResponseCache, SQLCacheBackend, response_cache_key
+from app.LLMs.limiter import AdaptiveLimiter
+from app.LLMs.router import LLMRouter
 import ast
 
+
+_session: requests.Session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Process-wide keep-alive session for talking to the LLM server.
+    Connections are pooled up to LLM_POOL_SIZE and 5xx/connection errors
+    are retried with exponential backoff. Read timeouts are not: the server
+    may still be generating, and re-sending would run it twice.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                retry = Retry(
+                    total=settings.LLM_MAX_RETRIES,
+                    connect=settings.LLM_MAX_RETRIES,
+                    read=0,
+                    status=settings.LLM_MAX_RETRIES,
+                    backoff_factor=settings.LLM_BACKOFF_FACTOR,
+                    status_forcelist=(500, 502, 503, 504),
+                    allowed_methods=frozenset({"POST"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.LLM_POOL_SIZE,
+                    pool_block=True,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def close_session():
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+_async_client: httpx.AsyncClient = None
+# Failures where the request never reached the server, so it is safe to send again.
+_RETRYABLE_TRANSPORT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Process-wide pooled httpx client used by LLMClient.achat."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_POOL_SIZE,
+                max_keepalive_connections=settings.LLM_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(settings.LLM_READ_TIMEOUT, connect=settings.LLM_CONNECT_TIMEOUT),
+        )
+    return _async_client
+
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+_router: LLMRouter = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> LLMRouter:
+    """Process-wide router over LLM_BASE_URLS (or just LLM_BASE_URL)."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                urls = [url.strip() for url in settings.LLM_BASE_URLS.split(",") if url.strip()]
+                _router = LLMRouter(
+                    urls or [settings.LLM_BASE_URL],
+                    health_path=settings.LLM_HEALTH_PATH,
+                    probe_interval=settings.LLM_HEALTH_INTERVAL_SECONDS,
+                    eject_after=settings.LLM_EJECT_AFTER_FAILURES,
+                    hedge=settings.LLM_HEDGE_ENABLED,
+                    hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+                    hedge_workers=2 * settings.LLM_POOL_SIZE,
+                )
+    return _router
+
+
+def close_router():
+    global _router
+    with _router_lock:
+        if _router is not None:
+            _router.stop()
+            _router = None
+
+
+response_cache = (
+    ResponseCache(
+        max_entries=settings.LLM_CACHE_SIZE,
+        ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        backend=SQLCacheBackend() if settings.LLM_CACHE_BACKEND == "sql" else None,
+    )
+    if settings.LLM_CACHE_ENABLED
+    else None
+)
+
+
+limiter = (
+    AdaptiveLimiter(
+        initial_limit=settings.LLM_LIMIT_INITIAL,
+        min_limit=settings.LLM_LIMIT_MIN,
+        max_limit=settings.LLM_LIMIT_MAX,
+        latency_target=settings.LLM_LIMIT_LATENCY_TARGET,
+        max_queue=settings.LLM_LIMIT_MAX_QUEUE,
+        max_wait=settings.LLM_LIMIT_MAX_WAIT,
+    )
+    if settings.LLM_LIMITER_ENABLED
+    else None
+)
+
+
 class LLMClient:
-    def __init__(self, base_url=settings.LLM_BASE_URL, model=settings.MODEL):
-        self.base_url = base_url
+    def __init__(
+        self,
+        base_url=None,
+        model=settings.MODEL,
+        temperature: float = 0.7,
+        priority: int = settings.LLM_PRIORITY_QUIZ
+    ):
+        # An explicit base_url pins the client to that server; otherwise
+        # requests are spread over the configured endpoints.
+        self.router = get_router() if base_url is None else LLMRouter([base_url])
         self.model = model
+        self.temperature = temperature
+        self.priority = priority
+        self.session = get_session()
+        self.timeout = (settings.LLM_CONNECT_TIMEOUT, settings.LLM_READ_TIMEOUT)
+
     def chat(
         self, 
         prompt: str, 
         expect_json: bool = False, 
-        default_keys: dict = None
+        default_keys: dict = None,
+        use_cache: bool = True
     ) -> Any:
         """
         Generic LLM call.
@@ -21,23 +173,35 @@ class LLMClient:
         - prompt: str -> the text prompt to send
         - expect_json: bool -> whether to parse LLM response as JSON
         - default_keys: dict -> fallback keys/values if JSON is incomplete
+        - use_cache: bool -> serve identical prompts from the response cache;
+          pass False to force a fresh sample
 
         Returns:
         - JSON object if expect_json=True
         - Raw text if expect_json=False
         """
-        print("prompt: ",prompt)
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
-            "temperature": 0.7
-        }
+        if use_cache and response_cache is not None:
+            return response_cache.get_or_compute(self._cache_key(prompt), self.model, lambda: self._chat(prompt))
+        return self._chat(prompt)
 
-        response = requests.post(self.base_url, json=payload)
+    def _chat(self, prompt: str) -> str:
+        payload = self._build_payload(prompt)
+
+        def post(url: str):
+            response = self.session.post(url, json=payload, timeout=self.timeout)
+            if response.status_code >= 500:
+                raise Exception(f"LLM request failed: {response.text}")
+            return response
+
+        if limiter is None:
+            response = self.router.call(post)
+        else:
+            # Released by the router once a losing hedge has finished too,
+            # not as soon as the winner returns.
+            limiter.acquire(self.priority)
+            response = self.router.call(post, on_settled=limiter.release)
         if response.status_code != 200:
             raise Exception(f"LLM request failed: {response.text}")
-        print("response text: ",response.text)
         # raw_response = response.json().get("response", "").strip()
         # print("@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@@")
 
@@ -66,9 +230,7 @@ class LLMClient:
         #     return parsed
         # print("raw response: ", raw_response)
         # return raw_response
-        raw_response = response.json().get("response", "").strip()
-        print("response text: ", raw_response)
-        print()
+        raw_response = self._extract_text(response.json())
 
         return raw_response
 
@@ -103,6 +265,94 @@ class LLMClient:
         #                 parsed[key] = str(val)
     
         # return parsed
-    
-    
-        
\ No newline at end of file
+
+    async def achat(
+        self,
+        prompt: str,
+        expect_json: bool = False,
+        default_keys: dict = None,
+        use_cache: bool = True
+    ) -> Any:
+        """
+        Async counterpart of `chat` that does not hold a worker thread
+        while the generation runs. 5xx responses and connection failures
+        are retried with the same bounded exponential backoff as the sync
+        path; read timeouts are not.
+        """
+        if use_cache and response_cache is not None:
+            return await response_cache.aget_or_compute(self._cache_key(prompt), self.model, lambda: self._achat(prompt))
+        return await self._achat(prompt)
+
+    async def _achat(self, prompt: str) -> str:
+        client = get_async_client()
+        payload = self._build_payload(prompt)
+
+        async def post(url: str):
+            response = await client.post(url, json=payload)
+            if response.status_code >= 500:
+                # Raised so the limiter and router see the failure.
+                raise httpx.HTTPStatusError("server error", request=response.request, response=response)
+            return response
+
+        for attempt in range(settings.LLM_MAX_RETRIES + 1):
+            try:
+                async with self._aslot():
+                    response = await self.router.acall(post)
+            except _RETRYABLE_TRANSPORT_ERRORS:
+                if attempt == settings.LLM_MAX_RETRIES:
+                    raise
+            except httpx.HTTPStatusError as e:
+                if attempt == settings.LLM_MAX_RETRIES:
+                    response = e.response
+                    break
+            else:
+                break
+            await asyncio.sleep(settings.LLM_BACKOFF_FACTOR * (2 ** attempt))
+
+        if response.status_code != 200:
+            raise Exception(f"LLM request failed: {response.text}")
+        return self._extract_text(response.json())
+
+    async def astream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Stream the completion for `prompt`, yielding text fragments as the
+        LLM server emits them (Ollama-style NDJSON with a `response` field).
+        """
+        client = get_async_client()
+        payload = self._build_payload(prompt, stream=True)
+
+        async with self._aslot(), self.router.astream_endpoint() as endpoint, \
+                client.stream("POST", endpoint.url, json=payload) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise Exception(f"LLM request failed: {body.decode(errors='replace')}")
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                fragment = data.get("response", "")
+                if fragment:
+                    yield fragment
+                if data.get("done"):
+                    break
+
+    def _aslot(self):
+        return limiter.aslot(self.priority) if limiter is not None else nullcontext()
+
+    def _sampling_params(self) -> dict:
+        return {"temperature": self.temperature}
+
+    def _cache_key(self, prompt: str) -> str:
+        return response_cache_key(self.model, prompt, self._sampling_params())
+
+    def _build_payload(self, prompt: str, stream: bool = False) -> dict:
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            **self._sampling_params()
+        }
+
+    @staticmethod
+    def _extract_text(body: dict) -> str:
+        return body.get("response", "").strip()
@@ -0,0 +1,212 @@
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+
+class LLMOverloadedError(Exception):
+    """Raised when a generation is shed instead of queued; maps to HTTP 503."""
+
+    def __init__(self, retry_after: int, reason: str = "LLM backend is overloaded"):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued_at", "granted", "_event", "_loop", "_future")
+
+    def __init__(self, priority: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self._loop = loop
+        self._event = None if loop else threading.Event()
+        self._future = loop.create_future() if loop else None
+
+    def grant(self):
+        self.granted = True
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self._future.done():
+            self._future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit in front of the LLM server.
+
+    The limit grows by roughly one slot per limit's worth of fast successful
+    calls and is cut multiplicatively whenever a call fails or takes longer
+    than `latency_target` seconds, so it settles just under the point where
+    the backend starts queueing internally. Callers over the limit wait in a
+    bounded priority queue (higher priority first, FIFO within a priority)
+    and are shed with LLMOverloadedError when the queue is full or their
+    wait exceeds `max_wait`.
+
+    Shared by sync (thread) and async callers: both queue in the same heap,
+    async waiters are woken through their event loop.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_target: float = 30.0,
+        backoff: float = 0.75,
+        max_queue: int = 100,
+        max_wait: float = 30.0,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._queue = []
+        self._seq = itertools.count()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.latency_ewma: Optional[float] = None
+
+    # -- admission -------------------------------------------------------
+
+    def _try_admit(self, priority: int) -> bool:
+        # Caller holds the lock. Queued callers of equal or higher priority
+        # go first so a burst can't starve the queue.
+        if self.in_flight < int(self.limit) and not (self._queue and -self._queue[0][0] >= priority):
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        return False
+
+    def _enqueue(self, waiter: _Waiter):
+        if len(self._queue) >= self.max_queue:
+            self.rejected += 1
+            raise LLMOverloadedError(self._retry_after())
+        heapq.heappush(self._queue, (-waiter.priority, next(self._seq), waiter))
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Drop a timed-out waiter. Returns True if it was granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._queue = [item for item in self._queue if item[2] is not waiter]
+            heapq.heapify(self._queue)
+            self.rejected += 1
+        return False
+
+    def _record_wait(self, waiter: _Waiter):
+        wait = time.monotonic() - waiter.enqueued_at
+        with self._lock:
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+
+    def _wake(self):
+        # Caller holds the lock.
+        while self._queue and self.in_flight < int(self.limit):
+            _, _, waiter = heapq.heappop(self._queue)
+            self.in_flight += 1
+            self.admitted += 1
+            waiter.grant()
+
+    def acquire(self, priority: int = 0):
+        with self._lock:
+            if self._try_admit(priority):
+                return
+            waiter = _Waiter(priority)
+            self._enqueue(waiter)
+        if not waiter._event.wait(self.max_wait) and not self._abandon(waiter):
+            raise LLMOverloadedError(self._retry_after())
+        self._record_wait(waiter)
+
+    async def aacquire(self, priority: int = 0):
+        with self._lock:
+            if self._try_admit(priority):
+                return
+            waiter = _Waiter(priority, asyncio.get_running_loop())
+            self._enqueue(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter._future), self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if self._abandon(waiter):
+                # Granted concurrently with the timeout; hand the slot back.
+                self.release(None, ok=True)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise LLMOverloadedError(self._retry_after())
+        self._record_wait(waiter)
+
+    def release(self, latency: Optional[float], ok: bool):
+        with self._lock:
+            self.in_flight -= 1
+            if latency is not None:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+                if ok and latency <= self.latency_target:
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                else:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+            self._wake()
+
+    @contextmanager
+    def slot(self, priority: int = 0):
+        self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.release(time.monotonic() - started, ok=False)
+            raise
+        except BaseException:
+            # Cancelled or abandoned; free the slot without adjusting the limit.
+            self.release(None, ok=True)
+            raise
+        self.release(time.monotonic() - started, ok=True)
+
+    @asynccontextmanager
+    async def aslot(self, priority: int = 0):
+        await self.aacquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.release(time.monotonic() - started, ok=False)
+            raise
+        except BaseException:
+            # Cancelled or abandoned; free the slot without adjusting the limit.
+            self.release(None, ok=True)
+            raise
+        self.release(time.monotonic() - started, ok=True)
+
+    # -- reporting -------------------------------------------------------
+
+    def _retry_after(self) -> int:
+        latency = self.latency_ewma or self.latency_target
+        return max(1, math.ceil(latency * (len(self._queue) + 1) / max(1, int(self.limit))))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": len(self._queue),
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "queue_wait_avg_ms": round(self.queue_wait_total / self.admitted * 1000, 2) if self.admitted else 0.0,
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+                "latency_ewma_ms": round(self.latency_ewma * 1000, 2) if self.latency_ewma is not None else None,
+            }
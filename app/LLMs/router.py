@@ -0,0 +1,338 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+
+
+T = TypeVar("T")
+
+
+class Endpoint:
+    def __init__(self, url: str, health_url: str):
+        self.url = url
+        self.health_url = health_url
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+
+    def score(self, default_latency: float) -> float:
+        # Expected time to drain what's already on this node plus our request.
+        return (self.in_flight + 1) * (self.latency_ewma or default_latency)
+
+    def stats(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 2) if self.latency_ewma is not None else None,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+        }
+
+
+def _health_url(url: str, health_path: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{health_path}"
+
+
+class LLMRouter:
+    """
+    Spreads generations over several LLM servers.
+
+    Each call goes to the healthy endpoint with the lowest
+    (in_flight + 1) * EWMA latency. A node is ejected after `eject_after`
+    consecutive failures (from real traffic or from the background health
+    probe) and re-admitted once a probe or a real call to it succeeds. If
+    every node is ejected the router fails open and keeps dispatching
+    rather than refusing work, so a lone endpoint recovers on its next
+    successful call.
+
+    With hedging enabled, a call that is still running after the
+    `hedge_percentile` latency of recent calls is duplicated on the next
+    best endpoint and whichever finishes first wins.
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        health_path: str = "/",
+        probe_interval: float = 10.0,
+        probe_timeout: float = 2.0,
+        eject_after: int = 3,
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        hedge_min_samples: int = 20,
+        hedge_workers: int = 64,
+    ):
+        if not urls:
+            raise ValueError("LLMRouter needs at least one endpoint")
+        self.endpoints = [Endpoint(url, _health_url(url, health_path)) for url in urls]
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.eject_after = eject_after
+        self.hedge = hedge and len(self.endpoints) > 1
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        # Hedged sync calls run both attempts off the caller's thread, so
+        # this has to cover the expected number of concurrent calls.
+        self.hedge_workers = hedge_workers
+        self.hedged = 0
+        self.hedge_wins = 0
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=500)
+        self._stop = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+
+    # -- selection -------------------------------------------------------
+
+    def _default_latency(self) -> float:
+        known = [e.latency_ewma for e in self.endpoints if e.latency_ewma is not None]
+        return sum(known) / len(known) if known else 1.0
+
+    def pick(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        with self._lock:
+            candidates = [e for e in self.endpoints if e is not exclude]
+            healthy = [e for e in candidates if e.healthy] or candidates
+            default_latency = self._default_latency()
+            endpoint = min(healthy, key=lambda e: e.score(default_latency))
+            endpoint.in_flight += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def _finish(self, endpoint: Endpoint, latency: Optional[float], ok: bool):
+        with self._lock:
+            endpoint.in_flight -= 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                if not endpoint.healthy:
+                    # Reached through fail-open routing; it's serving again.
+                    endpoint.healthy = True
+                    print(f"LLM endpoint re-admitted: {endpoint.url}")
+                endpoint.latency_ewma = latency if endpoint.latency_ewma is None else 0.8 * endpoint.latency_ewma + 0.2 * latency
+                self._latencies.append(latency)
+            elif latency is not None:
+                endpoint.failures += 1
+                self._record_failure(endpoint)
+
+    def _record_failure(self, endpoint: Endpoint):
+        # Caller holds the lock.
+        endpoint.consecutive_failures += 1
+        if endpoint.healthy and endpoint.consecutive_failures >= self.eject_after:
+            endpoint.healthy = False
+            endpoint.ejections += 1
+            print(f"LLM endpoint ejected: {endpoint.url}")
+
+    @asynccontextmanager
+    async def astream_endpoint(self):
+        """Pick an endpoint for a caller that drives the request itself (streaming)."""
+        endpoint = self.pick()
+        started, latency, ok = time.monotonic(), None, False
+        try:
+            yield endpoint
+            ok = True
+        except Exception:
+            latency = time.monotonic() - started
+            raise
+        finally:
+            # Cancellation or a closed stream leaves latency None, which
+            # releases the slot without judging the node.
+            self._finish(endpoint, time.monotonic() - started if ok else latency, ok)
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not self.hedge:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            samples = sorted(self._latencies)
+        return samples[min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))]
+
+    # -- dispatch --------------------------------------------------------
+
+    def _run(self, endpoint: Endpoint, fn: Callable[[str], T]) -> T:
+        started = time.monotonic()
+        try:
+            result = fn(endpoint.url)
+        except Exception:
+            self._finish(endpoint, time.monotonic() - started, False)
+            raise
+        self._finish(endpoint, time.monotonic() - started, True)
+        return result
+
+    def call(self, fn: Callable[[str], T], on_settled: Optional[Callable[[Optional[float], bool], None]] = None) -> T:
+        """
+        Run `fn(url)` against the best endpoint, hedging if configured.
+
+        `on_settled(latency, ok)` is called with the caller-observed outcome
+        once every attempt has finished. A losing hedge can't be cancelled
+        and keeps running after `call` returns, so whatever the caller holds
+        for the request (a limiter slot) should be released there.
+        """
+        started = time.monotonic()
+        attempts: List[Future] = []
+        outcome = (None, True)
+        try:
+            result = self._call(fn, attempts)
+            outcome = (time.monotonic() - started, True)
+            return result
+        except Exception:
+            outcome = (time.monotonic() - started, False)
+            raise
+        finally:
+            if on_settled is not None:
+                self._when_settled(attempts, lambda: on_settled(*outcome))
+
+    @staticmethod
+    def _when_settled(futures: List[Future], callback: Callable[[], None]):
+        if not futures:
+            callback()
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(_):
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                callback()
+
+        for future in futures:
+            future.add_done_callback(done)
+
+    def _call(self, fn: Callable[[str], T], attempts: List[Future]) -> T:
+        primary = self.pick()
+        delay = self._hedge_delay()
+        if delay is None:
+            return self._run(primary, fn)
+
+        executor = self._get_hedge_executor()
+        first = executor.submit(self._run, primary, fn)
+        attempts.append(first)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        second = executor.submit(self._run, self.pick(exclude=primary), fn)
+        attempts.append(second)
+        with self._lock:
+            self.hedged += 1
+        done, _ = wait([first, second], return_when=FIRST_COMPLETED)
+        winner = done.pop()
+        if winner.exception() is not None:
+            # Fall back to whichever attempt is still running.
+            other = second if winner is first else first
+            winner = other if other.exception() is None else winner
+        if winner is second:
+            with self._lock:
+                self.hedge_wins += 1
+        return winner.result()
+
+    async def _arun(self, endpoint: Endpoint, fn: Callable[[str], Awaitable[T]]) -> T:
+        started = time.monotonic()
+        try:
+            result = await fn(endpoint.url)
+        except asyncio.CancelledError:
+            # A cancelled hedge loser says nothing about the node's health.
+            self._finish(endpoint, None, False)
+            raise
+        except Exception:
+            self._finish(endpoint, time.monotonic() - started, False)
+            raise
+        self._finish(endpoint, time.monotonic() - started, True)
+        return result
+
+    async def acall(self, fn: Callable[[str], Awaitable[T]]) -> T:
+        """Async counterpart of `call`; the losing hedge is cancelled."""
+        primary = self.pick()
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._arun(primary, fn)
+
+        first = asyncio.ensure_future(self._arun(primary, fn))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        second = asyncio.ensure_future(self._arun(self.pick(exclude=primary), fn))
+        with self._lock:
+            self.hedged += 1
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return task.result()
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # -- health probes ---------------------------------------------------
+
+    def probe(self):
+        for endpoint in self.endpoints:
+            try:
+                ok = requests.get(endpoint.health_url, timeout=self.probe_timeout).status_code < 500
+            except requests.RequestException:
+                ok = False
+            with self._lock:
+                if ok:
+                    endpoint.consecutive_failures = 0
+                    if not endpoint.healthy:
+                        endpoint.healthy = True
+                        print(f"LLM endpoint re-admitted: {endpoint.url}")
+                else:
+                    self._record_failure(endpoint)
+
+    def _probe_loop(self):
+        while not self._stop.wait(self.probe_interval):
+            self.probe()
+
+    def start(self):
+        if self._prober is not None or len(self.endpoints) < 2:
+            return
+        self._stop.clear()
+        self._prober = threading.Thread(target=self._probe_loop, name="llm-router-probe", daemon=True)
+        self._prober.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._prober is not None:
+            self._prober.join(timeout=self.probe_timeout + 1)
+            self._prober = None
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        if self._hedge_executor is None:
+            with self._lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(self.hedge_workers, thread_name_prefix="llm-hedge")
+        return self._hedge_executor
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "endpoints": [e.stats() for e in self.endpoints],
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+            }
@@ -0,0 +1,66 @@
+from typing import List, Optional
+
+
+class JSONObjectStreamParser:
+    """
+    Incremental scanner that pulls complete top-level JSON objects out of
+    streamed LLM text as soon as their closing brace arrives.
+
+    Objects inside a top-level array (the shape `build_quiz_prompt` asks
+    for) are emitted one by one. Braces inside strings and `//` comments
+    are ignored, and markdown fences around the JSON are skipped. Each
+    emitted chunk is raw text; callers parse it with their usual tolerant
+    parser.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._start: Optional[int] = None
+        self._in_string = False
+        self._escape = False
+        self._in_comment = False
+
+    def feed(self, chunk: str) -> List[str]:
+        self._buf += chunk
+        objects = []
+        buf = self._buf
+
+        while self._pos < len(buf):
+            c = buf[self._pos]
+            if self._in_comment:
+                if c == "\n":
+                    self._in_comment = False
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif c == "/":
+                if self._pos + 1 >= len(buf):
+                    break  # need the next chunk to know if this starts a comment
+                if buf[self._pos + 1] == "/":
+                    self._in_comment = True
+            elif c == "{":
+                if self._depth == 0:
+                    self._start = self._pos
+                self._depth += 1
+            elif c == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0:
+                    objects.append(buf[self._start:self._pos + 1])
+                    self._start = None
+            self._pos += 1
+
+        cut = self._start if self._start is not None else self._pos
+        self._buf = buf[cut:]
+        self._pos -= cut
+        if self._start is not None:
+            self._start = 0
+        return objects
@@ -1,8 +1,12 @@
+from datetime import timedelta
 from fastapi import HTTPException, status
 from app.api.auth.schemas import RegisterRequest, LoginRequest
 from app.db.models.user import User
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.password_hasher import password_hasher
 from app.db.repositories.user import UserRepository
+from app.db.session import release_connection
 
 class AuthService:
     def __init__(self, user_repo: UserRepository):
@@ -15,8 +19,10 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
+        # bcrypt can queue for the hashing pool; don't pin a connection meanwhile.
+        release_connection(self.user_repo.db)
 
-        user = User(email=data.email, hashed_password=hash_password(data.password))
+        user = User(email=data.email, hashed_password=password_hasher.hash(data.password))
         try:
             self.user_repo.create(user=user)
         except RuntimeError as e:
@@ -29,11 +35,19 @@ class AuthService:
 
     def login(self, data: LoginRequest) -> dict:
         user = self.user_repo.get_by_email(data.email)
-        if not user or not verify_password(data.password, user.hashed_password):
+        release_connection(self.user_repo.db)
+        valid, new_hash = password_hasher.verify_and_update(data.password, user.hashed_password) if user else (False, None)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
+        if new_hash:
+            # Stored hash predates the current bcrypt parameters.
+            self.user_repo.rehash_password(user, new_hash)
 
-        access_token = create_access_token({"sub": str(user.id)})
+        access_token = create_access_token(
+            {"sub": str(user.id), "email": user.email, "role": user.role},
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
         return {"access_token": access_token, "token_type": "bearer"}
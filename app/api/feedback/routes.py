@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import JSONResponse
 from uuid import UUID
 from typing import Optional
-from app.api.feedback.services import FeedbackService
-from app.core.depedencies import get_feedback_service, get_current_user
-from app.db.models.user import User
+from app.api.feedback.services import AsyncFeedbackService
+from app.api.jobs.services import JobService
+from app.core.depedencies import get_async_feedback_service, get_current_user, get_job_service
+from app.core.principal import Principal
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
 
 @router.get("/")
-def generate_feedback(
+async def generate_feedback(
     quiz_id: Optional[UUID] = Query(None),
     topic: Optional[str] = Query(None),
-    service: FeedbackService = Depends(get_feedback_service),
-    current_user: User = Depends(get_current_user),
+    run_async: bool = Query(False, alias="async"),
+    webhook_url: Optional[str] = Query(None),
+    service: AsyncFeedbackService = Depends(get_async_feedback_service),
+    job_service: JobService = Depends(get_job_service),
+    current_user: Principal = Depends(get_current_user),
 
 ):
-    return service.generate_feedback(user_id=current_user.id, quiz_id=quiz_id, topic=topic)
+    if run_async:
+        payload = {"quiz_id": str(quiz_id) if quiz_id else None, "topic": topic}
+        job = await job_service.enqueue(current_user.id, "feedback", payload, webhook_url)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job)
+    return await service.generate_feedback(user_id=current_user.id, quiz_id=quiz_id, topic=topic)
@@ -0,0 +1,102 @@
+import threading
+import uuid
+from typing import List, Optional
+
+from app.vectorDB.embeddings import EmbeddingGenerator
+from app.vectorDB.vector_store import VectorStore
+
+
+def _norm(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def salient_text(quiz_tags: List[str], topic: Optional[str], context: List[str]) -> str:
+    """
+    The parts of a feedback prompt that decide the answer, normalized so
+    tag order, retrieval order and whitespace/case differences collapse.
+    """
+    tags = ", ".join(sorted({_norm(t) for t in quiz_tags or []}))
+    lines = "\n".join(sorted({_norm(c) for c in context or []}))
+    return f"tags: {tags}\ntopic: {_norm(topic) if topic else 'general'}\ncontext:\n{lines}"
+
+
+class SemanticFeedbackCache:
+    """
+    Reuses a previous feedback generation when a new request's salient
+    text embeds within `threshold` cosine similarity of a stored one.
+    Entries live in their own cosine-space vector collection.
+
+    Feedback is written from the requesting user's profile, so entries are
+    tagged with that user and lookups only match the same user's entries.
+    """
+
+    def __init__(
+        self,
+        embedding_generator: EmbeddingGenerator,
+        vector_store: VectorStore,
+        threshold: float = 0.92,
+    ):
+        self.embedding_generator = embedding_generator
+        self.vector_store = vector_store
+        self.threshold = threshold
+
+    def embed(self, text: str) -> List[float]:
+        return self.embedding_generator.embed([text])[0]
+
+    def lookup(self, embedding: List[float], user_id) -> Optional[dict]:
+        result = self.vector_store.similarity_search(embedding, top_k=1, where={"user_id": str(user_id)})
+        match = self._best_match(result)
+        semantic_cache_stats.record(match is not None)
+        return match
+
+    def store(self, embedding: List[float], text: str, feedback_id, parsed: dict, user_id):
+        self.vector_store.add_documents([{
+            "id": str(uuid.uuid4()),
+            "embedding": embedding,
+            "document": text,
+            "metadata": {
+                "user_id": str(user_id),
+                "feedback_id": str(feedback_id),
+                "feedback_text": parsed.get("feedback_text") or "",
+                "follow_up_suggestion": parsed.get("follow_up_suggestion") or "",
+            },
+        }])
+
+    def _best_match(self, result) -> Optional[dict]:
+        if not result or not result.get("ids") or not result["ids"][0]:
+            return None
+        similarity = 1 - result["distances"][0][0]
+        if similarity < self.threshold:
+            return None
+        metadata = result["metadatas"][0][0]
+        return {
+            "feedback_id": metadata["feedback_id"],
+            "similarity": similarity,
+            "feedback_text": metadata["feedback_text"],
+            "follow_up_suggestion": metadata["follow_up_suggestion"] or None,
+        }
+
+
+class _SemanticCacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+        }
+
+
+semantic_cache_stats = _SemanticCacheStats()
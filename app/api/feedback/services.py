@@ -1,12 +1,17 @@
 from uuid import UUID
-from typing import Optional
-from app.db.repositories.feedback import FeedbackRepository
-from app.db.repositories.quiz import QuizRepository
+from typing import List, Optional
+from app.db.repositories.feedback import FeedbackRepository, AsyncFeedbackRepository
+from app.db.repositories.quiz import QuizRepository, AsyncQuizRepository
+from app.db.session import arelease_connection, release_connection
 from app.LLMs.client import LLMClient
 from app.vectorDB.embeddings import EmbeddingGenerator
 from app.vectorDB.vector_store import VectorStore
+from app.vectorDB.hybrid import HybridRetriever
+from app.core.config import settings
 from app.core import prompts
 from app.db.repositories.profile import ProfileRepository
+from app.api.feedback.semantic_cache import SemanticFeedbackCache, salient_text
+import asyncio
 import re
 import json
 
@@ -20,6 +25,7 @@ class FeedbackService:
         vector_store: VectorStore,
         embedding_generator: EmbeddingGenerator,
         llm_client: LLMClient,
+        semantic_cache: Optional[SemanticFeedbackCache] = None,
     ):
         self.feedback_repo = feedback_repo
         self.quiz_repo = quiz_repo
@@ -27,6 +33,7 @@ class FeedbackService:
         self.vector_store = vector_store
         self.embedding_generator = embedding_generator
         self.llm_client = llm_client
+        self.semantic_cache = semantic_cache
 
     def generate_feedback(
         self,
@@ -47,54 +54,157 @@ class FeedbackService:
 
         if not quiz:
             raise ValueError("No quiz found for this user.")
+        # Nothing else is read until the feedback is saved; don't hold the
+        # connection through embedding, retrieval and the LLM call.
+        release_connection(self.quiz_repo.db)
 
-        search_text = ""
-        if topic and quiz:
-            search_text = f"{topic} {quiz.quiz_type}"
-        elif topic:
-            search_text = topic
-        elif quiz:
-            search_text = " ".join(quiz.tags or [])
+        search_text = _build_search_text(quiz, topic)
 
         embedding = self.embedding_generator.embed([search_text])[0]
-        print("embeddings: ", embedding)
 
-        similar_docs = self.vector_store.similarity_search(embedding, top_k=5)
-        print("similar_docs: ", similar_docs)
+        context = self._retrieve_context(search_text, embedding, user_id)
 
-        retrieved_texts = []
-        if similar_docs and "documents" in similar_docs:
-            retrieved_texts = similar_docs["documents"][0]
-        else:
-            retrieved_texts = ["No similar answers found in vector DB."]
+        cached = cache_text = cache_embedding = None
+        if self.semantic_cache is not None:
+            cache_text = salient_text(quiz.tags, topic, context)
+            cache_embedding = self.semantic_cache.embed(cache_text)
+            cached = self.semantic_cache.lookup(cache_embedding, user_id)
 
-        feedback_prompt = prompts.build_feedback_prompt(
-            user_profile=quiz.profile_snapshot,
-            quiz_tags=quiz.tags,
-            topic=topic,
-            context=retrieved_texts
-        )
+        if cached:
+            parsed = cached
+        else:
+            feedback_prompt = prompts.build_feedback_prompt(
+                user_profile=quiz.profile_snapshot,
+                quiz_tags=quiz.tags,
+                topic=topic,
+                context=context
+            )
 
-        response = self.llm_client.chat(prompt=feedback_prompt,  expect_json=True, default_keys={"feedback_text": "", "follow_up_suggestion": ""})
+            response = self.llm_client.chat(prompt=feedback_prompt,  expect_json=True, default_keys={"feedback_text": "", "follow_up_suggestion": ""})
 
-        parsed = extract_feedback(response)
+            parsed = extract_feedback(response)
        # profile = self.profile_repo.get_by_user_id(user_id=user_id)
-        feedback_data = {
-            "profile_id": user_id,
-            "quiz_id": quiz.id,
-            "feedback_text": parsed.get("feedback_text", ""),
-            "follow_up_suggestion": parsed.get("follow_up_suggestion", ""),
-        }
+        saved_feedback = self.feedback_repo.create_feedback(_build_feedback_data(user_id, quiz, parsed, cached))
 
-        saved_feedback = self.feedback_repo.create_feedback(feedback_data)
+        if self.semantic_cache is not None and not cached:
+            self.semantic_cache.store(cache_embedding, cache_text, saved_feedback.id, parsed, user_id)
 
-        return {
-            "feedback_id": str(saved_feedback.id),
-            "quiz_id": str(quiz.id),
-            "topic": topic or "overall",
-            "feedback_text": parsed.get("feedback_text", ""),
-            "follow_up_suggestion": parsed.get("follow_up_suggestion", ""),
-        }
+        return _feedback_response(saved_feedback, quiz, topic, parsed)
+
+    def _retrieve_context(self, search_text: str, embedding: List[float], user_id: UUID) -> List[str]:
+        if settings.RETRIEVAL_MODE == "hybrid":
+            retriever = HybridRetriever(
+                self.vector_store,
+                rrf_k=settings.HYBRID_RRF_K,
+                candidates=settings.HYBRID_CANDIDATES,
+            )
+            texts = retriever.retrieve(search_text, embedding, str(user_id), top_n=settings.HYBRID_CONTEXT_SIZE)
+            return texts or ["No similar answers found in vector DB."]
+
+        similar_docs = self.vector_store.similarity_search(embedding, top_k=5, where=_user_filter(user_id))
+        return _retrieved_texts(similar_docs)
+
+
+class AsyncFeedbackService(FeedbackService):
+    """Async variant of FeedbackService backed by AsyncSession repositories."""
+
+    feedback_repo: AsyncFeedbackRepository
+    quiz_repo: AsyncQuizRepository
+
+    async def generate_feedback(
+        self,
+        user_id: UUID,
+        quiz_id: Optional[UUID] = None,
+        topic: Optional[str] = None
+    ):
+        if quiz_id:
+            quiz = await self.quiz_repo.get_quiz_by_id(quiz_id)
+        else:
+            quiz = await self.quiz_repo.get_last_quiz_for_user(user_id)
+
+        if not quiz:
+            raise ValueError("No quiz found for this user.")
+        await arelease_connection(self.quiz_repo.db)
+
+        search_text = _build_search_text(quiz, topic)
+        embedding = (await self.embedding_generator.aembed([search_text]))[0]
+        context = await asyncio.to_thread(self._retrieve_context, search_text, embedding, user_id)
+
+        cached = cache_text = cache_embedding = None
+        if self.semantic_cache is not None:
+            cache_text = salient_text(quiz.tags, topic, context)
+            cache_embedding = (await self.embedding_generator.aembed([cache_text]))[0]
+            cached = await asyncio.to_thread(self.semantic_cache.lookup, cache_embedding, user_id)
+
+        if cached:
+            parsed = cached
+        else:
+            feedback_prompt = prompts.build_feedback_prompt(
+                user_profile=quiz.profile_snapshot,
+                quiz_tags=quiz.tags,
+                topic=topic,
+                context=context
+            )
+
+            response = await self.llm_client.achat(prompt=feedback_prompt, expect_json=True, default_keys={"feedback_text": "", "follow_up_suggestion": ""})
+
+            parsed = extract_feedback(response)
+        saved_feedback = await self.feedback_repo.create_feedback(_build_feedback_data(user_id, quiz, parsed, cached))
+
+        if self.semantic_cache is not None and not cached:
+            await asyncio.to_thread(self.semantic_cache.store, cache_embedding, cache_text, saved_feedback.id, parsed, user_id)
+
+        return _feedback_response(saved_feedback, quiz, topic, parsed)
+
+
+def _build_search_text(quiz, topic: Optional[str]) -> str:
+    search_text = ""
+    if topic and quiz:
+        search_text = f"{topic} {quiz.quiz_type}"
+    elif topic:
+        search_text = topic
+    elif quiz:
+        search_text = " ".join(quiz.tags or [])
+    return search_text
+
+
+def _user_filter(user_id: UUID) -> dict:
+    # Only this user's answers may end up in their feedback prompt.
+    return {"user_id": str(user_id)}
+
+
+def _retrieved_texts(similar_docs) -> List[str]:
+    if similar_docs and "documents" in similar_docs and similar_docs["documents"][0]:
+        return similar_docs["documents"][0]
+    return ["No similar answers found in vector DB."]
+
+
+def _build_feedback_data(user_id: UUID, quiz, parsed: dict, cached: Optional[dict] = None) -> dict:
+    data = {
+        "profile_id": user_id,
+        "quiz_id": quiz.id,
+        "feedback_text": parsed.get("feedback_text", ""),
+        "follow_up_suggestion": parsed.get("follow_up_suggestion", ""),
+        "source": "llm",
+    }
+    if cached:
+        data.update({
+            "source": "semantic_cache",
+            "source_feedback_id": UUID(cached["feedback_id"]),
+            "cache_similarity": cached["similarity"],
+        })
+    return data
+
+
+def _feedback_response(saved_feedback, quiz, topic: Optional[str], parsed: dict) -> dict:
+    return {
+        "feedback_id": str(saved_feedback.id),
+        "quiz_id": str(quiz.id),
+        "topic": topic or "overall",
+        "source": saved_feedback.source,
+        "feedback_text": parsed.get("feedback_text", ""),
+        "follow_up_suggestion": parsed.get("follow_up_suggestion", ""),
+    }
     
 
 def extract_feedback(raw_response: str) -> dict:
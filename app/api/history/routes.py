@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from typing import Optional
+from app.api.history.schemas import HistoryPage
+from app.api.history.services import HistoryService
+from app.core.config import settings
+from app.core.depedencies import get_current_user, get_history_service
+from app.core.principal import Principal
+
+router = APIRouter(prefix="/history", tags=["History"])
+
+@router.get(
+    "/",
+    response_model=HistoryPage,
+    response_model_exclude_none=True,
+    summary="Past quizzes with their questions, answers and feedback, newest first",
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Page unchanged since the given ETag"}},
+)
+async def get_history(
+    response: Response,
+    limit: int = Query(settings.HISTORY_PAGE_SIZE, ge=1, le=settings.HISTORY_MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    if_none_match: Optional[str] = Header(None),
+    service: HistoryService = Depends(get_history_service),
+    current_user: Principal = Depends(get_current_user),
+):
+    etag, page = await service.get_page(current_user.id, limit, cursor, if_none_match)
+    # Private and always revalidated: polling clients get a 304 while the page is unchanged.
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if page is None:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return page
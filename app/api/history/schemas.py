@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+
+class HistoryAnswer(BaseModel):
+    answer_text: str
+    is_correct: Optional[bool] = None
+    score: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+class HistoryQuestion(BaseModel):
+    question_id: UUID
+    question_text: str
+    question_type: Optional[str] = None
+    options: Optional[List[str]] = None
+    correct_answer: Optional[str] = None
+    answers: List[HistoryAnswer] = []
+
+class HistoryFeedback(BaseModel):
+    feedback_id: UUID
+    feedback_text: str
+    follow_up_suggestion: Optional[str] = None
+    source: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class HistoryQuiz(BaseModel):
+    quiz_id: UUID
+    created_at: Optional[datetime] = None
+    quiz_type: Optional[str] = None
+    tags: List[str] = []
+    total_questions: Optional[int] = None
+    questions: List[HistoryQuestion] = []
+    feedback: List[HistoryFeedback] = []
+
+class HistoryPage(BaseModel):
+    quizzes: List[HistoryQuiz]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,112 @@
+import base64
+import hashlib
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException, status
+from app.db.repositories.quiz import AsyncQuizRepository
+
+
+class HistoryService:
+    """
+    Newest-first quiz history, keyset-paginated on (created_at, id).
+
+    A page costs one aggregate query when the client's ETag still matches,
+    and four more (quizzes, then questions, answers and feedback via
+    selectinload) when it doesn't, however many quizzes are on the page.
+    """
+
+    def __init__(self, quiz_repo: AsyncQuizRepository):
+        self.quiz_repo = quiz_repo
+
+    async def get_page(
+        self,
+        user_id: UUID,
+        limit: int,
+        cursor: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> Tuple[str, Optional[dict]]:
+        """Returns (etag, page); page is None when `if_none_match` already matches."""
+        before = decode_cursor(cursor) if cursor else None
+        versions = await self.quiz_repo.history_page_versions(user_id, limit, before)
+        rows, has_more = versions[:limit], len(versions) > limit
+
+        etag = _page_etag(rows, has_more)
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return etag, None
+
+        quizzes = {}
+        if rows:
+            loaded = await self.quiz_repo.get_quizzes_with_history(user_id, [row.id for row in rows])
+            quizzes = {quiz.id: quiz for quiz in loaded}
+
+        return etag, {
+            "quizzes": [_history_entry(quizzes[row.id]) for row in rows if row.id in quizzes],
+            "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+        }
+
+
+def encode_cursor(created_at: datetime, quiz_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{quiz_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, quiz_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(quiz_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _page_etag(rows: list, has_more: bool) -> str:
+    digest = hashlib.sha256(repr((has_more, [tuple(row) for row in rows])).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison.
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _history_entry(quiz) -> dict:
+    answers_by_question = {}
+    for answer in quiz.answers:
+        answers_by_question.setdefault(answer.question_id, []).append({
+            "answer_text": answer.answer_text,
+            "is_correct": answer.is_correct,
+            "score": answer.score,
+            "created_at": answer.created_at,
+        })
+    return {
+        "quiz_id": quiz.id,
+        "created_at": quiz.created_at,
+        "quiz_type": quiz.quiz_type,
+        "tags": quiz.tags or [],
+        "total_questions": quiz.total_questions,
+        "questions": [
+            {
+                "question_id": question.id,
+                "question_text": question.question_text,
+                "question_type": question.question_type,
+                "options": question.options,
+                "correct_answer": question.correct_answer,
+                "answers": answers_by_question.get(question.id, []),
+            }
+            for question in quiz.questions
+        ],
+        "feedback": [
+            {
+                "feedback_id": feedback.id,
+                "feedback_text": feedback.feedback_text,
+                "follow_up_suggestion": feedback.follow_up_suggestion,
+                "source": feedback.source,
+                "created_at": feedback.created_at,
+            }
+            for feedback in quiz.feedbacks
+        ],
+    }
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from uuid import UUID
+from app.api.jobs.schemas import JobStatusResponse, QueueStatsResponse
+from app.api.jobs.services import JobService
+from app.core.depedencies import get_current_user, get_job_service
+from app.core.principal import Principal
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+@router.get("/queue", response_model=QueueStatsResponse, summary="Background job queue depth")
+async def queue_stats(
+    service: JobService = Depends(get_job_service),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await service.queue_stats()
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse, summary="Status and result of a background job")
+async def get_job(
+    job_id: UUID,
+    service: JobService = Depends(get_job_service),
+    current_user: Principal = Depends(get_current_user),
+):
+    job = await service.get_job(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+from uuid import UUID
+
+class JobAccepted(BaseModel):
+    job_id: UUID
+    kind: str
+    status: str
+    status_url: str
+
+class JobStatusResponse(BaseModel):
+    job_id: UUID
+    kind: str
+    status: str
+    priority: int
+    attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class QueueStatsResponse(BaseModel):
+    queued: int
+    running: int
+    by_kind: Dict[str, int]
+    by_priority: Dict[int, int]
@@ -0,0 +1,67 @@
+import asyncio
+from uuid import UUID
+from typing import Optional
+from fastapi import HTTPException, status
+from app.db.repositories.job import AsyncJobRepository
+from app.core.config import settings
+from app.jobs.webhooks import check_webhook_url
+
+
+JOB_PRIORITIES = {
+    "quiz": settings.JOB_PRIORITY_QUIZ,
+    "feedback": settings.JOB_PRIORITY_FEEDBACK,
+}
+
+
+class JobService:
+    def __init__(self, job_repo: AsyncJobRepository):
+        self.job_repo = job_repo
+
+    async def enqueue(self, user_id: UUID, kind: str, payload: dict, webhook_url: Optional[str] = None) -> dict:
+        if webhook_url:
+            try:
+                await asyncio.to_thread(check_webhook_url, webhook_url)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        job = await self.job_repo.create_job({
+            "user_id": user_id,
+            "kind": kind,
+            "payload": payload,
+            "priority": JOB_PRIORITIES[kind],
+            "webhook_url": webhook_url,
+        })
+        return {
+            "job_id": str(job.id),
+            "kind": job.kind,
+            "status": job.status,
+            "status_url": f"/jobs/{job.id}",
+        }
+
+    async def get_job(self, job_id: UUID, user_id: UUID) -> Optional[dict]:
+        job = await self.job_repo.get_job_for_user(job_id, user_id)
+        if job is None:
+            return None
+        return {
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "priority": job.priority,
+            "attempts": job.attempts,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+
+    async def queue_stats(self) -> dict:
+        by_kind, by_priority = {}, {}
+        for kind, priority, count in await self.job_repo.queue_depth(settings.JOB_MAX_ATTEMPTS):
+            by_kind[kind] = by_kind.get(kind, 0) + count
+            by_priority[priority] = by_priority.get(priority, 0) + count
+        return {
+            "queued": sum(by_kind.values()),
+            "running": await self.job_repo.count_running(),
+            "by_kind": by_kind,
+            "by_priority": by_priority,
+        }
@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+
+class QuestionManifest:
+    """Owner and question types of one quiz, enough to validate a submission."""
+
+    __slots__ = ("quiz_id", "user_id", "question_types")
+
+    def __init__(self, quiz_id: UUID, user_id: UUID, question_types: Dict[str, str]):
+        self.quiz_id = quiz_id
+        self.user_id = user_id
+        self.question_types = question_types
+
+    def invalid_question_ids(self, question_ids: List[UUID]) -> List[str]:
+        return [str(q) for q in question_ids if str(q) not in self.question_types]
+
+
+class ManifestCache:
+    """
+    Per-process LRU of question manifests, filled when a quiz is generated.
+    A miss is not an error: submission falls back to validating inside the
+    answer INSERT itself.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, QuestionManifest]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, quiz_id: UUID, user_id: UUID, questions: List[dict]) -> None:
+        manifest = QuestionManifest(
+            quiz_id,
+            UUID(str(user_id)),
+            {str(q["question_id"]): q.get("question_type") for q in questions},
+        )
+        with self._lock:
+            self._entries[str(quiz_id)] = manifest
+            self._entries.move_to_end(str(quiz_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, quiz_id: UUID) -> Optional[QuestionManifest]:
+        with self._lock:
+            manifest = self._entries.get(str(quiz_id))
+            if manifest is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(str(quiz_id))
+            self.hits += 1
+            return manifest
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+question_manifests = ManifestCache(settings.QUIZ_MANIFEST_CACHE_SIZE)
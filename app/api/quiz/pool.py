@@ -0,0 +1,188 @@
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+def profile_fingerprint(profile_data: dict, age_bucket: int = settings.QUIZ_POOL_AGE_BUCKET) -> str:
+    """
+    Fingerprint the parts of a profile that shape the generated questions:
+    normalized education, an age bucket and the hobby set. Profiles that
+    differ only in name, city or bio share a fingerprint.
+    """
+    education = " ".join((profile_data.get("education") or "").lower().split())
+    age = profile_data.get("age") or 0
+    hobbies = sorted({" ".join(h.lower().split()) for h in profile_data.get("hobbies") or [] if h and h.strip()})
+    key = json.dumps([education, age // age_bucket, hobbies])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def pool_template(profile_data: dict, age_bucket: int = settings.QUIZ_POOL_AGE_BUCKET) -> dict:
+    """
+    The profile a pooled set is generated from: only the fingerprinted
+    fields, with name, gender, city and bio neutralized. Pooled sets are
+    served to anyone sharing the fingerprint, so nothing identifying one
+    student may reach the prompt.
+    """
+    age = profile_data.get("age") or 0
+    return {
+        "name": "Student",
+        "age": age // age_bucket * age_bucket,
+        "gender": "not specified",
+        "education": " ".join((profile_data.get("education") or "").split()),
+        "city": "not specified",
+        "hobbies": sorted({" ".join(h.lower().split()) for h in profile_data.get("hobbies") or [] if h and h.strip()}),
+        "bio": None,
+    }
+
+
+class _PoolEntry:
+    def __init__(self, profile_data: dict):
+        self.profile_data = profile_data
+        self.ready: Deque[Tuple[float, list]] = deque()
+        self.refilling = 0
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+
+class QuizPool:
+    """
+    Bounded pool of pre-generated question sets keyed by profile fingerprint.
+
+    `take` serves a ready set instantly when one exists and, while the
+    pool is running, schedules a background refill either way. Refills are
+    generated from `pool_template`, never the caller's own profile. Sets older than `ttl_seconds` are dropped.
+    At most `max_fingerprints` are tracked (least recently used evicted)
+    with up to `max_per_fingerprint` sets each.
+    """
+
+    def __init__(
+        self,
+        generate: Callable[[dict], list],
+        max_per_fingerprint: int = 2,
+        max_fingerprints: int = 500,
+        ttl_seconds: float = 3600,
+        workers: int = 1,
+    ):
+        self.generate = generate
+        self.max_per_fingerprint = max_per_fingerprint
+        self.max_fingerprints = max_fingerprints
+        self.ttl_seconds = ttl_seconds
+        self.workers = workers
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self.refill_errors = 0
+
+    def start(self):
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"quiz-pool-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+
+    def take(self, profile_data: dict) -> Optional[list]:
+        fingerprint = profile_fingerprint(profile_data)
+        template = pool_template(profile_data)
+
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = _PoolEntry(template)
+                self._entries[fingerprint] = entry
+                while len(self._entries) > self.max_fingerprints:
+                    self._entries.popitem(last=False)
+            else:
+                entry.profile_data = template
+                self._entries.move_to_end(fingerprint)
+
+            self._drop_stale(entry)
+            questions = entry.ready.popleft()[1] if entry.ready else None
+            if questions is None:
+                entry.misses += 1
+            else:
+                entry.hits += 1
+            self._schedule_refill(fingerprint, entry)
+
+        return questions
+
+    def _drop_stale(self, entry: _PoolEntry):
+        cutoff = time.monotonic() - self.ttl_seconds
+        while entry.ready and entry.ready[0][0] < cutoff:
+            entry.ready.popleft()
+            entry.expired += 1
+
+    def _schedule_refill(self, fingerprint: str, entry: _PoolEntry):
+        # Processes that never start the pool (job workers) would only pile
+        # up refills nobody runs.
+        if not self._threads:
+            return
+        if len(entry.ready) + entry.refilling < self.max_per_fingerprint:
+            entry.refilling += 1
+            self._queue.put(fingerprint)
+
+    def _run(self):
+        while True:
+            fingerprint = self._queue.get()
+            if fingerprint is None:
+                return
+            with self._lock:
+                entry = self._entries.get(fingerprint)
+                profile_data = dict(entry.profile_data) if entry else None
+            if profile_data is None:
+                continue
+
+            try:
+                questions = self.generate(profile_data)
+            except Exception as e:
+                print(f"quiz pool refill failed for {fingerprint}: {e}")
+                questions = None
+                self.refill_errors += 1
+
+            with self._lock:
+                entry.refilling -= 1
+                if questions:
+                    entry.ready.append((time.monotonic(), questions))
+                    self._drop_stale(entry)
+                    while len(entry.ready) > self.max_per_fingerprint:
+                        entry.ready.popleft()
+
+    def stats(self) -> dict:
+        with self._lock:
+            fingerprints = {
+                fp: {
+                    "ready": len(e.ready),
+                    "hits": e.hits,
+                    "misses": e.misses,
+                    "expired": e.expired,
+                    "hit_rate": round(e.hits / (e.hits + e.misses), 4) if e.hits + e.misses else 0,
+                }
+                for fp, e in self._entries.items()
+            }
+        hits = sum(f["hits"] for f in fingerprints.values())
+        misses = sum(f["misses"] for f in fingerprints.values())
+        return {
+            "fingerprints": len(fingerprints),
+            "ready_sets": sum(f["ready"] for f in fingerprints.values()),
+            "refill_queue": self._queue.qsize(),
+            "refill_errors": self.refill_errors,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0,
+            "per_fingerprint": fingerprints,
+        }
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, status
-from app.core.depedencies import get_current_user
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.core.depedencies import get_current_user, get_job_service
+from app.api.jobs.services import JobService
 from app.api.quiz.schemas import ProfileCreate
-from app.api.quiz.schemas import QuizGenerateResponse, QuizSubmitRequest
-from app.api.quiz.services import QuizService
-from app.db.models.user import User
-from app.core.depedencies import get_quiz_service
+from app.api.quiz.schemas import QuizGenerateResponse, QuizSubmitRequest, QuizBatchRequest, QuizBatchResponse
+from app.api.quiz.services import AsyncQuizService
+from app.core.principal import Principal
+from app.core.depedencies import get_async_quiz_service
 
 router = APIRouter(prefix="/quiz", tags=["Quiz"])
 
@@ -14,12 +18,60 @@ router = APIRouter(prefix="/quiz", tags=["Quiz"])
     summary="Generate a quiz from user profile",
     status_code=status.HTTP_201_CREATED,
 )
-def generate_quiz(
+async def generate_quiz(
     profile: ProfileCreate,
-    current_user: User = Depends(get_current_user),
-    quiz_service: QuizService = Depends(get_quiz_service)
+    run_async: bool = Query(False, alias="async", description="Queue the generation and return a job id"),
+    webhook_url: Optional[str] = Query(None, description="POSTed the job result when run asynchronously"),
+    fresh: bool = Query(False, description="Always generate a new quiz, bypassing the pre-generated pool and response cache"),
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: AsyncQuizService = Depends(get_async_quiz_service),
+    job_service: JobService = Depends(get_job_service)
 ):
-    return quiz_service.generate_quiz_for_user(user_id=current_user.id, profile_data=profile.dict())
+    if run_async:
+        job = await job_service.enqueue(current_user.id, "quiz", {"profile_data": profile.dict(), "fresh": fresh}, webhook_url)
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job)
+    return await quiz_service.generate_quiz_for_user(user_id=current_user.id, profile_data=profile.dict(), fresh=fresh)
+
+
+@router.post(
+    "/generate/batch",
+    response_model=QuizBatchResponse,
+    summary="Generate quizzes for a cohort of student profiles",
+    status_code=status.HTTP_201_CREATED,
+)
+async def generate_quiz_batch(
+    batch: QuizBatchRequest,
+    fresh: bool = Query(False, description="Always generate new quizzes, bypassing the pre-generated pool and response cache"),
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: AsyncQuizService = Depends(get_async_quiz_service)
+):
+    # Writing other users' profiles and quizzes is for teachers and admins.
+    if not current_user.is_staff and any(member.user_id != current_user.id for member in batch.members):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only teachers and admins can generate quizzes for other users",
+        )
+    return await quiz_service.generate_cohort_quizzes(
+        members=[{"user_id": member.user_id, "profile": member.profile.dict()} for member in batch.members],
+        fresh=fresh,
+    )
+
+
+@router.post(
+    "/generate/stream",
+    summary="Generate a quiz and stream questions as NDJSON while the LLM produces them",
+    status_code=status.HTTP_200_OK,
+)
+async def generate_quiz_stream(
+    profile: ProfileCreate,
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: AsyncQuizService = Depends(get_async_quiz_service)
+):
+    async def events():
+        async for event in quiz_service.stream_quiz_for_user(user_id=current_user.id, profile_data=profile.dict()):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 
 @router.post(
@@ -27,12 +79,12 @@ def generate_quiz(
     summary="Submit quiz answers",
     status_code=status.HTTP_200_OK,
 )
-def submit_quiz_answers(
+async def submit_quiz_answers(
     submission: QuizSubmitRequest,
-    current_user: User = Depends(get_current_user),
-    quiz_service: QuizService = Depends(get_quiz_service)
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: AsyncQuizService = Depends(get_async_quiz_service)
 ):
-    return quiz_service.process_quiz_response(
+    return await quiz_service.process_quiz_response(
         user_id=current_user.id,
         quiz_id=submission.quiz_id,
         responses=[resp.dict() for resp in submission.responses]
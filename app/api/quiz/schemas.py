@@ -34,10 +34,28 @@ class QuizQuestion(BaseModel):
     options: Optional[List[str]] = None
     correct_answer: Optional[str] = None
 
+class GeneratedQuestion(QuizQuestion):
+    question_id: UUID4 = Field(..., description="Pass back as question_id when submitting answers")
+
 class QuizGenerateResponse(BaseModel):
     quiz_id: UUID4
     total_questions: int
-    questions: List[QuizQuestion]
+    questions: List[GeneratedQuestion]
+
+class CohortMember(BaseModel):
+    user_id: UUID = Field(..., description="Student the quiz is generated for")
+    profile: ProfileCreate
+
+class QuizBatchRequest(BaseModel):
+    members: List[CohortMember] = Field(..., min_length=1)
+
+class QuizBatchItem(QuizGenerateResponse):
+    user_id: UUID
+
+class QuizBatchResponse(BaseModel):
+    quizzes: List[QuizBatchItem]
+    failed: List[UUID] = Field(default_factory=list, description="Members whose quiz couldn't be generated")
+    llm_calls: int = Field(..., description="Prompts sent to the LLM for the whole cohort")
 
 # Optional: If you want to expose quiz metadata
 class QuizMetadata(BaseModel):
@@ -1,16 +1,25 @@
-from app.db.repositories.profile import ProfileRepository
-from app.db.repositories.quiz import QuizRepository
+from app.db.repositories.profile import ProfileRepository, AsyncProfileRepository
+from app.db.repositories.quiz import QuizRepository, AsyncQuizRepository
+from app.db.session import arelease_connection
 from app.LLMs.client import LLMClient
+from app.LLMs.stream_parser import JSONObjectStreamParser
+from app.api.quiz.pool import QuizPool, profile_fingerprint
+from app.api.quiz.manifest import QuestionManifest, question_manifests
 from app.vectorDB.embeddings import EmbeddingGenerator
 from app.vectorDB.vector_store import VectorStore
+from app.vectorDB.hybrid import lexical_index
+from app.vectorDB.indexer import answer_indexer, build_answer_docs
 from uuid import UUID
 from app.core import prompts
-from typing import List
 from app.core.config import settings
 import json
 import ast
-from typing import List, Union
+from typing import AsyncIterator, List, Optional, Union
 import re
+import asyncio
+import uuid
+from fastapi import HTTPException, status
+from types import SimpleNamespace
 
 class QuizService:
     def __init__(
@@ -27,15 +36,19 @@ class QuizService:
         self.vector_store = vector_store
         self.embedding_generator = embedding_generator
 
-    def generate_quiz_for_user(self, user_id: UUID, profile_data: dict):
+    def generate_quiz_for_user(self, user_id: UUID, profile_data: dict, fresh: bool = False):
+        """`fresh` skips the pre-generated pool and the response cache."""
         profile_data['user_id'] = str(user_id)
-        profile = self.profile_repo.create_or_update(profile_data)
 
-        prompt = prompts.build_quiz_prompt(profile=profile)
+        questions = quiz_pool.take(profile_data) if settings.QUIZ_POOL_ENABLED and not fresh else None
+        source = "pregenerated_pool"
+        if questions is None:
+            source = "llm_generated"
+            prompt = prompts.build_quiz_prompt(profile=SimpleNamespace(**profile_data))
 
-        raw_response = self.llm_client.chat(prompt=prompt,expect_json=True, default_keys={"questions": []})
-        print("raw response: ",raw_response)
-        questions = self._parse_llm_response(raw_response)
+            raw_response = self.llm_client.chat(prompt=prompt,expect_json=True, default_keys={"questions": []}, use_cache=_use_cache(fresh))
+            print("raw response: ",raw_response)
+            questions = self._parse_llm_response(raw_response)
         # if isinstance(raw_response, str):
         #     try:
         #         raw_response = json.loads(raw_response)
@@ -56,48 +69,22 @@ class QuizService:
             raise ValueError("Questions must be a list.")
         
 
-        tags = list({tag for q in questions for tag in q.get("tags", [])})
-        quiz_type = "personalized"  
-
-        quiz_data = {
-            "user_id": user_id,
-            "profile_snapshot": profile_data,
-            "total_questions": len(questions),
-            "quiz_type": quiz_type,
-            "tags": tags,
-            "quiz_metadata": {
-                "source": "llm_generated",
-                "model": settings.MODEL
-            }
-        }
-        quiz = self.quiz_repo.create_quiz(quiz_data)
-
-        formatted_questions = []
-        for q in questions:
-            options_raw = q.get("options", None)
-            if options_raw and isinstance(options_raw, list):
-                options = []
-                for opt in options_raw:
-                    if isinstance(opt, dict) and "text" in opt:
-                        options.append(opt["text"])
-                    else:
-                        options.append(str(opt))
-            else:
-                options = None
-            formatted_questions.append({
-                "question_text": q["question_text"],
-                "question_type": q.get("question_type", "open_ended"),
-                "options": q.get("options", None),
-                "correct_answer": q.get("correct_answer", None),
-             #   "quiz_id": str(quiz.id)
-            })
+        quiz_id = uuid.uuid4()
+        question_rows = _question_rows(quiz_id, _format_questions(questions))
 
-        self.quiz_repo.add_questions(quiz_id=str(quiz.id), questions=formatted_questions)
+        # Profile, quiz and questions go out in one transaction.
+        self.profile_repo.upsert_many([profile_data])
+        self.quiz_repo.bulk_create(
+            [{"id": quiz_id, **_build_quiz_data(user_id, profile_data, questions, source)}],
+            question_rows,
+        )
+        generated = _generated_questions(question_rows)
+        question_manifests.put(quiz_id, user_id, generated)
 
         return {
-            "quiz_id": str(quiz.id),
+            "quiz_id": str(quiz_id),
             "total_questions": len(questions),
-            "questions": formatted_questions
+            "questions": generated
         }
     
 
@@ -112,17 +99,23 @@ class QuizService:
             "score": float | None
         }
         """
+        if not responses:
+            return {"status": "saved", "embedded": 0}
 
-        answers = self.quiz_repo.save_answers(user_id, quiz_id, responses)
-
-        question_ids = [resp["question_id"] for resp in responses]
-        question_objs = self.quiz_repo.get_questions_by_ids(question_ids)
-        question_type_map = {str(q.id): q.question_type for q in question_objs}
+        manifest = question_manifests.get(quiz_id)
+        if manifest is not None:
+            _check_submission(manifest, user_id, responses)
+            answers = self.quiz_repo.insert_answers(user_id, quiz_id, responses)
+            open_ended = _open_ended_answers(answers, manifest)
+        else:
+            answers = self.quiz_repo.insert_answers_checked(user_id, quiz_id, responses)
+            if answers is None:
+                raise _invalid_submission()
+            open_ended = _open_ended_answers(answers)
 
-        open_ended = [
-            ans for ans in answers
-            if question_type_map.get(str(ans.question_id)) == "open_ended"
-        ]
+        if settings.WRITE_BEHIND_INDEXING:
+            answer_indexer.enqueue([ans.id for ans in open_ended])
+            return {"status": "saved", "queued": len(open_ended), "indexing_lag_seconds": answer_indexer.lag_seconds()}
 
         if not open_ended:
             return {"status": "saved", "embedded": 0}
@@ -131,85 +124,415 @@ class QuizService:
         embeddings = self.embedding_generator.embed(answer_texts)
         print("embeddings: ",embeddings)
 
-        vector_docs = []
-        for idx, ans in enumerate(open_ended):
-            vector_docs.append({
-                "id": str(ans.id),
-                "embedding": embeddings[idx],
-                "metadata": {
-                    "user_id": str(ans.user_id),
-                    "quiz_id": str(ans.quiz_id),
-                    "question_id": str(ans.question_id),
-                    "answer_text": ans.answer_text,
-                    "created_at": str(ans.created_at)
-                }
-            })
-            print(f"\nDocument {idx+1}:")
-            print("ID:", ans.id)
-            print("Embedding:",embeddings)
-            print("Metadata:", ans.answer_text)
-
+        vector_docs = build_answer_docs(open_ended, embeddings)
         self.vector_store.add_documents(vector_docs)
+        lexical_index.add_documents(vector_docs)
 
         return {"status": "saved", "embedded": len(open_ended)}
     
 
     def _parse_llm_response(self, raw_response: Union[str, dict, list]) -> list:
+        return parse_questions(raw_response)
+
+
+class AsyncQuizService(QuizService):
+    """
+    Async variant of QuizService backed by AsyncSession repositories.
+    The LLM call is awaited and embedding/vector writes run in executors,
+    so a generation in flight doesn't pin a threadpool thread.
+    """
+
+    profile_repo: AsyncProfileRepository
+    quiz_repo: AsyncQuizRepository
+
+    async def generate_quiz_for_user(self, user_id: UUID, profile_data: dict, fresh: bool = False):
+        profile_data['user_id'] = str(user_id)
+
+        questions = quiz_pool.take(profile_data) if settings.QUIZ_POOL_ENABLED and not fresh else None
+        source = "pregenerated_pool"
+        if questions is None:
+            source = "llm_generated"
+            prompt = prompts.build_quiz_prompt(profile=SimpleNamespace(**profile_data))
+            raw_response = await self.llm_client.achat(prompt=prompt, expect_json=True, default_keys={"questions": []}, use_cache=_use_cache(fresh))
+            questions = self._parse_llm_response(raw_response)
+
+        if not isinstance(questions, list):
+            raise ValueError("Questions must be a list.")
+
+        quiz_id = uuid.uuid4()
+        question_rows = _question_rows(quiz_id, _format_questions(questions))
+
+        await self.profile_repo.upsert_many([profile_data])
+        await self.quiz_repo.bulk_create(
+            [{"id": quiz_id, **_build_quiz_data(user_id, profile_data, questions, source)}],
+            question_rows,
+        )
+        generated = _generated_questions(question_rows)
+        question_manifests.put(quiz_id, user_id, generated)
+
+        return {
+            "quiz_id": str(quiz_id),
+            "total_questions": len(questions),
+            "questions": generated
+        }
+
+    async def stream_quiz_for_user(self, user_id: UUID, profile_data: dict) -> AsyncIterator[dict]:
         """
-        Robustly parse the LLM response and return a list of question dictionaries.
-        Handles:
-        - Raw JSON strings
-        - Python literals
-        - Nested strings inside 'questions', 'data', or 'response'
-        - Fallbacks to `ast.literal_eval` when needed
+        Generate a quiz while the LLM is still streaming. The quiz row is
+        created up front, each question is persisted and yielded as soon as
+        its object closes, and the quiz is finalised with tags and count at
+        the end.
         """
+        profile_data['user_id'] = str(user_id)
+        profile = await self.profile_repo.create_or_update(profile_data)
+        prompt = prompts.build_quiz_prompt(profile=profile)
 
-        def _clean_json_string(s: str) -> str:
-            """Clean common JSON issues."""
-            s = re.sub(r'//.*', '', s)  # Remove comments
-            s = s.replace('...', '')  # Remove ellipses
-            s = re.sub(r',\s*([\]}])', r'\1', s)  # Remove trailing commas
-            return s.strip()
+        quiz = await self.quiz_repo.create_quiz(_build_quiz_data(user_id, profile_data, []))
+        await arelease_connection(self.quiz_repo.db)
+        yield {"event": "quiz", "quiz_id": str(quiz.id)}
 
-        def _try_parse_string(s: str):
-            """Try parsing string as JSON or Python literal."""
-            try:
-                return json.loads(_clean_json_string(s))
-            except Exception:
+        parser = JSONObjectStreamParser()
+        raw_questions, streamed = [], []
+        async for fragment in self.llm_client.astream(prompt):
+            for obj_text in parser.feed(fragment):
+                try:
+                    parsed = self._parse_llm_response(obj_text)
+                except ValueError:
+                    continue
+                parsed = [q for q in parsed if isinstance(q, dict) and q.get("question_text")]
+                if not parsed:
+                    continue
+                raw_questions.extend(parsed)
+                formatted = _format_questions(parsed)
+                saved = await self.quiz_repo.add_questions(quiz_id=str(quiz.id), questions=formatted)
+                for question, question_data in zip(saved, formatted):
+                    streamed.append({"question_id": str(question.id), **question_data})
+                    yield {"event": "question", **streamed[-1]}
+
+        quiz_data = _build_quiz_data(user_id, profile_data, raw_questions)
+        await self.quiz_repo.finalize_quiz(quiz.id, quiz_data["total_questions"], quiz_data["tags"])
+        question_manifests.put(quiz.id, user_id, streamed)
+        yield {"event": "done", "quiz_id": str(quiz.id), "total_questions": len(raw_questions)}
+
+    async def generate_cohort_quizzes(self, members: List[dict], fresh: bool = False) -> dict:
+        """
+        Generate one quiz per cohort member ({"user_id", "profile"}).
+
+        Similar profiles are packed several to a prompt, packs run
+        concurrently up to QUIZ_BATCH_CONCURRENCY, and any student missing
+        from a packed answer is retried on their own. Students whose
+        generation still fails (unparseable answer, LLM overload or
+        transport error) are reported in "failed" instead of failing the
+        cohort. Profiles, quizzes and questions are written in
+        a single transaction at the end.
+        """
+        if len(members) > settings.QUIZ_BATCH_MAX_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"At most {settings.QUIZ_BATCH_MAX_SIZE} profiles per batch",
+            )
+        user_ids = [m["user_id"] for m in members]
+        if len(set(user_ids)) != len(user_ids):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Duplicate user_id in batch")
+        missing = set(user_ids) - await self.profile_repo.existing_user_ids(user_ids)
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown users: {', '.join(sorted(str(u) for u in missing))}",
+            )
+        await arelease_connection(self.profile_repo.db)
+
+        profiles = [{**m["profile"], "user_id": str(m["user_id"])} for m in members]
+        questions_by_member: List[list] = [None] * len(members)
+        sources = ["llm_generated"] * len(members)
+        if settings.QUIZ_POOL_ENABLED and not fresh:
+            for i, profile_data in enumerate(profiles):
+                questions_by_member[i] = quiz_pool.take(profile_data)
+                if questions_by_member[i] is not None:
+                    sources[i] = "pregenerated_pool"
+
+        pending = [i for i in range(len(members)) if questions_by_member[i] is None]
+        semaphore = asyncio.Semaphore(settings.QUIZ_BATCH_CONCURRENCY)
+        llm_calls = 0
+
+        async def generate(pack: List[int]):
+            nonlocal llm_calls
+            pack_profiles = [SimpleNamespace(**profiles[i]) for i in pack]
+            async with semaphore:
+                llm_calls += 1
+                if len(pack) == 1:
+                    prompt = prompts.build_quiz_prompt(profile=pack_profiles[0])
+                else:
+                    prompt = prompts.build_cohort_quiz_prompt(pack_profiles)
                 try:
-                    return ast.literal_eval(s)
+                    raw_response = await self.llm_client.achat(prompt=prompt, expect_json=True, default_keys={"questions": []}, use_cache=_use_cache(fresh))
                 except Exception:
-                    return None
-
-        # Step 1: If string, parse
-        if isinstance(raw_response, str):
-            parsed = _try_parse_string(raw_response)
-            if parsed is not None:
-                raw_response = parsed
-
-        # Step 2: If dict, look for embedded questions
-        if isinstance(raw_response, dict):
-            for key in ["questions", "data", "response", "items"]:
-                if key in raw_response:
-                    inner = raw_response[key]
-                    if isinstance(inner, str):
-                        inner = _try_parse_string(inner)
-                    if isinstance(inner, list):
-                        return inner
-                    elif isinstance(inner, dict) and "questions" in inner:
-                        return inner["questions"]
-            # Edge case: if dict is actually a single question
-            if "question_text" in raw_response:
-                return [raw_response]
-
-        # Step 3: Already a list
-        if isinstance(raw_response, list):
-            return raw_response
-
-        # Final fallback failed
-        raise ValueError(
-            f"Unable to parse LLM response into list of questions. Type: {type(raw_response)} | Content: {str(raw_response)[:500]}"
-        )
+                    # Overload or transport failure: this pack's students end
+                    # up in "failed", quizzes already generated are kept.
+                    return
+
+            if len(pack) == 1:
+                try:
+                    questions_by_member[pack[0]] = self._parse_llm_response(raw_response)
+                except ValueError:
+                    pass
+                return
+            unpacked = _unpack_cohort_response(raw_response, len(pack))
+            for i, questions in zip(pack, unpacked):
+                if questions:
+                    questions_by_member[i] = questions
+            await asyncio.gather(*(generate([i]) for i, questions in zip(pack, unpacked) if not questions))
+
+        await asyncio.gather(*(generate(pack) for pack in _pack_profiles(profiles, pending, settings.QUIZ_BATCH_PACK_SIZE)))
+
+        quiz_rows, question_rows, quizzes, failed, generated_profiles = [], [], [], [], []
+        for i, member in enumerate(members):
+            questions = questions_by_member[i]
+            if not isinstance(questions, list):
+                failed.append(member["user_id"])
+                continue
+            generated_profiles.append(profiles[i])
+            quiz_id = uuid.uuid4()
+            rows = _question_rows(quiz_id, _format_questions(questions))
+            quiz_rows.append({"id": quiz_id, **_build_quiz_data(member["user_id"], profiles[i], questions, sources[i])})
+            question_rows.extend(rows)
+            quizzes.append({
+                "user_id": member["user_id"],
+                "quiz_id": str(quiz_id),
+                "total_questions": len(questions),
+                "questions": _generated_questions(rows),
+            })
+
+        if quiz_rows:
+            await self.profile_repo.upsert_many(generated_profiles)
+            await self.quiz_repo.bulk_create(quiz_rows, question_rows)
+        for quiz in quizzes:
+            question_manifests.put(quiz["quiz_id"], quiz["user_id"], quiz["questions"])
+
+        return {"quizzes": quizzes, "failed": failed, "llm_calls": llm_calls}
+
+    async def process_quiz_response(self, user_id: UUID, quiz_id: UUID, responses: List[dict]):
+        if not responses:
+            return {"status": "saved", "embedded": 0}
+
+        manifest = question_manifests.get(quiz_id)
+        if manifest is not None:
+            _check_submission(manifest, user_id, responses)
+            answers = await self.quiz_repo.insert_answers(user_id, quiz_id, responses)
+            open_ended = _open_ended_answers(answers, manifest)
+        else:
+            answers = await self.quiz_repo.insert_answers_checked(user_id, quiz_id, responses)
+            if answers is None:
+                raise _invalid_submission()
+            open_ended = _open_ended_answers(answers)
+
+        if settings.WRITE_BEHIND_INDEXING:
+            answer_indexer.enqueue([ans.id for ans in open_ended])
+            return {"status": "saved", "queued": len(open_ended), "indexing_lag_seconds": answer_indexer.lag_seconds()}
+
+        if not open_ended:
+            return {"status": "saved", "embedded": 0}
+
+        answer_texts = [ans.answer_text for ans in open_ended]
+        embeddings = await self.embedding_generator.aembed(answer_texts)
+
+        vector_docs = build_answer_docs(open_ended, embeddings)
+        await self.vector_store.aadd_documents(vector_docs)
+        lexical_index.add_documents(vector_docs)
+
+        return {"status": "saved", "embedded": len(open_ended)}
+
+
+def _use_cache(fresh: bool) -> bool:
+    return settings.QUIZ_RESPONSE_CACHE_ENABLED and not fresh
+
+
+def _build_quiz_data(user_id: UUID, profile_data: dict, questions: list, source: str = "llm_generated") -> dict:
+    tags = list({tag for q in questions for tag in q.get("tags", [])})
+    quiz_type = "personalized"  
+
+    return {
+        "user_id": user_id,
+        "profile_snapshot": profile_data,
+        "total_questions": len(questions),
+        "quiz_type": quiz_type,
+        "tags": tags,
+        "quiz_metadata": {
+            "source": source,
+            "model": settings.MODEL
+        }
+    }
+
+
+def _format_questions(questions: list) -> List[dict]:
+    formatted_questions = []
+    for q in questions:
+        options_raw = q.get("options", None)
+        if options_raw and isinstance(options_raw, list):
+            options = []
+            for opt in options_raw:
+                if isinstance(opt, dict) and "text" in opt:
+                    options.append(opt["text"])
+                else:
+                    options.append(str(opt))
+        else:
+            options = None
+        formatted_questions.append({
+            "question_text": q["question_text"],
+            "question_type": q.get("question_type", "open_ended"),
+            "options": q.get("options", None),
+            "correct_answer": q.get("correct_answer", None),
+         #   "quiz_id": str(quiz.id)
+        })
+    return formatted_questions
+
+
+def _question_rows(quiz_id: UUID, formatted_questions: List[dict]) -> List[dict]:
+    return [{"id": uuid.uuid4(), "quiz_id": quiz_id, **q} for q in formatted_questions]
+
+
+def _generated_questions(question_rows: List[dict]) -> List[dict]:
+    """Question rows as returned to the client: question_id instead of id/quiz_id."""
+    return [
+        {"question_id": str(row["id"]), **{k: v for k, v in row.items() if k not in ("id", "quiz_id")}}
+        for row in question_rows
+    ]
+
+
+def _pack_profiles(profiles: List[dict], indexes: List[int], pack_size: int) -> List[List[int]]:
+    """
+    Chunk `indexes` into packs of up to `pack_size`, ordering by profile
+    fingerprint first so students with similar backgrounds share a prompt.
+    """
+    ordered = sorted(indexes, key=lambda i: profile_fingerprint(profiles[i]))
+    return [ordered[start:start + pack_size] for start in range(0, len(ordered), max(1, pack_size))]
+
+
+def _unpack_cohort_response(raw_response, pack_len: int) -> List[list]:
+    """
+    Split a packed cohort answer into per-student question lists. Entries
+    are matched by their "student" number, falling back to position; a
+    student with no usable questions gets an empty list. A flat list of
+    questions (no per-student grouping) is treated as unparseable rather
+    than dealt out one question per student.
+    """
+    results: List[list] = [[] for _ in range(pack_len)]
+    try:
+        entries = parse_questions(raw_response)
+    except ValueError:
+        return results
+    if any(isinstance(entry, dict) and "question_text" in entry for entry in entries):
+        return results
+
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        student = entry.get("student")
+        index = student - 1 if isinstance(student, int) else position
+        if not 0 <= index < pack_len:
+            continue
+        try:
+            questions = parse_questions(entry)
+        except ValueError:
+            continue
+        results[index] = [q for q in questions if isinstance(q, dict) and q.get("question_text")]
+    return results
+
+
+def _open_ended_answers(answers: list, manifest: Optional[QuestionManifest] = None) -> list:
+    """Answers to open-ended questions, typed from the manifest or from the row itself."""
+    if manifest is None:
+        return [ans for ans in answers if ans.question_type == "open_ended"]
+    return [
+        ans for ans in answers
+        if manifest.question_types.get(str(ans.question_id)) == "open_ended"
+    ]
+
+
+def _check_submission(manifest: QuestionManifest, user_id: UUID, responses: List[dict]) -> None:
+    if manifest.user_id != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+    invalid = manifest.invalid_question_ids([resp["question_id"] for resp in responses])
+    if invalid:
+        raise _invalid_submission(invalid)
+
+
+def _invalid_submission(question_ids: Optional[List[str]] = None) -> HTTPException:
+    detail = "Responses must reference questions of one of your quizzes"
+    if question_ids:
+        detail = f"Questions not in this quiz: {', '.join(question_ids)}"
+    return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+def parse_questions(raw_response: Union[str, dict, list]) -> list:
+    """
+    Robustly parse the LLM response and return a list of question dictionaries.
+    Handles:
+    - Raw JSON strings
+    - Python literals
+    - Nested strings inside 'questions', 'data', or 'response'
+    - Fallbacks to `ast.literal_eval` when needed
+    """
+
+    def _clean_json_string(s: str) -> str:
+        """Clean common JSON issues."""
+        s = re.sub(r'//.*', '', s)  # Remove comments
+        s = s.replace('...', '')  # Remove ellipses
+        s = re.sub(r',\s*([\]}])', r'\1', s)  # Remove trailing commas
+        return s.strip()
+
+    def _try_parse_string(s: str):
+        """Try parsing string as JSON or Python literal."""
+        try:
+            return json.loads(_clean_json_string(s))
+        except Exception:
+            try:
+                return ast.literal_eval(s)
+            except Exception:
+                return None
+
+    # Step 1: If string, parse
+    if isinstance(raw_response, str):
+        parsed = _try_parse_string(raw_response)
+        if parsed is not None:
+            raw_response = parsed
+
+    # Step 2: If dict, look for embedded questions
+    if isinstance(raw_response, dict):
+        for key in ["questions", "data", "response", "items"]:
+            if key in raw_response:
+                inner = raw_response[key]
+                if isinstance(inner, str):
+                    inner = _try_parse_string(inner)
+                if isinstance(inner, list):
+                    return inner
+                elif isinstance(inner, dict) and "questions" in inner:
+                    return inner["questions"]
+        # Edge case: if dict is actually a single question
+        if "question_text" in raw_response:
+            return [raw_response]
+
+    # Step 3: Already a list
+    if isinstance(raw_response, list):
+        return raw_response
+
+    # Final fallback failed
+    raise ValueError(
+        f"Unable to parse LLM response into list of questions. Type: {type(raw_response)} | Content: {str(raw_response)[:500]}"
+    )
+
+
+def _pregenerate_questions(profile_data: dict) -> list:
+    prompt = prompts.build_quiz_prompt(profile=SimpleNamespace(**profile_data))
+    raw_response = LLMClient(priority=settings.LLM_PRIORITY_BACKGROUND).chat(prompt=prompt, expect_json=True, default_keys={"questions": []}, use_cache=False)
+    questions = parse_questions(raw_response)
+    return questions if isinstance(questions, list) else None
 
 
-   
\ No newline at end of file
+quiz_pool = QuizPool(
+    generate=_pregenerate_questions,
+    max_per_fingerprint=settings.QUIZ_POOL_SIZE,
+    max_fingerprints=settings.QUIZ_POOL_MAX_FINGERPRINTS,
+    ttl_seconds=settings.QUIZ_POOL_TTL_SECONDS,
+    workers=settings.QUIZ_POOL_WORKERS,
+)
@@ -8,8 +8,103 @@ class Settings(BaseSettings):
     JWT_SECRET: str = os.getenv("JWT_SECRET")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_CONCURRENCY: int = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", "16"))
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+    AUTH_PRINCIPAL_CACHE_SIZE: int = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: float = float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "60"))
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10"))
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Server-side statement_timeout; 0 disables it.
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
     LLM_BASE_URL: str = os.getenv("LLM_BASE_URL")
     MODEL : str = os.getenv("MODEL")
+    # Comma-separated list of model servers; defaults to LLM_BASE_URL alone.
+    LLM_BASE_URLS: str = os.getenv("LLM_BASE_URLS", "")
+    LLM_HEALTH_PATH: str = os.getenv("LLM_HEALTH_PATH", "/")
+    LLM_HEALTH_INTERVAL_SECONDS: float = float(os.getenv("LLM_HEALTH_INTERVAL_SECONDS", "10"))
+    LLM_EJECT_AFTER_FAILURES: int = int(os.getenv("LLM_EJECT_AFTER_FAILURES", "3"))
+    LLM_HEDGE_ENABLED: bool = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE: float = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_POOL_SIZE: int = int(os.getenv("LLM_POOL_SIZE", "20"))
+    LLM_CONNECT_TIMEOUT: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+    LLM_READ_TIMEOUT: float = float(os.getenv("LLM_READ_TIMEOUT", "180"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_BACKOFF_FACTOR: float = float(os.getenv("LLM_BACKOFF_FACTOR", "0.5"))
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", "1000"))
+    LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    # Quiz generation samples at temperature > 0 on purpose; only serve
+    # identical quiz prompts from the response cache when asked to.
+    QUIZ_RESPONSE_CACHE_ENABLED: bool = os.getenv("QUIZ_RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    LLM_LIMITER_ENABLED: bool = os.getenv("LLM_LIMITER_ENABLED", "true").lower() == "true"
+    LLM_LIMIT_INITIAL: int = int(os.getenv("LLM_LIMIT_INITIAL", "4"))
+    LLM_LIMIT_MIN: int = int(os.getenv("LLM_LIMIT_MIN", "1"))
+    LLM_LIMIT_MAX: int = int(os.getenv("LLM_LIMIT_MAX", "32"))
+    LLM_LIMIT_LATENCY_TARGET: float = float(os.getenv("LLM_LIMIT_LATENCY_TARGET", "45"))
+    LLM_LIMIT_MAX_QUEUE: int = int(os.getenv("LLM_LIMIT_MAX_QUEUE", "100"))
+    LLM_LIMIT_MAX_WAIT: float = float(os.getenv("LLM_LIMIT_MAX_WAIT", "30"))
+    LLM_PRIORITY_FEEDBACK: int = int(os.getenv("LLM_PRIORITY_FEEDBACK", "10"))
+    LLM_PRIORITY_QUIZ: int = int(os.getenv("LLM_PRIORITY_QUIZ", "5"))
+    LLM_PRIORITY_BACKGROUND: int = int(os.getenv("LLM_PRIORITY_BACKGROUND", "0"))
+    LLM_CACHE_BACKEND: str = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory | sql
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDING_WARMUP: bool = os.getenv("EMBEDDING_WARMUP", "true").lower() == "true"
+    EMBEDDING_BATCHING: bool = os.getenv("EMBEDDING_BATCHING", "true").lower() == "true"
+    EMBEDDING_BATCH_MAX_SIZE: int = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "64"))
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "5"))
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    EMBEDDING_CACHE_DIR: str = os.getenv("EMBEDDING_CACHE_DIR", "")
+    EMBEDDING_EXECUTOR_WORKERS: int = int(os.getenv("EMBEDDING_EXECUTOR_WORKERS", "4"))
+    VECTOR_BACKEND: str = os.getenv("VECTOR_BACKEND", "chroma")  # chroma | hnsw
+    VECTOR_CHROMA_DIR: str = os.getenv("VECTOR_CHROMA_DIR", "chroma_db")
+    VECTOR_HNSW_DIR: str = os.getenv("VECTOR_HNSW_DIR", "hnsw_db")
+    VECTOR_HNSW_EF: int = int(os.getenv("VECTOR_HNSW_EF", "64"))
+    VECTOR_SNAPSHOT_INTERVAL_SECONDS: float = float(os.getenv("VECTOR_SNAPSHOT_INTERVAL_SECONDS", "60"))
+    WRITE_BEHIND_INDEXING: bool = os.getenv("WRITE_BEHIND_INDEXING", "true").lower() == "true"
+    INDEXER_WORKERS: int = int(os.getenv("INDEXER_WORKERS", "1"))
+    INDEXER_BATCH_SIZE: int = int(os.getenv("INDEXER_BATCH_SIZE", "64"))
+    INDEXER_MAX_WAIT_MS: float = float(os.getenv("INDEXER_MAX_WAIT_MS", "50"))
+    INDEXER_MAX_RETRIES: int = int(os.getenv("INDEXER_MAX_RETRIES", "3"))
+    INDEXER_SWEEP_INTERVAL_SECONDS: float = float(os.getenv("INDEXER_SWEEP_INTERVAL_SECONDS", "30"))
+    RETRIEVAL_MODE: str = os.getenv("RETRIEVAL_MODE", "hybrid")  # hybrid | dense
+    HYBRID_CONTEXT_SIZE: int = int(os.getenv("HYBRID_CONTEXT_SIZE", "4"))
+    HYBRID_CANDIDATES: int = int(os.getenv("HYBRID_CANDIDATES", "20"))
+    HYBRID_RRF_K: int = int(os.getenv("HYBRID_RRF_K", "60"))
+    HYBRID_PARTITION_TTL_SECONDS: float = float(os.getenv("HYBRID_PARTITION_TTL_SECONDS", "300"))
+    HYBRID_MAX_PARTITIONS: int = int(os.getenv("HYBRID_MAX_PARTITIONS", "1000"))
+    FEEDBACK_SEMANTIC_CACHE_ENABLED: bool = os.getenv("FEEDBACK_SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    FEEDBACK_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("FEEDBACK_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    FEEDBACK_SEMANTIC_CACHE_COLLECTION: str = os.getenv("FEEDBACK_SEMANTIC_CACHE_COLLECTION", "feedback_cache")
+    QUIZ_POOL_ENABLED: bool = os.getenv("QUIZ_POOL_ENABLED", "false").lower() == "true"
+    QUIZ_POOL_SIZE: int = int(os.getenv("QUIZ_POOL_SIZE", "2"))
+    QUIZ_POOL_MAX_FINGERPRINTS: int = int(os.getenv("QUIZ_POOL_MAX_FINGERPRINTS", "500"))
+    QUIZ_POOL_TTL_SECONDS: float = float(os.getenv("QUIZ_POOL_TTL_SECONDS", "3600"))
+    QUIZ_POOL_WORKERS: int = int(os.getenv("QUIZ_POOL_WORKERS", "1"))
+    QUIZ_POOL_AGE_BUCKET: int = int(os.getenv("QUIZ_POOL_AGE_BUCKET", "5"))
+    QUIZ_MANIFEST_CACHE_SIZE: int = int(os.getenv("QUIZ_MANIFEST_CACHE_SIZE", "10000"))
+    QUIZ_BATCH_MAX_SIZE: int = int(os.getenv("QUIZ_BATCH_MAX_SIZE", "200"))
+    QUIZ_BATCH_PACK_SIZE: int = int(os.getenv("QUIZ_BATCH_PACK_SIZE", "4"))
+    QUIZ_BATCH_CONCURRENCY: int = int(os.getenv("QUIZ_BATCH_CONCURRENCY", "8"))
+    HISTORY_PAGE_SIZE: int = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+    HISTORY_MAX_PAGE_SIZE: int = int(os.getenv("HISTORY_MAX_PAGE_SIZE", "100"))
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_WORKERS_IN_APP: bool = os.getenv("JOB_WORKERS_IN_APP", "false").lower() == "true"
+    JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1"))
+    JOB_LEASE_SECONDS: float = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF_SECONDS: float = float(os.getenv("JOB_RETRY_BACKOFF_SECONDS", "30"))
+    JOB_WEBHOOK_ALLOWED_HOSTS: str = os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS", "")  # comma-separated; empty allows any public host
+    JOB_PRIORITY_FEEDBACK: int = int(os.getenv("JOB_PRIORITY_FEEDBACK", "10"))
+    JOB_PRIORITY_QUIZ: int = int(os.getenv("JOB_PRIORITY_QUIZ", "0"))
 
 settings = Settings()
@@ -1,19 +1,24 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db, get_async_db
 from app.db.repositories.user import UserRepository
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import decode_access_token
-from app.db.models.user import User
-from app.db.repositories.profile import ProfileRepository
-from app.db.repositories.quiz import QuizRepository
+from app.core.principal import Principal, principals, verified_tokens
+from app.db.repositories.profile import ProfileRepository, AsyncProfileRepository
+from app.db.repositories.quiz import QuizRepository, AsyncQuizRepository
 from app.LLMs.client import LLMClient
-from app.vectorDB.vector_store import VectorStore
+from app.vectorDB.vector_store import VectorStore, create_vector_store
 from app.vectorDB.embeddings import EmbeddingGenerator
-from app.api.quiz.services import QuizService
-from app.db.repositories.feedback import FeedbackRepository
-from app.api.feedback.services import FeedbackService
+from app.api.quiz.services import QuizService, AsyncQuizService
+from app.db.repositories.feedback import FeedbackRepository, AsyncFeedbackRepository
+from app.api.feedback.services import FeedbackService, AsyncFeedbackService
+from app.api.feedback.semantic_cache import SemanticFeedbackCache
+from app.db.repositories.job import AsyncJobRepository
+from app.api.jobs.services import JobService
+from app.api.history.services import HistoryService
+from app.core.config import settings
 
 
 oauth2_scheme = HTTPBearer()
@@ -21,19 +26,17 @@ oauth2_scheme = HTTPBearer()
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    token = credentials.credentials
-    payload = decode_access_token(token)
+) -> Principal:
+    payload = verified_tokens.decode(credentials.credentials)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid token")
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token payload")
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    principal = principals.resolve(payload)
+    if principal is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    return principal
 
 
 
@@ -59,7 +62,7 @@ def get_embedding_generator() -> EmbeddingGenerator:
     return EmbeddingGenerator()
 
 def get_vector_store() -> VectorStore:
-    return VectorStore()
+    return create_vector_store()
 
 def get_quiz_service(
     profile_repo = Depends(get_profile_repository),
@@ -77,11 +80,59 @@ def get_quiz_service(
     )
 
 
+def get_semantic_feedback_cache() -> SemanticFeedbackCache | None:
+    if not settings.FEEDBACK_SEMANTIC_CACHE_ENABLED:
+        return None
+    return SemanticFeedbackCache(
+        EmbeddingGenerator(),
+        create_vector_store(
+            collection_name=settings.FEEDBACK_SEMANTIC_CACHE_COLLECTION,
+            collection_metadata={"hnsw:space": "cosine"},
+        ),
+        threshold=settings.FEEDBACK_SEMANTIC_CACHE_THRESHOLD,
+    )
+
+
 def get_feedback_service(db=Depends(get_db)):
     feedback_repo = FeedbackRepository(db)
     quiz_repo = QuizRepository(db)
     profile_repo = ProfileRepository(db)
-    vector_store = VectorStore()
+    vector_store = create_vector_store()
     embedding_gen = EmbeddingGenerator()
-    llm_client = LLMClient()
-    return FeedbackService(feedback_repo, quiz_repo,profile_repo, vector_store, embedding_gen, llm_client)
+    llm_client = LLMClient(priority=settings.LLM_PRIORITY_FEEDBACK)
+    return FeedbackService(feedback_repo, quiz_repo,profile_repo, vector_store, embedding_gen, llm_client, get_semantic_feedback_cache())
+
+
+def get_async_quiz_service(
+    db: AsyncSession = Depends(get_async_db),
+    llm_client: LLMClient = Depends(get_llm_client),
+    vector_store: VectorStore = Depends(get_vector_store),
+    embedding_generator: EmbeddingGenerator = Depends(get_embedding_generator)
+) -> AsyncQuizService:
+    return AsyncQuizService(
+        AsyncProfileRepository(db),
+        AsyncQuizRepository(db),
+        llm_client,
+        vector_store,
+        embedding_generator
+    )
+
+
+def get_async_feedback_service(db: AsyncSession = Depends(get_async_db)) -> AsyncFeedbackService:
+    return AsyncFeedbackService(
+        AsyncFeedbackRepository(db),
+        AsyncQuizRepository(db),
+        AsyncProfileRepository(db),
+        create_vector_store(),
+        EmbeddingGenerator(),
+        LLMClient(priority=settings.LLM_PRIORITY_FEEDBACK),
+        get_semantic_feedback_cache(),
+    )
+
+
+def get_job_service(db: AsyncSession = Depends(get_async_db)) -> JobService:
+    return JobService(AsyncJobRepository(db))
+
+
+def get_history_service(db: AsyncSession = Depends(get_async_db)) -> HistoryService:
+    return HistoryService(AsyncQuizRepository(db))
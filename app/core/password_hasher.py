@@ -0,0 +1,123 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+def _timed_hash(password: str) -> Tuple[str, float]:
+    from app.core.security import hash_password
+
+    started = time.perf_counter()
+    hashed = hash_password(password)
+    return hashed, time.perf_counter() - started
+
+
+def _timed_verify_and_update(password: str, hashed: str) -> Tuple[Tuple[bool, Optional[str]], float]:
+    from app.core.security import verify_and_update_password
+
+    started = time.perf_counter()
+    result = verify_and_update_password(password, hashed)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool so a login storm burns those
+    cores instead of the API worker's. At most `max_concurrency` hashes are
+    queued or running; callers beyond that wait up to `queue_timeout` and
+    then get a 503. With `workers=0` hashing runs inline.
+    """
+
+    def __init__(self, workers: int = 2, max_concurrency: int = 16, queue_timeout: float = 5.0):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        self.workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _run(self, fn, *args):
+        submitted = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many concurrent logins, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            if self.workers > 0:
+                result, hash_time = self._get_executor().submit(fn, *args).result()
+            else:
+                result, hash_time = fn(*args)
+        finally:
+            self._slots.release()
+
+        # Everything that wasn't spent hashing was spent waiting for a slot or a worker.
+        wait = time.perf_counter() - submitted - hash_time
+        with self._lock:
+            self.completed += 1
+            self.queue_wait_total += wait
+            self.queue_wait_max = max(self.queue_wait_max, wait)
+            self.hash_time_total += hash_time
+            self.hash_time_max = max(self.hash_time_max, hash_time)
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run(_timed_hash, password)
+
+    def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored hash should be replaced."""
+        valid, new_hash = self._run(_timed_verify_and_update, password, hashed)
+        if new_hash:
+            with self._lock:
+                self.rehashed += 1
+        return valid, new_hash
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed or 1
+            return {
+                "workers": self.workers,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "queue_wait_avg_ms": round(self.queue_wait_total / done * 1000, 2),
+                "queue_wait_max_ms": round(self.queue_wait_max * 1000, 2),
+                "hash_time_avg_ms": round(self.hash_time_total / done * 1000, 2),
+                "hash_time_max_ms": round(self.hash_time_max * 1000, 2),
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
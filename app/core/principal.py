@@ -0,0 +1,186 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.models.user import User
+
+
+# Roles allowed to act on behalf of other users.
+STAFF_ROLES = frozenset({"teacher", "admin"})
+
+
+class Principal:
+    """The authenticated caller. Routes only need the id; email and role come from the token."""
+
+    __slots__ = ("id", "email", "role")
+
+    def __init__(self, id: UUID, email: Optional[str] = None, role: str = "student"):
+        self.id = id
+        self.email = email
+        self.role = role
+
+    @property
+    def is_staff(self) -> bool:
+        return self.role in STAFF_ROLES
+
+
+class VerifiedTokenCache:
+    """
+    LRU of tokens whose HS256 signature has already been checked, keyed by
+    a hash of the token. Entries are dropped once the token's own `exp`
+    passes, so a cached token is never accepted for longer than a freshly
+    verified one would be.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> Optional[dict]:
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                if payload.get("exp", 0) > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+            self.misses += 1
+
+        payload = decode_access_token(token)
+        if payload is None:
+            return None
+        with self._lock:
+            self._entries[key] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class PrincipalCache:
+    """
+    Short-TTL map of `sub` -> Principal.
+
+    Login reads the user from the database, so the claims of a token
+    (email, role, iat) are as fresh as its `iat`. A token issued less than
+    a TTL ago resolves straight from its claims, and that entry expires a
+    TTL after `iat`. Older tokens, tokens without those claims and users
+    changed after the token was issued fall back to `load_user` once per
+    TTL. User updates and deletes in this process invalidate the entry
+    immediately (see the ORM listeners below); changes made in other
+    processes are seen within the TTL. Change times are kept for
+    `token_lifetime_seconds`: after that every token issued before the
+    change has expired anyway.
+    """
+
+    def __init__(
+        self,
+        load_user: Callable[[str], Optional[User]],
+        ttl_seconds: float = 60,
+        max_entries: int = 10000,
+        token_lifetime_seconds: float = 3600,
+    ):
+        self.load_user = load_user
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.token_lifetime = token_lifetime_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # Oldest change first, so expired records are trimmed from the front.
+        self._changed_at: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.from_claims = 0
+        self.db_lookups = 0
+
+    def resolve(self, payload: dict) -> Optional[Principal]:
+        sub = payload["sub"]
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(sub)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(sub)
+                self.hits += 1
+                return entry[1]
+            changed_at = self._changed_at.get(sub)
+
+        iat = payload.get("iat")
+        claims_fresh = bool(iat) and iat + self.ttl > now and (changed_at is None or iat > changed_at)
+        if payload.get("email") and payload.get("role") and claims_fresh:
+            principal = Principal(UUID(sub), payload["email"], payload["role"])
+            expires_at = iat + self.ttl
+            self.from_claims += 1
+        else:
+            user = self.load_user(sub)
+            self.db_lookups += 1
+            if user is None:
+                return None
+            principal = Principal(user.id, user.email, user.role)
+            expires_at = now + self.ttl
+
+        with self._lock:
+            self._entries[sub] = (expires_at, principal)
+            self._entries.move_to_end(sub)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate(self, user_id) -> None:
+        sub = str(user_id)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(sub, None)
+            self._changed_at[sub] = now
+            self._changed_at.move_to_end(sub)
+            while next(iter(self._changed_at.values())) < now - self.token_lifetime:
+                self._changed_at.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "changed_users": len(self._changed_at),
+                "hits": self.hits,
+                "from_claims": self.from_claims,
+                "db_lookups": self.db_lookups,
+            }
+
+
+def _load_user(sub: str) -> Optional[User]:
+    # Own short-lived session: auth must not hold a connection for the request.
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        return db.query(User).filter(User.id == sub).first()
+
+
+verified_tokens = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+principals = PrincipalCache(
+    _load_user,
+    ttl_seconds=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    token_lifetime_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+# Password rehashes on login go through UserRepository.rehash_password, a
+# bulk UPDATE that doesn't fire these, so they aren't counted as changes.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principals.invalidate(target.id)
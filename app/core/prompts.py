@@ -39,6 +39,46 @@ Respond in **pure JSON**, structured as a list of question objects:
 
 
 
+def build_cohort_quiz_prompt(profiles: list) -> str:
+    students = "\n".join(
+        f"- Student {i}: age {p.age}, {p.gender}, {p.education}, lives in {p.city}, interests: {', '.join(p.hobbies or [])}"
+        for i, p in enumerate(profiles, start=1)
+    )
+    return f"""
+You are an expert tutor. Your task is to generate 6 personalized quiz questions for **each** of the following {len(profiles)} students.
+
+🧑 Student Profiles:
+{students}
+
+📘 Instructions:
+- For every student, include 2 of each question type: multiple choice (MCQ), open-ended, and true/false.
+- Questions should reflect that student's interests and educational background.
+- Use neutral, inclusive language.
+
+📤 Output Format:
+Respond in **pure JSON**, one entry per student, using the student number from the list above:
+
+```json
+[
+  {{
+    "student": 1,
+    "questions": [
+      {{
+        "question_text": "What is the main function of a CPU in a computer?",
+        "question_type": "mcq",                // mcq | open_ended | true_false
+        "options": ["Storage", "Processing", "Display", "Cooling"],  // Required for MCQ
+        "correct_answer": "Processing",        // Optional (can be null for open-ended)
+        "tags": ["technology", "computers"]
+      }},
+      ...
+    ]
+  }},
+  ...
+]
+
+"""
+
+
 def build_feedback_prompt(
     user_profile: dict,
     quiz_tags: List[str],
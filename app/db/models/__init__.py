@@ -1,3 +1,5 @@
 from .user import User
 from .quiz import Quiz
 from .feedback import Feedback
+from .llm_cache import LLMResponseCacheEntry
+from .job import Job
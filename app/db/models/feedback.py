@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Text, TIMESTAMP
+from sqlalchemy import Column, ForeignKey, Text, TIMESTAMP, String, Float
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -16,3 +16,9 @@ class Feedback(Base):
     feedback_text = Column(Text, nullable=False)
     follow_up_suggestion = Column(Text, nullable=True)
     created_at = Column(TIMESTAMP, server_default=func.now())
+
+    # Provenance: "llm" for a fresh generation, "semantic_cache" when reused
+    # from source_feedback_id at cache_similarity.
+    source = Column(String, nullable=False, server_default="llm", default="llm")
+    source_feedback_id = Column(UUID(as_uuid=True), ForeignKey("feedbacks.id"), nullable=True)
+    cache_similarity = Column(Float, nullable=True)
@@ -0,0 +1,38 @@
+import uuid
+from sqlalchemy import Column, ForeignKey, Integer, String, JSON, TIMESTAMP, Text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+
+    kind = Column(String, nullable=False)  # quiz, feedback
+    payload = Column(JSON, nullable=False)
+    priority = Column(Integer, nullable=False, server_default="0", default=0)
+    webhook_url = Column(Text, nullable=True)
+
+    # queued -> running -> succeeded | failed
+    status = Column(String, nullable=False, server_default="queued", default="queued")
+    attempts = Column(Integer, nullable=False, server_default="0", default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    # A running job whose lease has expired is treated as queued again,
+    # so a crashed worker doesn't strand it.
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(TIMESTAMP, nullable=True)
+
+    # Failed attempts are requeued with a backoff; not claimable before this.
+    available_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    started_at = Column(TIMESTAMP, nullable=True)
+    finished_at = Column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_claim", "status", priority.desc(), "created_at"),
+    )
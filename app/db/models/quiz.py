@@ -1,7 +1,8 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, String, JSON, TIMESTAMP, Text, ARRAY, Boolean, Float
+from sqlalchemy import Column, ForeignKey, Integer, String, JSON, TIMESTAMP, Text, ARRAY, Boolean, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
 from app.db.base import Base
 
 class Quiz(Base):
@@ -17,13 +18,22 @@ class Quiz(Base):
     tags = Column(ARRAY(String))
     quiz_metadata = Column(JSON)
 
+    # Loaded explicitly (selectinload) by the history API.
+    questions = relationship("Question", lazy="raise")
+    answers = relationship("Answer", order_by="Answer.created_at", lazy="raise")
+    feedbacks = relationship("Feedback", order_by="Feedback.created_at", lazy="raise")
+
+    __table_args__ = (
+        # get_last_quiz_for_user / history: newest quizzes of one user.
+        Index("ix_quizzes_user_id_created_at", "user_id", created_at.desc()),
+    )
 
 
 class Question(Base):
     __tablename__ = "questions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    quiz_id = Column(UUID(as_uuid=True), ForeignKey("quizzes.id"))
+    quiz_id = Column(UUID(as_uuid=True), ForeignKey("quizzes.id"), index=True)
 
     question_text = Column(Text, nullable=False)
     question_type = Column(String)  # mcq, open_ended, etc.
@@ -42,4 +52,11 @@ class Answer(Base):
     answer_text = Column(Text, nullable=False)
     is_correct = Column(Boolean, default=None)
     score = Column(Float, default=None)
-    created_at = Column(TIMESTAMP, server_default=func.now())
\ No newline at end of file
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    # Set by the write-behind indexer once the answer is in the vector store.
+    indexed_at = Column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        Index("ix_answers_quiz_id_user_id", "quiz_id", "user_id"),
+        Index("ix_answers_pending_index", "created_at", postgresql_where=text("indexed_at IS NULL")),
+    )
@@ -10,6 +10,9 @@ class User(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(String, unique=True, nullable=False)
     hashed_password = Column(String, nullable=False)
+    # student | teacher | admin. Teachers and admins may generate quizzes
+    # for other users (/quiz/generate/batch); set directly in the database.
+    role = Column(String, nullable=False, server_default="student", default="student")
 
     profile = relationship("Profile", back_populates="user", uselist=False)
 
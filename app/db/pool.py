@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """
+    Connection-pool and query timings for one engine: how long checkouts
+    wait for a connection, how many are in use, and which statements ran
+    longer than `slow_query_seconds` (the most recent are kept for /metrics).
+    """
+
+    def __init__(self, slow_query_seconds: float = 0.2, keep_slow: int = 20):
+        self.slow_query_seconds = slow_query_seconds
+        self.engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.queries = 0
+        self.slow_queries = 0
+        self.query_time_max = 0.0
+        self._recent_slow = deque(maxlen=keep_slow)
+
+    def record_checkout(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.checkout_wait_total += wait
+            self.checkout_wait_max = max(self.checkout_wait_max, wait)
+
+    def record_query(self, statement: str, seconds: float):
+        with self._lock:
+            self.queries += 1
+            self.query_time_max = max(self.query_time_max, seconds)
+            if seconds < self.slow_query_seconds:
+                return
+            self.slow_queries += 1
+            self._recent_slow.append({"ms": round(seconds * 1000, 2), "statement": " ".join(statement.split())[:300]})
+        print(f"slow query ({seconds * 1000:.0f} ms): {statement[:200]}")
+
+    def stats(self) -> dict:
+        pool = self.engine.pool if self.engine is not None else None
+        with self._lock:
+            waits = self.checkouts + self.checkout_timeouts
+            return {
+                "size": pool.size() if pool is not None else None,
+                "in_use": pool.checkedout() if pool is not None else None,
+                "idle": pool.checkedin() if pool is not None else None,
+                "overflow": pool.overflow() if pool is not None else None,
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_avg_ms": round(self.checkout_wait_total / waits * 1000, 2) if waits else 0.0,
+                "checkout_wait_max_ms": round(self.checkout_wait_max * 1000, 2),
+                "queries": self.queries,
+                "query_time_max_ms": round(self.query_time_max * 1000, 2),
+                "slow_queries": self.slow_queries,
+                "recent_slow_queries": list(self._recent_slow),
+            }
+
+
+class _TimedCheckout:
+    # Set by instrument_engine; carried over when the engine disposes and
+    # recreates its pool.
+    metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.metrics is not None:
+            self.metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> PoolMetrics:
+    """Attach `metrics` to a sync engine (for async engines pass `.sync_engine`)."""
+    metrics.engine = engine
+    engine.pool.metrics = metrics
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        metrics.record_query(statement, time.perf_counter() - conn.info["query_started"].pop())
+
+    @event.listens_for(engine, "handle_error")
+    def _drop_timer(context):
+        # A failed statement never reaches after_cursor_execute.
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    return metrics
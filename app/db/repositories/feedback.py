@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.feedback import Feedback
 from uuid import UUID
 from typing import List
@@ -19,8 +20,15 @@ class FeedbackRepository:
 
     def get_by_question(self, answer_id: UUID) -> Feedback | None:
         return self.db.query(Feedback).filter_by(answer_id=answer_id).first()
-    
-    
-        
 
-    
+
+class AsyncFeedbackRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_feedback(self, feedback_data: dict) -> Feedback:
+        feedback = Feedback(**feedback_data)
+        self.db.add(feedback)
+        await self.db.commit()
+        await self.db.refresh(feedback)
+        return feedback
@@ -0,0 +1,129 @@
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.job import Job
+from uuid import UUID
+from typing import List, Optional
+from datetime import timedelta
+
+
+def _claimable(max_attempts: int):
+    # A running job whose lease expired has crashed or hung; it is retried
+    # while it has attempts left, and expire_exhausted fails it otherwise.
+    return or_(
+        and_(Job.status == "queued", Job.available_at <= func.now()),
+        and_(Job.status == "running", Job.locked_until < func.now(), Job.attempts < max_attempts),
+    )
+
+
+class JobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def expire_exhausted(self, max_attempts: int) -> List[tuple]:
+        """Fail jobs whose lease expired on their last attempt; returns (id, kind, webhook_url) rows."""
+        rows = self.db.execute(
+            update(Job)
+            .where(Job.status == "running", Job.locked_until < func.now(), Job.attempts >= max_attempts)
+            .values(
+                status="failed",
+                error="lease expired on the last attempt",
+                locked_by=None,
+                locked_until=None,
+                finished_at=func.now(),
+            )
+            .returning(Job.id, Job.kind, Job.webhook_url)
+        ).all()
+        self.db.commit()
+        return rows
+
+    def claim_next(
+        self, worker_id: str, lease_seconds: float, max_attempts: int, kinds: Optional[List[str]] = None
+    ) -> Optional[Job]:
+        """
+        Atomically take the highest-priority runnable job. SKIP LOCKED lets
+        several workers poll the same table without blocking each other.
+        """
+        query = (
+            select(Job)
+            .where(_claimable(max_attempts))
+            .order_by(Job.priority.desc(), Job.created_at.asc())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if kinds:
+            query = query.where(Job.kind.in_(kinds))
+        job = self.db.execute(query).scalars().first()
+        if job is None:
+            self.db.rollback()
+            return None
+        job.status = "running"
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_until = func.now() + timedelta(seconds=lease_seconds)
+        job.started_at = func.now()
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def renew_lease(self, job_id: UUID, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a running job's lease; False once another worker has taken it over."""
+        updated = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+            .values(locked_until=func.now() + timedelta(seconds=lease_seconds))
+        ).rowcount
+        self.db.commit()
+        return bool(updated)
+
+    def complete(self, job_id: UUID, worker_id: str, result: dict) -> bool:
+        """Record the result unless the lease was lost to another worker; returns whether it was."""
+        updated = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == worker_id)
+            .values(status="succeeded", result=result, error=None, locked_by=None, locked_until=None, finished_at=func.now())
+        ).rowcount
+        self.db.commit()
+        return bool(updated)
+
+    def fail(self, job_id: UUID, worker_id: str, error: str, retry: bool, retry_delay: float = 0) -> bool:
+        values = {"error": error, "locked_by": None, "locked_until": None}
+        if retry:
+            values.update(status="queued", available_at=func.now() + timedelta(seconds=retry_delay))
+        else:
+            values.update(status="failed", finished_at=func.now())
+        updated = self.db.execute(
+            update(Job).where(Job.id == job_id, Job.locked_by == worker_id).values(**values)
+        ).rowcount
+        self.db.commit()
+        return bool(updated)
+
+
+class AsyncJobRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_job(self, job_data: dict) -> Job:
+        job = Job(**job_data)
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def get_job_for_user(self, job_id: UUID, user_id: UUID) -> Job | None:
+        result = await self.db.execute(select(Job).where(Job.id == job_id, Job.user_id == user_id))
+        return result.scalars().first()
+
+    async def queue_depth(self, max_attempts: int) -> List[tuple]:
+        result = await self.db.execute(
+            select(Job.kind, Job.priority, func.count())
+            .where(_claimable(max_attempts))
+            .group_by(Job.kind, Job.priority)
+        )
+        return result.all()
+
+    async def count_running(self) -> int:
+        result = await self.db.execute(
+            select(func.count()).where(Job.status == "running", Job.locked_until >= func.now())
+        )
+        return result.scalar_one()
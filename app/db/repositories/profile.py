@@ -1,6 +1,11 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.profile import Profile
+from app.db.models.user import User
 from uuid import UUID
+from typing import List, Set
 
 class ProfileRepository:
     def __init__(self, db: Session):
@@ -20,3 +25,45 @@ class ProfileRepository:
         self.db.commit()
         self.db.refresh(profile)
         return profile
+
+    def upsert_many(self, profiles: List[dict]) -> None:
+        """Insert or update profiles by user_id in one statement. The caller commits."""
+        self.db.execute(_upsert_statement(profiles))
+
+
+class AsyncProfileRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_user_id(self, user_id: UUID) -> Profile | None:
+        result = await self.db.execute(select(Profile).where(Profile.user_id == user_id))
+        return result.scalars().first()
+
+    async def create_or_update(self, profile_data: dict) -> Profile:
+        profile = await self.get_by_user_id(profile_data["user_id"])
+        if profile:
+            for key, value in profile_data.items():
+                setattr(profile, key, value)
+        else:
+            profile = Profile(**profile_data)
+            self.db.add(profile)
+        await self.db.commit()
+        await self.db.refresh(profile)
+        return profile
+
+    async def existing_user_ids(self, user_ids: List[UUID]) -> Set[UUID]:
+        result = await self.db.execute(select(User.id).where(User.id.in_(user_ids)))
+        return set(result.scalars().all())
+
+    async def upsert_many(self, profiles: List[dict]) -> None:
+        """Insert or update profiles by user_id in one statement. The caller commits."""
+        await self.db.execute(_upsert_statement(profiles))
+
+
+def _upsert_statement(profiles: List[dict]):
+    stmt = insert(Profile).values(profiles)
+    columns = {key for profile in profiles for key in profile if key != "user_id"}
+    return stmt.on_conflict_do_update(
+        index_elements=[Profile.user_id],
+        set_={column: stmt.excluded[column] for column in columns},
+    )
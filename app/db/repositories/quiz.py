@@ -1,7 +1,52 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, insert, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.quiz import Quiz, Question, Answer
+from app.db.models.feedback import Feedback
 from uuid import UUID
-from typing import List
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
+import uuid
+
+
+_ANSWER_RETURNING = (Answer.id, Answer.user_id, Answer.quiz_id, Answer.question_id, Answer.answer_text, Answer.created_at)
+
+
+def _answer_rows(user_id: UUID, quiz_id: UUID, responses: List[dict]) -> List[dict]:
+    return [
+        {"id": uuid.uuid4(), "user_id": user_id, "quiz_id": quiz_id, "is_correct": None, "score": None, **resp}
+        for resp in responses
+    ]
+
+
+def _answer_insert_with_types(user_id: UUID, quiz_id: UUID, responses: List[dict]):
+    """
+    WITH inserted AS (INSERT INTO answers ... RETURNING ...)
+    SELECT inserted.*, questions.question_type, quizzes.user_id AS owner_id
+    FROM inserted LEFT JOIN questions ... LEFT JOIN quizzes ...
+
+    Inserts the answers and reads back each one's question type and the
+    quiz owner in the same round trip, so the caller can validate the
+    submission and roll back before committing.
+    """
+    inserted = (
+        insert(Answer)
+        .values(_answer_rows(user_id, quiz_id, responses))
+        .returning(*_ANSWER_RETURNING)
+        .cte("inserted")
+    )
+    return (
+        select(inserted, Question.question_type, Quiz.user_id.label("owner_id"))
+        .select_from(inserted)
+        .outerjoin(Question, Question.id == inserted.c.question_id)
+        .outerjoin(Quiz, (Quiz.id == Question.quiz_id) & (Quiz.id == inserted.c.quiz_id))
+    )
+
+
+def _submission_matches(rows: list, user_id: UUID) -> bool:
+    return all(row.question_type is not None and row.owner_id == user_id for row in rows)
+
 
 class QuizRepository:
     def __init__(self, db: Session):
@@ -15,6 +60,16 @@ class QuizRepository:
         return quiz
     
 
+    def bulk_create(self, quizzes: List[dict], questions: List[dict]) -> None:
+        """
+        Insert many quizzes and their questions and commit once. Rows carry
+        client-generated ids, so nothing has to be read back.
+        """
+        self.db.execute(insert(Quiz), quizzes)
+        if questions:
+            self.db.execute(insert(Question), questions)
+        self.db.commit()
+
     def get_last_quiz_for_user(self, user_id: UUID):
         """Fetch the most recent quiz for a user"""
         return (
@@ -59,7 +114,200 @@ class QuizRepository:
         self.db.commit()
         return answers
 
+    def insert_answers(self, user_id: UUID, quiz_id: UUID, responses: List[dict]) -> list:
+        """Multi-row insert for a submission the caller has already validated."""
+        rows = self.db.execute(insert(Answer).returning(*_ANSWER_RETURNING), _answer_rows(user_id, quiz_id, responses)).all()
+        self.db.commit()
+        return rows
+
+    def insert_answers_checked(self, user_id: UUID, quiz_id: UUID, responses: List[dict]) -> Optional[list]:
+        """
+        Validate and insert in one round trip, returning each answer with
+        its question_type. Returns None (and writes nothing) if any answer
+        doesn't belong to the user's quiz.
+        """
+        try:
+            rows = self.db.execute(_answer_insert_with_types(user_id, quiz_id, responses)).all()
+        except IntegrityError:
+            # Unknown question or quiz id.
+            self.db.rollback()
+            return None
+        if not _submission_matches(rows, user_id):
+            self.db.rollback()
+            return None
+        self.db.commit()
+        return rows
+
     def get_answers_by_quiz(self, user_id: UUID, quiz_id: UUID) -> List[Answer]:
         return self.db.query(Answer).filter_by(user_id=user_id, quiz_id=quiz_id).all()
-    
-    
+
+    def get_unindexed_open_ended_answers(self, answer_ids: List[UUID]) -> List[Answer]:
+        return (
+            self.db.query(Answer)
+            .join(Question, Question.id == Answer.question_id)
+            .filter(
+                Answer.id.in_(answer_ids),
+                Answer.indexed_at.is_(None),
+                Question.question_type == "open_ended",
+            )
+            .all()
+        )
+
+    def get_pending_index_ids(self, min_age_seconds: float, limit: int) -> List[UUID]:
+        """Open-ended answers the write-behind indexer hasn't picked up (e.g. after a restart)."""
+        rows = (
+            self.db.query(Answer.id)
+            .join(Question, Question.id == Answer.question_id)
+            .filter(
+                Answer.indexed_at.is_(None),
+                Answer.created_at < func.now() - timedelta(seconds=min_age_seconds),
+                Question.question_type == "open_ended",
+            )
+            .order_by(Answer.created_at.asc())
+            .limit(limit)
+            .all()
+        )
+        return [row.id for row in rows]
+
+    def mark_answers_indexed(self, answer_ids: List[UUID]) -> None:
+        self.db.query(Answer).filter(Answer.id.in_(answer_ids)).update(
+            {Answer.indexed_at: func.now()}, synchronize_session=False
+        )
+        self.db.commit()
+
+
+class AsyncQuizRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_quiz(self, quiz_data: dict) -> Quiz:
+        quiz = Quiz(**quiz_data)
+        self.db.add(quiz)
+        await self.db.commit()
+        await self.db.refresh(quiz)
+        return quiz
+
+    async def get_last_quiz_for_user(self, user_id: UUID):
+        """Fetch the most recent quiz for a user"""
+        result = await self.db.execute(
+            select(Quiz)
+            .where(Quiz.user_id == user_id)
+            .order_by(Quiz.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    async def get_quiz_by_id(self, quiz_id: UUID):
+        """Fetch quiz by quiz_id"""
+        result = await self.db.execute(select(Quiz).where(Quiz.id == quiz_id))
+        return result.scalars().first()
+
+    async def add_questions(self, quiz_id: UUID, questions: List[dict]) -> List[Question]:
+        question_objs = [Question(quiz_id=quiz_id, **q) for q in questions]
+        self.db.add_all(question_objs)
+        await self.db.commit()
+        return question_objs
+
+    async def bulk_create(self, quizzes: List[dict], questions: List[dict]) -> None:
+        """
+        Insert many quizzes and their questions and commit once. Rows carry
+        client-generated ids, so nothing has to be read back.
+        """
+        await self.db.execute(insert(Quiz), quizzes)
+        if questions:
+            await self.db.execute(insert(Question), questions)
+        await self.db.commit()
+
+    async def finalize_quiz(self, quiz_id: UUID, total_questions: int, tags: List[str]) -> None:
+        await self.db.execute(
+            update(Quiz)
+            .where(Quiz.id == quiz_id)
+            .values(total_questions=total_questions, tags=tags)
+        )
+        await self.db.commit()
+
+    async def get_questions_by_ids(self, question_ids: List[UUID]) -> List[Question]:
+        result = await self.db.execute(select(Question).where(Question.id.in_(question_ids)))
+        return list(result.scalars().all())
+
+    async def insert_answers(self, user_id: UUID, quiz_id: UUID, responses: List[dict]) -> list:
+        result = await self.db.execute(insert(Answer).returning(*_ANSWER_RETURNING), _answer_rows(user_id, quiz_id, responses))
+        rows = result.all()
+        await self.db.commit()
+        return rows
+
+    async def insert_answers_checked(self, user_id: UUID, quiz_id: UUID, responses: List[dict]) -> Optional[list]:
+        try:
+            rows = (await self.db.execute(_answer_insert_with_types(user_id, quiz_id, responses))).all()
+        except IntegrityError:
+            await self.db.rollback()
+            return None
+        if not _submission_matches(rows, user_id):
+            await self.db.rollback()
+            return None
+        await self.db.commit()
+        return rows
+
+    async def save_answers(self, user_id: UUID, quiz_id: UUID, responses: List[dict]) -> List[Answer]:
+        answers = [
+            Answer(user_id=user_id, quiz_id=quiz_id, **resp)
+            for resp in responses
+        ]
+        self.db.add_all(answers)
+        await self.db.commit()
+        return answers
+
+    async def history_page_versions(
+        self, user_id: UUID, limit: int, before: Optional[Tuple[datetime, UUID]] = None
+    ) -> list:
+        """
+        One row per quiz of a history page, newest first, keyset-paginated on
+        (created_at, id) and fetching limit + 1 rows so the caller can tell
+        whether there is a next page. Each row carries the counts and latest
+        timestamps of its questions, answers and feedback: everything a page
+        response depends on, for computing its ETag without loading it.
+        """
+        answer_filter = (Answer.quiz_id == Quiz.id) & (Answer.user_id == user_id)
+        query = select(
+            Quiz.id,
+            Quiz.created_at,
+            Quiz.total_questions,
+            _per_quiz(func.count(), Question.quiz_id == Quiz.id).label("questions"),
+            _per_quiz(func.count(), answer_filter).label("answers"),
+            _per_quiz(func.max(Answer.created_at), answer_filter).label("last_answer_at"),
+            _per_quiz(func.count(), Feedback.quiz_id == Quiz.id).label("feedbacks"),
+            _per_quiz(func.max(Feedback.created_at), Feedback.quiz_id == Quiz.id).label("last_feedback_at"),
+        )
+        query = _history_page(query, user_id, limit, before)
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_quizzes_with_history(self, user_id: UUID, quiz_ids: List[UUID]) -> List[Quiz]:
+        """Quizzes with their questions, the user's answers and feedback, in four queries."""
+        result = await self.db.execute(
+            select(Quiz)
+            .where(Quiz.id.in_(quiz_ids))
+            .options(
+                selectinload(Quiz.questions),
+                selectinload(Quiz.answers.and_(Answer.user_id == user_id)),
+                selectinload(Quiz.feedbacks),
+            )
+        )
+        return list(result.scalars().all())
+
+
+def _per_quiz(aggregate, condition):
+    return select(aggregate).where(condition).scalar_subquery()
+
+
+def _history_page(query, user_id: UUID, limit: int, before: Optional[Tuple[datetime, UUID]]):
+    query = query.where(Quiz.user_id == user_id)
+    if before is not None:
+        created_at, quiz_id = before
+        # The redundant <= bound lets the (user_id, created_at DESC) index
+        # range-scan instead of filtering the row comparison.
+        query = query.where(
+            Quiz.created_at <= created_at,
+            or_(Quiz.created_at < created_at, Quiz.id < quiz_id),
+        )
+    return query.order_by(Quiz.created_at.desc(), Quiz.id.desc()).limit(limit + 1)
@@ -1,3 +1,4 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from typing import Optional
 from uuid import UUID
@@ -22,3 +23,11 @@ class UserRepository:
         except Exception as e:
             self.db.rollback()
             raise RuntimeError(f"Error creating user: {e}") from e
+
+    def rehash_password(self, user: User, hashed_password: str) -> None:
+        """
+        Store a new hash of the *same* password. Written as a bulk UPDATE so
+        the User after_update listener doesn't treat it as a credential change.
+        """
+        self.db.execute(update(User).where(User.id == user.id).values(hashed_password=hashed_password))
+        self.db.commit()
@@ -1,15 +1,84 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, PoolMetrics, instrument_engine
 
 
-engine = create_engine(settings.DATABASE_URL)
+def _async_database_url(url: str) -> str:
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _statement_timeout_args(is_async: bool) -> dict:
+    if not settings.DB_STATEMENT_TIMEOUT_MS:
+        return {}
+    timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if is_async:
+        return {"server_settings": {"statement_timeout": timeout}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    connect_args=_statement_timeout_args(is_async=False),
+    **_pool_options(),
+)
+
+# expire_on_commit=False: objects loaded before a commit stay readable
+# afterwards without a refresh query re-acquiring a connection.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    connect_args=_statement_timeout_args(is_async=True),
+    **_pool_options(),
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+db_pool_metrics = {
+    "sync": instrument_engine(engine, PoolMetrics(settings.DB_SLOW_QUERY_MS / 1000)),
+    "async": instrument_engine(async_engine.sync_engine, PoolMetrics(settings.DB_SLOW_QUERY_MS / 1000)),
+}
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
+    """
+    Request-scoped session. It only holds a pooled connection while a
+    transaction is open: from its first query until the next commit or
+    rollback. Services call `release_connection` before slow non-database
+    work (LLM calls) so the connection isn't pinned for the generation.
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def release_connection(db: Session) -> None:
+    """End the session's transaction and hand its connection back to the pool."""
+    db.commit()
+
+
+async def arelease_connection(db: AsyncSession) -> None:
+    await db.commit()
@@ -0,0 +1,50 @@
+import ipaddress
+import socket
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from app.core.config import settings
+
+
+def _allowed_hosts() -> set:
+    return {host.strip().lower() for host in settings.JOB_WEBHOOK_ALLOWED_HOSTS.split(",") if host.strip()}
+
+
+def check_webhook_url(url: str) -> None:
+    """
+    Reject webhook targets the server shouldn't be made to call: anything
+    but https, hosts outside JOB_WEBHOOK_ALLOWED_HOSTS (when set), and hosts
+    resolving to private, loopback, link-local or otherwise non-public
+    addresses. Raises ValueError.
+    """
+    parts = urlsplit(url)
+    if parts.scheme != "https" or not parts.hostname:
+        raise ValueError("webhook_url must be an https URL")
+    host = parts.hostname.lower()
+    allowed = _allowed_hosts()
+    if allowed and host not in allowed:
+        raise ValueError(f"webhook host {host} is not allowed")
+    try:
+        infos = socket.getaddrinfo(host, parts.port or 443, proto=socket.IPPROTO_TCP)
+    except socket.gaierror:
+        raise ValueError(f"webhook host {host} does not resolve")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise ValueError(f"webhook host {host} resolves to a non-public address")
+
+
+def notify(webhook_url: Optional[str], body: dict):
+    if not webhook_url:
+        return
+    try:
+        # Checked again at send time: DNS may have changed since enqueue.
+        check_webhook_url(webhook_url)
+        # Redirects could point anywhere, so they aren't followed.
+        requests.post(webhook_url, json=body, timeout=5, allow_redirects=False)
+    except (ValueError, requests.RequestException) as e:
+        print(f"job webhook to {webhook_url} failed: {e}")
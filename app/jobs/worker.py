@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import socket
+import threading
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.db.session import SessionLocal, release_connection
+from app.db.repositories.job import JobRepository
+from app.db.repositories.profile import ProfileRepository
+from app.db.repositories.quiz import QuizRepository
+from app.db.repositories.feedback import FeedbackRepository
+from app.LLMs.client import LLMClient, get_router
+from app.vectorDB.embeddings import EmbeddingGenerator
+from app.vectorDB.vector_store import create_vector_store
+from app.api.quiz.services import QuizService
+from app.api.feedback.services import FeedbackService
+from app.jobs.webhooks import notify
+
+
+def _run_quiz(db, user_id: UUID, payload: dict) -> dict:
+    service = QuizService(
+        ProfileRepository(db),
+        QuizRepository(db),
+        LLMClient(priority=settings.LLM_PRIORITY_BACKGROUND),
+        create_vector_store(),
+        EmbeddingGenerator(),
+    )
+    return service.generate_quiz_for_user(user_id=user_id, profile_data=payload["profile_data"], fresh=payload.get("fresh", False))
+
+
+def _run_feedback(db, user_id: UUID, payload: dict) -> dict:
+    # Imported lazily: depedencies pulls in the FastAPI security scheme.
+    from app.core.depedencies import get_semantic_feedback_cache
+
+    service = FeedbackService(
+        FeedbackRepository(db),
+        QuizRepository(db),
+        ProfileRepository(db),
+        create_vector_store(),
+        EmbeddingGenerator(),
+        LLMClient(priority=settings.LLM_PRIORITY_BACKGROUND),
+        get_semantic_feedback_cache(),
+    )
+    quiz_id = payload.get("quiz_id")
+    return service.generate_feedback(
+        user_id=user_id,
+        quiz_id=UUID(quiz_id) if quiz_id else None,
+        topic=payload.get("topic"),
+    )
+
+
+HANDLERS = {
+    "quiz": _run_quiz,
+    "feedback": _run_feedback,
+}
+
+
+def _keep_lease(job_id: UUID, worker_id: str, done: threading.Event):
+    # An LLM call plus retries and limiter waits can outlast one lease;
+    # renew it at a third of its length so the job isn't reclaimed mid-run.
+    while not done.wait(settings.JOB_LEASE_SECONDS / 3):
+        try:
+            with SessionLocal() as db:
+                if not JobRepository(db).renew_lease(job_id, worker_id, settings.JOB_LEASE_SECONDS):
+                    print(f"job {job_id} lease was lost while running")
+                    return
+        except Exception as e:
+            print(f"job {job_id} lease renewal failed: {e}")
+
+
+def _run_handler(kind: str, db, user_id: UUID, payload: dict, job_id: UUID, worker_id: str):
+    done = threading.Event()
+    threading.Thread(target=_keep_lease, args=(job_id, worker_id, done), name=f"job-lease-{job_id}", daemon=True).start()
+    try:
+        return jsonable_encoder(HANDLERS[kind](db, user_id, payload))
+    finally:
+        done.set()
+
+
+def run_one(worker_id: str, kinds: Optional[List[str]] = None) -> bool:
+    """Claim and execute a single job. Returns False when the queue was empty."""
+    with SessionLocal() as db:
+        repo = JobRepository(db)
+        for job_id, kind, webhook_url in repo.expire_exhausted(settings.JOB_MAX_ATTEMPTS):
+            notify(webhook_url, {"job_id": str(job_id), "kind": kind, "status": "failed", "error": "lease expired on the last attempt"})
+        job = repo.claim_next(worker_id, settings.JOB_LEASE_SECONDS, settings.JOB_MAX_ATTEMPTS, kinds)
+        if job is None:
+            return False
+
+        job_id, kind, user_id = job.id, job.kind, job.user_id
+        payload, attempts, webhook_url = job.payload, job.attempts, job.webhook_url
+        # The handler may spend minutes in the LLM before touching the
+        # database; don't hold the claim's connection through it.
+        release_connection(db)
+
+        try:
+            result = _run_handler(kind, db, user_id, payload, job_id, worker_id)
+        except Exception as e:
+            db.rollback()
+            # ValueError is how the services report bad input; retrying won't help.
+            retry = attempts < settings.JOB_MAX_ATTEMPTS and not isinstance(e, ValueError)
+            retry_delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+            if not repo.fail(job_id, worker_id, str(e), retry=retry, retry_delay=retry_delay):
+                print(f"job {job_id} lease was lost before it failed; leaving it to its new owner")
+            elif not retry:
+                notify(webhook_url, {"job_id": str(job_id), "kind": kind, "status": "failed", "error": str(e)})
+            return True
+
+        if not repo.complete(job_id, worker_id, result):
+            print(f"job {job_id} lease was lost before it finished; discarding the result")
+            return True
+    notify(webhook_url, {"job_id": str(job_id), "kind": kind, "status": "succeeded", "result": result})
+    return True
+
+
+def run_worker(index: int, stop_event, poll_interval: float):
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+    get_router().start()
+    while not stop_event.is_set():
+        try:
+            if run_one(worker_id):
+                continue
+        except Exception as e:
+            print(f"job worker {worker_id} error: {e}")
+        stop_event.wait(poll_interval)
+
+
+class JobWorkerPool:
+    """
+    Local worker processes polling the jobs table. Each process runs one job
+    at a time, so the number of workers is also the cap on concurrent LLM
+    calls made on behalf of background jobs. Several pools (one per API
+    process, or standalone via `python -m app.jobs.worker`) can share the
+    table safely since claims use SKIP LOCKED.
+    """
+
+    def __init__(self, workers: int, poll_interval: float = 1.0):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._ctx = multiprocessing.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._processes = []
+
+    def start(self):
+        if self._processes:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            process = self._ctx.Process(
+                target=run_worker,
+                args=(i, self._stop, self.poll_interval),
+                name=f"job-worker-{i}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "alive": sum(1 for p in self._processes if p.is_alive()),
+        }
+
+
+job_workers = JobWorkerPool(settings.JOB_WORKERS, settings.JOB_POLL_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    job_workers.start()
+    try:
+        for process in list(job_workers._processes):
+            process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        job_workers.stop()
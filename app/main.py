@@ -1,17 +1,60 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import RedirectResponse
+from starlette.responses import JSONResponse, RedirectResponse
 
 from app.api.auth.routes import router as authrouter
 from app.api.quiz.routes import router as quizrouter
 from app.api.feedback.routes import router as feedbackrouter
+from app.api.jobs.routes import router as jobsrouter
+from app.api.history.routes import router as historyrouter
+from app.api.quiz.services import quiz_pool
+from app.api.quiz.manifest import question_manifests
+from app.core.principal import principals, verified_tokens
+from app.core.password_hasher import password_hasher
+from app.api.feedback.semantic_cache import semantic_cache_stats
 from app.core.config import settings  
 from app.db.base import Base
-from app.db.session import engine
+from app.db.session import engine, async_engine, db_pool_metrics
+from app.LLMs.client import close_session, close_async_client, close_router, get_router, response_cache, limiter
+from app.LLMs.limiter import LLMOverloadedError
+from app.vectorDB import embeddings
+from app.vectorDB.hybrid import lexical_index
+from app.vectorDB.indexer import answer_indexer
+from app.jobs.worker import job_workers
+from app.vectorDB.vector_store import create_vector_store, close_vector_stores
 
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.EMBEDDING_WARMUP:
+        embeddings.warm_up()
+    create_vector_store()
+    get_router().start()
+    if settings.WRITE_BEHIND_INDEXING:
+        answer_indexer.start()
+    if settings.QUIZ_POOL_ENABLED:
+        quiz_pool.start()
+    if settings.JOB_WORKERS_IN_APP:
+        job_workers.start()
+    yield
+    job_workers.stop()
+    password_hasher.shutdown()
+    quiz_pool.stop()
+    answer_indexer.stop()
+    embeddings.unload_models()
+    close_vector_stores()
+    close_router()
+    close_session()
+    await close_async_client()
+    await async_engine.dispose()
+    engine.dispose()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     description="Personalized Quiz Generator using RAG-based AI",
     docs_url="/docs",
     redoc_url="/redoc",
@@ -26,6 +69,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(LLMOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LLMOverloadedError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.get("/", include_in_schema=False)
 def root():
     return RedirectResponse(url="/docs")
@@ -34,6 +85,29 @@ def root():
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", tags=["Health"])
+def metrics():
+    return {
+        "auth": {
+            "tokens": verified_tokens.stats(),
+            "principals": principals.stats(),
+            "password_hashing": password_hasher.stats(),
+        },
+        "db": {name: pool.stats() for name, pool in db_pool_metrics.items()},
+        "embeddings": embeddings.stats(),
+        "lexical_index": lexical_index.stats(),
+        "answer_indexing": answer_indexer.stats(),
+        "llm_cache": response_cache.stats() if response_cache is not None else None,
+        "llm_limiter": limiter.stats() if limiter is not None else None,
+        "llm_router": get_router().stats(),
+        "feedback_semantic_cache": semantic_cache_stats.stats(),
+        "quiz_pool": quiz_pool.stats() if settings.QUIZ_POOL_ENABLED else None,
+        "question_manifests": question_manifests.stats(),
+        "job_workers": job_workers.stats(),
+    }
+
 app.include_router(authrouter)
 app.include_router(quizrouter)
 app.include_router(feedbackrouter)
+app.include_router(jobsrouter)
+app.include_router(historyrouter)
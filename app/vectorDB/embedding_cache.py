@@ -0,0 +1,209 @@
+import fcntl
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def normalize_text(text: str, lowercase: bool = False) -> str:
+    text = " ".join(text.split())
+    return text.lower() if lowercase else text
+
+
+def cache_key(model_name: str, text: str, lowercase: bool = False) -> str:
+    """
+    Pass `lowercase=True` only for models whose tokenizer folds case itself;
+    for cased models "Paris" and "paris" embed differently.
+    """
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text, lowercase)}".encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """
+    Append-only on-disk tier: a raw float32 matrix read through np.memmap
+    plus a sidecar file listing one key per row. Both survive restarts.
+
+    Several processes (API workers, the indexer) may share a directory.
+    Writers take an exclusive flock on a lock file, append vectors before
+    keys, and first pick up rows other processes appended. The keys file is
+    the commit record: rows past the last complete key are a torn write and
+    get truncated.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.dim = dim
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, f"vectors_{dim}.f32")
+        self.keys_path = os.path.join(directory, f"keys_{dim}.txt")
+        self.lock_path = os.path.join(directory, f"store_{dim}.lock")
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._row_count = 0
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            self._sync()
+            self._repair()
+
+    @contextmanager
+    def _file_lock(self, mode: int):
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _repair(self):
+        """
+        Drop what a crashed writer left past the last committed key: a torn
+        key line and vector rows without a key. Call after `_sync` with the
+        exclusive lock held.
+        """
+        if os.path.exists(self.keys_path) and os.path.getsize(self.keys_path) > self._keys_offset:
+            with open(self.keys_path, "rb+") as f:
+                f.truncate(self._keys_offset)
+        committed = self._row_count * 4 * self.dim
+        if os.path.exists(self.vectors_path) and os.path.getsize(self.vectors_path) > committed:
+            with open(self.vectors_path, "rb+") as f:
+                f.truncate(committed)
+
+    def _sync(self):
+        """Read keys appended since the last sync (by this or another process). Needs the file lock."""
+        if not os.path.exists(self.keys_path) or os.path.getsize(self.keys_path) == self._keys_offset:
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            data = f.read()
+        data = data[:data.rfind(b"\n") + 1]
+        self._keys_offset += len(data)
+        for key in data.decode("utf-8").splitlines():
+            self._rows.setdefault(key, self._row_count)
+            self._row_count += 1
+        self._remap()
+
+    def _remap(self):
+        # Never map past the end of the file, even if keys outran vectors.
+        rows = min(self._row_count, os.path.getsize(self.vectors_path) // (4 * self.dim)) if os.path.exists(self.vectors_path) else 0
+        if rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        row = self._rows.get(key)
+        if row is None:
+            if not os.path.exists(self.keys_path) or os.path.getsize(self.keys_path) == self._keys_offset:
+                return None
+            # Another process appended since we last looked.
+            with self._lock, self._file_lock(fcntl.LOCK_SH):
+                self._sync()
+            row = self._rows.get(key)
+            if row is None:
+                return None
+        matrix = self._matrix
+        if matrix is None or row >= matrix.shape[0]:
+            return None
+        return matrix[row].tolist()
+
+    def put_many(self, items: Dict[str, List[float]]):
+        with self._lock, self._file_lock(fcntl.LOCK_EX):
+            self._sync()
+            self._repair()
+            new = [(k, v) for k, v in items.items() if k not in self._rows]
+            if not new:
+                return
+            block = np.asarray([v for _, v in new], dtype=np.float32)
+            with open(self.vectors_path, "ab") as f:
+                f.write(block.tobytes())
+            with open(self.keys_path, "ab") as f:
+                f.write("".join(f"{k}\n" for k, _ in new).encode("utf-8"))
+            self._sync()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings keyed by sha256(model name + normalized text).
+    A bounded in-memory LRU sits in front of an optional memory-mapped disk tier.
+    """
+
+    def __init__(self, max_entries: int = 10000, disk_directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.disk_directory = disk_directory
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._disk: Optional[DiskEmbeddingStore] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vector
+                    self.hits += 1
+
+        if self._disk is not None:
+            promoted = {}
+            for key in keys:
+                if key in found or key in promoted:
+                    continue
+                vector = self._disk.get(key)
+                if vector is not None:
+                    promoted[key] = vector
+            if promoted:
+                self._put_memory(promoted)
+                found.update(promoted)
+                with self._lock:
+                    self.disk_hits += len(promoted)
+
+        with self._lock:
+            self.misses += len(set(keys) - found.keys())
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]):
+        if not items:
+            return
+        self._put_memory(items)
+        if self.disk_directory:
+            self.open_disk(len(next(iter(items.values()))))
+            self._disk.put_many(items)
+
+    def open_disk(self, dim: int):
+        """
+        Attach the disk tier so vectors from previous runs are served before
+        the first write. Idempotent: concurrent first callers share one store.
+        """
+        if not self.disk_directory or self._disk is not None:
+            return
+        with self._lock:
+            if self._disk is None:
+                self._disk = DiskEmbeddingStore(self.disk_directory, dim)
+
+    def _put_memory(self, items: Dict[str, List[float]]):
+        with self._lock:
+            for key, vector in items.items():
+                self._lru[key] = vector
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._lru),
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0,
+        }
@@ -1,9 +1,121 @@
 from sentence_transformers import SentenceTransformer
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+import asyncio
+import threading
+from app.core.config import settings
+from app.vectorDB.batcher import EmbeddingBatcher
+from app.vectorDB.embedding_cache import EmbeddingCache, cache_key
+
+
+_models: Dict[str, SentenceTransformer] = {}
+_batchers: Dict[str, EmbeddingBatcher] = {}
+_models_lock = threading.Lock()
+
+# Bounded pool that keeps CPU-bound encoding off the event loop.
+_executor = ThreadPoolExecutor(max_workers=settings.EMBEDDING_EXECUTOR_WORKERS, thread_name_prefix="embedding")
+
+embedding_cache = (
+    EmbeddingCache(
+        max_entries=settings.EMBEDDING_CACHE_SIZE,
+        disk_directory=settings.EMBEDDING_CACHE_DIR or None,
+    )
+    if settings.EMBEDDING_CACHE_ENABLED
+    else None
+)
+
+
+def get_model(model_name: str = settings.EMBEDDING_MODEL) -> SentenceTransformer:
+    """
+    Return the process-wide SentenceTransformer for `model_name`,
+    loading it on first use. Inference on a loaded model is thread-safe,
+    so every request shares the same instance.
+    """
+    model = _models.get(model_name)
+    if model is None:
+        with _models_lock:
+            model = _models.get(model_name)
+            if model is None:
+                model = SentenceTransformer(model_name)
+                _models[model_name] = model
+    return model
+
+
+def _encode(model_name: str, texts: List[str]) -> List[List[float]]:
+    return get_model(model_name).encode(texts, show_progress_bar=False).tolist()
+
+
+def get_batcher(model_name: str = settings.EMBEDDING_MODEL) -> EmbeddingBatcher:
+    """Return the process-wide micro-batcher that feeds `model_name`."""
+    batcher = _batchers.get(model_name)
+    if batcher is None:
+        with _models_lock:
+            batcher = _batchers.get(model_name)
+            if batcher is None:
+                batcher = EmbeddingBatcher(
+                    encode=lambda texts: _encode(model_name, texts),
+                    max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+                    max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+                )
+                _batchers[model_name] = batcher
+    return batcher
+
+
+def stats() -> dict:
+    return {
+        "batchers": {name: batcher.stats() for name, batcher in _batchers.items()},
+        "cache": embedding_cache.stats() if embedding_cache is not None else None,
+    }
+
+
+def warm_up(model_name: str = settings.EMBEDDING_MODEL) -> None:
+    """Load the model and run one encode so the first request doesn't pay for it."""
+    get_model(model_name).encode(["warm up"], show_progress_bar=False)
+
+
+def unload_models() -> None:
+    with _models_lock:
+        for batcher in _batchers.values():
+            batcher.stop()
+        _batchers.clear()
+        _models.clear()
+
+
+def _folds_case(model: SentenceTransformer) -> bool:
+    # Uncased tokenizers (the MiniLM default) lowercase their input, so
+    # texts differing only in case embed identically and can share a key.
+    return bool(getattr(getattr(model, "tokenizer", None), "do_lower_case", False))
+
 
 class EmbeddingGenerator:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
-        self.model = SentenceTransformer(model_name)
+    def __init__(self, model_name: str = settings.EMBEDDING_MODEL):
+        self.model_name = model_name
+        self.model = get_model(model_name)
+        self.lowercase = _folds_case(self.model)
+        if embedding_cache is not None:
+            embedding_cache.open_disk(self.model.get_sentence_embedding_dimension())
 
     def embed(self, texts: List[str]) -> List[List[float]]:
-        return self.model.encode(texts, show_progress_bar=False).tolist()
\ No newline at end of file
+        if embedding_cache is None:
+            return self._encode(texts)
+
+        keys = [cache_key(self.model_name, text, self.lowercase) for text in texts]
+        found = embedding_cache.get_many(keys)
+
+        # All misses in this call go to the model as one batch, duplicates encoded once.
+        missing = {key: text for key, text in zip(keys, texts) if key not in found}
+        if missing:
+            vectors = self._encode(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            embedding_cache.put_many(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.get_running_loop().run_in_executor(_executor, self.embed, texts)
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        if settings.EMBEDDING_BATCHING:
+            return get_batcher(self.model_name).embed(texts)
+        return _encode(self.model_name, texts)
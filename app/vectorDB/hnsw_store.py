@@ -0,0 +1,355 @@
+import fcntl
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.vectorDB.vector_store import VectorStore
+
+try:
+    import hnswlib
+except ImportError:  # optional dependency: pip install ai-quiz-backend[hnsw]
+    hnswlib = None
+
+
+# Filters matching at most this many rows are answered by an exact scan
+# over the memory-mapped vectors instead of a filtered graph walk.
+_BRUTE_FORCE_LIMIT = 5000
+_INITIAL_CAPACITY = 1024
+
+
+class _HNSWCollection:
+    """
+    One collection on disk:
+    - vectors.f32: float32 matrix (row = label) read through np.memmap
+    - index.bin: hnswlib graph snapshot
+    - meta.sqlite: compact side table mapping labels to ids, filterable
+      user_id/quiz_id columns, document text and JSON metadata
+
+    The graph and the label counter live in this process, so a collection
+    directory belongs to one process at a time: opening it holds an
+    exclusive lock on owner.lock, and a second process (another uvicorn
+    worker, or a standalone job worker) fails to start instead of
+    allocating colliding labels and overwriting index.bin snapshots.
+    """
+
+    def __init__(self, directory: str, space: str = "l2"):
+        if hnswlib is None:
+            raise RuntimeError("VECTOR_BACKEND=hnsw requires the 'hnswlib' package")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._owner = open(os.path.join(directory, "owner.lock"), "a")
+        try:
+            fcntl.flock(self._owner, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._owner.close()
+            raise RuntimeError(
+                f"hnsw collection {directory} is open in another process; VECTOR_BACKEND=hnsw "
+                "is single-process (run one worker with JOB_WORKERS_IN_APP, or use chroma)"
+            )
+        self.space = space
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.bin")
+        self.lock = threading.RLock()
+        self.dirty = False
+
+        self.db = sqlite3.connect(os.path.join(directory, "meta.sqlite"), check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS docs (
+                label INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                user_id TEXT,
+                quiz_id TEXT,
+                document TEXT,
+                metadata TEXT,
+                deleted INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS ix_docs_user_id ON docs (user_id);
+            CREATE INDEX IF NOT EXISTS ix_docs_quiz_id ON docs (quiz_id);
+            CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT);
+            -- Labels written since the last index.bin snapshot.
+            CREATE TABLE IF NOT EXISTS unsnapshotted (label INTEGER PRIMARY KEY);
+        """)
+
+        self.dim: Optional[int] = None
+        self.capacity = 0
+        self.next_label = 0
+        self.live = 0
+        self.index = None
+        self.vectors: Optional[np.memmap] = None
+
+        row = self.db.execute("SELECT value FROM info WHERE key = 'dim'").fetchone()
+        if row:
+            self._open(int(row[0]))
+
+    def _open(self, dim: int):
+        self.dim = dim
+        self.next_label = self.db.execute("SELECT COALESCE(MAX(label) + 1, 0) FROM docs").fetchone()[0]
+        self.live = self.db.execute("SELECT COUNT(*) FROM docs WHERE deleted = 0").fetchone()[0]
+        self.capacity = max(_INITIAL_CAPACITY, self.next_label)
+        self._map_vectors(self.capacity)
+
+        self.index = hnswlib.Index(space=self.space, dim=dim)
+        if os.path.exists(self.index_path):
+            self.index.load_index(self.index_path, max_elements=self.capacity)
+            # Rows written after the last snapshot are re-inserted from the
+            # matrix: new labels, and existing ones overwritten in place.
+            indexed = self.index.get_current_count()
+            stale = [label for (label,) in self.db.execute("SELECT label FROM unsnapshotted") if label < indexed]
+            stale.extend(range(indexed, self.next_label))
+            if stale:
+                labels = np.asarray(sorted(stale))
+                self.index.add_items(np.asarray(self.vectors[labels]), labels)
+        else:
+            self.index.init_index(max_elements=self.capacity, ef_construction=200, M=16)
+            if self.next_label:
+                self.index.add_items(np.asarray(self.vectors[:self.next_label]), np.arange(self.next_label))
+        for (label,) in self.db.execute("SELECT label FROM docs WHERE deleted = 1"):
+            try:
+                self.index.mark_deleted(label)
+            except RuntimeError:
+                pass
+        self.index.set_ef(max(50, settings.VECTOR_HNSW_EF))
+
+    def _map_vectors(self, capacity: int):
+        size = capacity * self.dim * 4
+        if not os.path.exists(self.vectors_path) or os.path.getsize(self.vectors_path) < size:
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(size)
+        if self.vectors is not None:
+            self.vectors.flush()
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self._map_vectors(capacity)
+        self.index.resize_index(capacity)
+        self.capacity = capacity
+
+    def upsert(self, docs: List[Dict]):
+        with self.lock:
+            if self.dim is None:
+                self.db.execute("INSERT OR REPLACE INTO info (key, value) VALUES ('dim', ?)", (str(len(docs[0]["embedding"])),))
+                self._open(len(docs[0]["embedding"]))
+
+            # Upsert by id: known ids keep their label and are overwritten in place.
+            docs = list({doc["id"]: doc for doc in docs}.values())
+            existing = {
+                row[0]: (row[1], row[2])
+                for row in self.db.execute(
+                    f"SELECT id, label, deleted FROM docs WHERE id IN ({','.join('?' * len(docs))})",
+                    [doc["id"] for doc in docs],
+                )
+            }
+
+            labels = []
+            for doc in docs:
+                label, deleted = existing.get(doc["id"], (None, 1))
+                if label is None:
+                    label = self.next_label
+                    self.next_label += 1
+                if deleted:
+                    self.live += 1
+                labels.append(label)
+            self._ensure_capacity(self.next_label)
+
+            vectors = np.asarray([doc["embedding"] for doc in docs], dtype=np.float32)
+            self.vectors[labels] = vectors
+            # add_items on an existing label updates it and clears its deleted mark.
+            self.index.add_items(vectors, np.asarray(labels))
+
+            self.db.executemany("INSERT OR IGNORE INTO unsnapshotted (label) VALUES (?)", [(label,) for label in labels])
+            self.db.executemany(
+                "INSERT OR REPLACE INTO docs (label, id, user_id, quiz_id, document, metadata, deleted) VALUES (?, ?, ?, ?, ?, ?, 0)",
+                [
+                    (
+                        label,
+                        doc["id"],
+                        doc["metadata"].get("user_id"),
+                        doc["metadata"].get("quiz_id"),
+                        doc.get("document", doc["metadata"].get("answer_text", "")),
+                        json.dumps(doc["metadata"]),
+                    )
+                    for label, doc in zip(labels, docs)
+                ],
+            )
+            self.db.commit()
+            self.dirty = True
+
+    def delete(self, ids: List[str]):
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT label FROM docs WHERE deleted = 0 AND id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+            for (label,) in rows:
+                self.index.mark_deleted(label)
+            self.live -= len(rows)
+            self.db.executemany("UPDATE docs SET deleted = 1 WHERE label = ?", rows)
+            self.db.commit()
+            self.dirty = True
+
+    def _where_sql(self, where: Optional[dict]):
+        clauses, params = ["deleted = 0"], []
+        for key, value in (where or {}).items():
+            if key in ("user_id", "quiz_id"):
+                clauses.append(f"{key} = ?")
+            else:
+                clauses.append(f"json_extract(metadata, '$.{key}') = ?")
+            params.append(value)
+        return " AND ".join(clauses), params
+
+    def search(self, embedding: List[float], top_k: int, where: Optional[dict]):
+        empty = {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+        with self.lock:
+            if self.index is None or not self.next_label:
+                return empty
+            query = np.asarray(embedding, dtype=np.float32)
+
+            if where:
+                clause, params = self._where_sql(where)
+                allowed = [row[0] for row in self.db.execute(f"SELECT label FROM docs WHERE {clause}", params)]
+                if not allowed:
+                    return empty
+                if len(allowed) <= _BRUTE_FORCE_LIMIT:
+                    labels, distances = self._exact(query, np.asarray(allowed), top_k)
+                else:
+                    allowed_set = set(allowed)
+                    k = min(top_k, len(allowed))
+                    found, dist = self.index.knn_query(query, k=k, filter=lambda label: label in allowed_set)
+                    labels, distances = found[0].tolist(), dist[0].tolist()
+            else:
+                if not self.live:
+                    return empty
+                found, dist = self.index.knn_query(query, k=min(top_k, self.live))
+                labels, distances = found[0].tolist(), dist[0].tolist()
+
+            rows = self._rows(labels)
+        return {
+            "ids": [[rows[label][0] for label in labels]],
+            "documents": [[rows[label][1] for label in labels]],
+            "metadatas": [[json.loads(rows[label][2]) for label in labels]],
+            "distances": [[float(d) for d in distances]],
+        }
+
+    def _exact(self, query: np.ndarray, labels: np.ndarray, top_k: int):
+        matrix = np.asarray(self.vectors[labels])
+        if self.space == "cosine":
+            norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1)
+            distances = 1 - matrix @ query / np.where(norms == 0, 1, norms)
+        elif self.space == "ip":
+            distances = 1 - matrix @ query
+        else:
+            distances = ((matrix - query) ** 2).sum(axis=1)
+        order = np.argsort(distances)[:top_k]
+        return labels[order].tolist(), distances[order].tolist()
+
+    def _rows(self, labels: List[int]) -> Dict[int, tuple]:
+        if not labels:
+            return {}
+        rows = self.db.execute(
+            f"SELECT label, id, document, metadata FROM docs WHERE label IN ({','.join('?' * len(labels))})", labels
+        ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def get(self, where: Optional[dict]):
+        clause, params = self._where_sql(where)
+        with self.lock:
+            rows = self.db.execute(f"SELECT id, document, metadata FROM docs WHERE {clause} ORDER BY label", params).fetchall()
+        return {
+            "ids": [row[0] for row in rows],
+            "documents": [row[1] for row in rows],
+            "metadatas": [json.loads(row[2]) for row in rows],
+        }
+
+    def snapshot(self):
+        with self.lock:
+            if not self.dirty or self.index is None:
+                return
+            self.vectors.flush()
+            tmp = self.index_path + ".tmp"
+            self.index.save_index(tmp)
+            os.replace(tmp, self.index_path)
+            self.db.execute("DELETE FROM unsnapshotted")
+            self.db.commit()
+            self.dirty = False
+
+    def close(self):
+        self.snapshot()
+        with self.lock:
+            self.db.close()
+            fcntl.flock(self._owner, fcntl.LOCK_UN)
+            self._owner.close()
+
+
+_collections: Dict[str, _HNSWCollection] = {}
+_collections_lock = threading.Lock()
+_snapshot_thread: Optional[threading.Thread] = None
+_snapshot_stop = threading.Event()
+
+
+def _snapshot_loop():
+    while not _snapshot_stop.wait(settings.VECTOR_SNAPSHOT_INTERVAL_SECONDS):
+        for collection in list(_collections.values()):
+            try:
+                collection.snapshot()
+            except Exception as e:
+                print(f"hnsw snapshot failed for {collection.directory}: {e}")
+
+
+def _get_collection(directory: str, space: str) -> _HNSWCollection:
+    global _snapshot_thread
+    collection = _collections.get(directory)
+    if collection is None:
+        with _collections_lock:
+            collection = _collections.get(directory)
+            if collection is None:
+                collection = _HNSWCollection(directory, space)
+                _collections[directory] = collection
+            if _snapshot_thread is None:
+                _snapshot_stop.clear()
+                _snapshot_thread = threading.Thread(target=_snapshot_loop, name="hnsw-snapshot", daemon=True)
+                _snapshot_thread.start()
+    return collection
+
+
+def close_collections():
+    global _snapshot_thread
+    _snapshot_stop.set()
+    with _collections_lock:
+        for collection in _collections.values():
+            collection.close()
+        _collections.clear()
+        _snapshot_thread = None
+
+
+class HNSWVectorStore(VectorStore):
+    """In-process, single-process HNSW backend; selected with VECTOR_BACKEND=hnsw."""
+
+    def __init__(self, persist_directory="hnsw_db", collection_name="user_answers", collection_metadata: Optional[dict] = None):
+        space = (collection_metadata or {}).get("hnsw:space", "l2")
+        self.collection = _get_collection(os.path.join(persist_directory, collection_name), space)
+
+    def add_documents(self, docs: List[Dict]):
+        if docs:
+            self.collection.upsert(docs)
+
+    def similarity_search(self, embedding: List[float], top_k: int = 5, where: Optional[dict] = None):
+        return self.collection.search(embedding, top_k, where)
+
+    def get_documents(self, where: Optional[dict] = None):
+        return self.collection.get(where)
+
+    def delete(self, ids: List[str]):
+        if ids:
+            self.collection.delete(ids)
+
+    def snapshot(self):
+        self.collection.snapshot()
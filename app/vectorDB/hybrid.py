@@ -0,0 +1,190 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.vectorDB.vector_store import VectorStore
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+class BM25Index:
+    """Incremental in-memory BM25 inverted index."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.doc_lengths: Dict[str, int] = {}
+        self.documents: Dict[str, str] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, text: str):
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        tokens = tokenize(text)
+        for term, tf in Counter(tokens).items():
+            self.postings[term][doc_id] = tf
+        self.doc_lengths[doc_id] = len(tokens)
+        self.documents[doc_id] = text
+        self.total_length += len(tokens)
+
+    def remove(self, doc_id: str):
+        text = self.documents.pop(doc_id, None)
+        if text is None:
+            return
+        for term in set(tokenize(text)):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        n = len(self.doc_lengths)
+        if not n:
+            return []
+        avg_len = self.total_length / n or 1
+        scores: Dict[str, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_len)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+
+
+class _Partition:
+    def __init__(self):
+        self.index = BM25Index()
+        self.loaded_at = time.monotonic()
+        self.ready = threading.Event()
+
+
+class LexicalIndex:
+    """
+    BM25 indexes partitioned by user_id, so a lexical query only scores
+    one user's answers. Partitions are loaded lazily from the vector store
+    the first time a user is queried, which also rebuilds them after a restart.
+    A partition is reloaded once it is older than `ttl_seconds` (picking up
+    answers indexed by other processes), and at most `max_partitions` are
+    kept, least recently used first out.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_partitions: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_partitions = max_partitions
+        self._partitions: "OrderedDict[str, _Partition]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def add_documents(self, docs: List[Dict]):
+        with self._lock:
+            for doc in docs:
+                part = self._partitions.get(doc["metadata"].get("user_id"))
+                # Partitions not loaded yet pick these up from the vector store on first use;
+                # ones still loading keep them, and the fetched copy doesn't overwrite them.
+                if part is not None:
+                    part.index.add(doc["id"], doc["metadata"].get("answer_text", ""))
+
+    def _expired(self, part: _Partition) -> bool:
+        return part.ready.is_set() and time.monotonic() - part.loaded_at > self.ttl_seconds
+
+    def partition(self, user_id: str, vector_store: VectorStore) -> BM25Index:
+        with self._lock:
+            part = self._partitions.get(user_id)
+            loading = part is None or self._expired(part)
+            if loading:
+                # Registered before the fetch, so documents added meanwhile land in it.
+                part = _Partition()
+                self._partitions[user_id] = part
+                self.loads += 1
+                while len(self._partitions) > self.max_partitions:
+                    self._partitions.popitem(last=False)
+                    self.evictions += 1
+            self._partitions.move_to_end(user_id)
+        if not loading:
+            part.ready.wait()
+            return part.index
+
+        try:
+            stored = vector_store.get_documents(where={"user_id": user_id})
+        except Exception:
+            with self._lock:
+                if self._partitions.get(user_id) is part:
+                    del self._partitions[user_id]
+            part.ready.set()
+            raise
+        with self._lock:
+            for doc_id, text in zip(stored["ids"], stored["documents"]):
+                if doc_id not in part.index.documents:
+                    part.index.add(doc_id, text or "")
+            part.loaded_at = time.monotonic()
+        part.ready.set()
+        return part.index
+
+    def search(self, user_id: str, query: str, top_k: int, vector_store: VectorStore) -> List[Tuple[str, float]]:
+        index = self.partition(user_id, vector_store)
+        with self._lock:
+            return index.search(query, top_k)
+
+    def text(self, user_id: str, doc_id: str) -> Optional[str]:
+        with self._lock:
+            part = self._partitions.get(user_id)
+            return part.index.documents.get(doc_id) if part else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "partitions": len(self._partitions),
+                "documents": sum(len(p.index) for p in self._partitions.values()),
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+
+lexical_index = LexicalIndex(settings.HYBRID_PARTITION_TTL_SECONDS, settings.HYBRID_MAX_PARTITIONS)
+
+
+class HybridRetriever:
+    """
+    Fuses dense (vector) and lexical (BM25) rankings of a user's answers
+    with reciprocal-rank fusion and returns a small context set.
+    """
+
+    def __init__(self, vector_store: VectorStore, index: LexicalIndex = lexical_index, rrf_k: int = 60, candidates: int = 20):
+        self.vector_store = vector_store
+        self.index = index
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+
+    def retrieve(self, query_text: str, embedding: List[float], user_id: str, top_n: int = 4) -> List[str]:
+        dense = self.vector_store.similarity_search(embedding, top_k=self.candidates, where={"user_id": user_id})
+        dense_ids = dense["ids"][0] if dense and dense.get("ids") else []
+        texts = dict(zip(dense_ids, dense["documents"][0])) if dense_ids else {}
+
+        lexical = self.index.search(user_id, query_text, self.candidates, self.vector_store)
+
+        scores: Dict[str, float] = defaultdict(float)
+        for rank, doc_id in enumerate(dense_ids):
+            scores[doc_id] += 1 / (self.rrf_k + rank + 1)
+        for rank, (doc_id, _) in enumerate(lexical):
+            scores[doc_id] += 1 / (self.rrf_k + rank + 1)
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:top_n]
+        return [texts.get(doc_id) or self.index.text(user_id, doc_id) or "" for doc_id in ranked]
@@ -0,0 +1,200 @@
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.db.repositories.quiz import QuizRepository
+from app.db.session import SessionLocal
+from app.vectorDB.embeddings import EmbeddingGenerator
+from app.vectorDB.hybrid import lexical_index
+from app.vectorDB.vector_store import create_vector_store
+
+
+def build_answer_docs(answers: list, embeddings: List[List[float]]) -> List[dict]:
+    vector_docs = []
+    for idx, ans in enumerate(answers):
+        vector_docs.append({
+            "id": str(ans.id),
+            "embedding": embeddings[idx],
+            "metadata": {
+                "user_id": str(ans.user_id),
+                "quiz_id": str(ans.quiz_id),
+                "question_id": str(ans.question_id),
+                "answer_text": ans.answer_text,
+                "created_at": str(ans.created_at)
+            }
+        })
+    return vector_docs
+
+
+class AnswerIndexer:
+    """
+    Write-behind pipeline that embeds open-ended answers and upserts them
+    into the vector store off the request path.
+
+    The answers table is the durable queue: rows with `indexed_at IS NULL`
+    are pending. Submissions push ids onto an in-process queue for low
+    latency, and a periodic sweep re-enqueues anything left behind by a
+    restart or by batches that ran out of retries. Upserts are keyed by
+    answer id, so re-processing an answer is harmless.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        batch_size: int = 64,
+        max_wait_ms: float = 50,
+        max_retries: int = 3,
+        sweep_interval: float = 30,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_retries = max_retries
+        self.sweep_interval = sweep_interval
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.indexed = 0
+        self.failures = 0
+        self.last_batch_size = 0
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"answer-indexer-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        sweeper = threading.Thread(target=self._sweep_loop, name="answer-indexer-sweep", daemon=True)
+        sweeper.start()
+        self._threads.append(sweeper)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for _ in range(self.workers):
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, answer_ids: List[UUID], attempt: int = 0):
+        now = time.monotonic()
+        with self._lock:
+            for answer_id in answer_ids:
+                key = str(answer_id)
+                if attempt == 0 and key in self._pending:
+                    continue
+                self._pending.setdefault(key, now)
+                self._queue.put((key, attempt))
+
+    def lag_seconds(self) -> float:
+        with self._lock:
+            oldest = min(self._pending.values(), default=None)
+        return round(time.monotonic() - oldest, 3) if oldest is not None else 0.0
+
+    def stats(self) -> dict:
+        lag_seconds = self.lag_seconds()
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "pending": len(self._pending),
+                "lag_seconds": lag_seconds,
+                "indexed": self.indexed,
+                "failures": self.failures,
+                "last_batch_size": self.last_batch_size,
+            }
+
+    def _collect(self) -> Optional[list]:
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        embedding_generator = EmbeddingGenerator()
+        vector_store = create_vector_store()
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            ids = [answer_id for answer_id, _ in batch]
+            try:
+                self._index(ids, embedding_generator, vector_store)
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                print(f"answer indexing failed for {len(ids)} answers: {e}")
+                self._retry(batch)
+                continue
+            with self._lock:
+                for answer_id in ids:
+                    self._pending.pop(answer_id, None)
+
+    def _index(self, ids: List[str], embedding_generator: EmbeddingGenerator, vector_store):
+        with SessionLocal() as db:
+            repo = QuizRepository(db)
+            answers = repo.get_unindexed_open_ended_answers([UUID(i) for i in ids])
+            if answers:
+                embeddings = embedding_generator.embed([ans.answer_text for ans in answers])
+                docs = build_answer_docs(answers, embeddings)
+                vector_store.add_documents(docs)
+                lexical_index.add_documents(docs)
+                repo.mark_answers_indexed([ans.id for ans in answers])
+        with self._lock:
+            self.indexed += len(answers)
+            self.last_batch_size = len(answers)
+
+    def _retry(self, batch: list):
+        retry = [(answer_id, attempt + 1) for answer_id, attempt in batch if attempt < self.max_retries]
+        with self._lock:
+            for answer_id, attempt in batch:
+                if attempt >= self.max_retries:
+                    # Left for the sweep to pick up again.
+                    self._pending.pop(answer_id, None)
+        if retry:
+            def requeue():
+                for item in retry:
+                    self._queue.put(item)
+
+            timer = threading.Timer(0.5 * 2 ** max(attempt for _, attempt in retry), requeue)
+            timer.daemon = True
+            timer.start()
+
+    def _sweep_loop(self):
+        while not self._stop.is_set():
+            try:
+                with SessionLocal() as db:
+                    ids = QuizRepository(db).get_pending_index_ids(min_age_seconds=self.sweep_interval, limit=self.batch_size * 10)
+                self.enqueue(ids)
+            except Exception as e:
+                print(f"answer indexing sweep failed: {e}")
+            self._stop.wait(self.sweep_interval)
+
+
+answer_indexer = AnswerIndexer(
+    workers=settings.INDEXER_WORKERS,
+    batch_size=settings.INDEXER_BATCH_SIZE,
+    max_wait_ms=settings.INDEXER_MAX_WAIT_MS,
+    max_retries=settings.INDEXER_MAX_RETRIES,
+    sweep_interval=settings.INDEXER_SWEEP_INTERVAL_SECONDS,
+)
@@ -1,29 +1,169 @@
 from chromadb import PersistentClient
-from typing import List, Dict
+from chromadb.api.shared_system_client import SharedSystemClient
+from typing import List, Dict, Optional
+from app.core.config import settings
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+
+
+class VectorStoreManager:
+    """
+    Opens the Chroma PersistentClient once per process and hands out
+    cached collection handles. Writes are serialized because the
+    underlying SQLite store only allows one writer at a time.
+    """
+
+    def __init__(self, persist_directory: str = "chroma_db"):
+        self.persist_directory = persist_directory
+        self._client: Optional[PersistentClient] = None
+        self._collections: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.write_lock = threading.Lock()
+
+    @property
+    def client(self) -> PersistentClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = PersistentClient(path=self.persist_directory)
+        return self._client
+
+    def get_collection(self, name: str, metadata: Optional[dict] = None):
+        collection = self._collections.get(name)
+        if collection is None:
+            client = self.client
+            with self._lock:
+                collection = self._collections.get(name)
+                if collection is None:
+                    collection = client.get_or_create_collection(name=name, metadata=metadata)
+                    self._collections[name] = collection
+        return collection
+
+    def close(self):
+        """Flush and release the Chroma system on app shutdown."""
+        with self._lock, self.write_lock:
+            self._collections.clear()
+            if self._client is not None:
+                SharedSystemClient.clear_system_cache()
+                self._client = None
+
+
+_managers: Dict[str, VectorStoreManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_vector_store_manager(persist_directory: str = "chroma_db") -> VectorStoreManager:
+    manager = _managers.get(persist_directory)
+    if manager is None:
+        with _managers_lock:
+            manager = _managers.setdefault(persist_directory, VectorStoreManager(persist_directory))
+    return manager
+
+
+def close_vector_stores():
+    with _managers_lock:
+        for manager in _managers.values():
+            manager.close()
+
+    from app.vectorDB.hnsw_store import close_collections
+    close_collections()
+
+
+class VectorStore(ABC):
+    """
+    Interface shared by the vector store backends. Search results use
+    Chroma's query shape ({"ids": [[...]], "documents": [[...]],
+    "metadatas": [[...]], "distances": [[...]]}) whatever the backend.
+    """
+
+    @abstractmethod
+    def add_documents(self, docs: List[Dict]):
+        ...
+
+    @abstractmethod
+    def similarity_search(self, embedding: List[float], top_k: int = 5, where: Optional[dict] = None):
+        ...
+
+    @abstractmethod
+    def get_documents(self, where: Optional[dict] = None):
+        ...
+
+    @abstractmethod
+    def delete(self, ids: List[str]):
+        ...
+
+    def snapshot(self):
+        """Persist in-memory state; a no-op for backends that write through."""
+
+    async def aadd_documents(self, docs: List[Dict]):
+        await asyncio.to_thread(self.add_documents, docs)
+
+    async def asimilarity_search(self, embedding: List[float], top_k: int = 5, where: Optional[dict] = None):
+        return await asyncio.to_thread(self.similarity_search, embedding, top_k, where)
 
-class VectorStore:
-    def __init__(self, persist_directory="chroma_db", collection_name="user_answers"):
-        self.client = PersistentClient(path=persist_directory)
-        self.collection = self.client.get_or_create_collection(name=collection_name)
+
+class ChromaVectorStore(VectorStore):
+    def __init__(self, persist_directory="chroma_db", collection_name="user_answers", collection_metadata: Optional[dict] = None):
+        self.manager = get_vector_store_manager(persist_directory)
+        self.client = self.manager.client
+        self.collection = self.manager.get_collection(collection_name, metadata=collection_metadata)
 
     def add_documents(self, docs: List[Dict]):
         ids = [doc["id"] for doc in docs]
         embeddings = [doc["embedding"] for doc in docs]
         metadatas = [doc["metadata"] for doc in docs]
-        documents = [doc["metadata"]["answer_text"] for doc in docs]
-
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas,
-            documents=documents
-        )
-
-    def similarity_search(self, embedding: List[float], top_k: int = 5):
+        documents = [doc.get("document", doc["metadata"].get("answer_text", "")) for doc in docs]
+
+        with self.manager.write_lock:
+            self.collection.upsert(
+                ids=ids,
+                embeddings=embeddings,
+                metadatas=metadatas,
+                documents=documents
+            )
+
+    def similarity_search(self, embedding: List[float], top_k: int = 5, where: Optional[dict] = None):
+        """
+        Nearest neighbours of `embedding`. `where` is a metadata filter such
+        as {"user_id": "..."} so a query only touches one tenant's answers.
+        """
         return self.collection.query(
             query_embeddings=[embedding],
-            n_results=top_k
+            n_results=top_k,
+            where=where or None
+        )
+
+    def get_documents(self, where: Optional[dict] = None):
+        return self.collection.get(where=where or None, include=["documents", "metadatas"])
+
+    def delete(self, ids: List[str]):
+        with self.manager.write_lock:
+            self.collection.delete(ids=ids)
+
+
+def create_vector_store(
+    collection_name: str = "user_answers",
+    collection_metadata: Optional[dict] = None,
+    backend: Optional[str] = None,
+    persist_directory: Optional[str] = None,
+) -> VectorStore:
+    """Build the vector store selected by settings.VECTOR_BACKEND (chroma | hnsw)."""
+    backend = backend or settings.VECTOR_BACKEND
+    if backend == "hnsw":
+        from app.vectorDB.hnsw_store import HNSWVectorStore
+        return HNSWVectorStore(
+            persist_directory=persist_directory or settings.VECTOR_HNSW_DIR,
+            collection_name=collection_name,
+            collection_metadata=collection_metadata,
+        )
+    if backend == "chroma":
+        return ChromaVectorStore(
+            persist_directory=persist_directory or settings.VECTOR_CHROMA_DIR,
+            collection_name=collection_name,
+            collection_metadata=collection_metadata,
         )
+    raise ValueError(f"Unknown vector backend: {backend}")
 
 
 # from chromadb import PersistentClient
@@ -32,7 +172,7 @@ class VectorStore:
 
 
 
-# class VectorStore:
+# class VectorStore(ABC):
 #     def __init__(self, persist_directory="chroma_db", collection_name="user_answers"):
 #         self.client = PersistentClient(path=persist_directory)
 #         self.collection = self.client.get_or_create_collection(name=collection_name)
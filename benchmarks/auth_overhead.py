@@ -0,0 +1,84 @@
+"""
+Per-request cost of resolving the caller in get_current_user: the old
+path (verify the JWT, then SELECT the user through a pooled session) vs.
+the verified-token and principal caches, with hot tokens and with a
+fresh token every request. Requests run on a thread pool, like FastAPI's
+sync dependencies.
+
+Needs DATABASE_URL; a throwaway user is created and deleted.
+
+    uv run python -m benchmarks.auth_overhead --requests 5000 --concurrency 16
+"""
+import argparse
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.core.depedencies import get_current_user
+from app.core.security import create_access_token, decode_access_token
+from app.db.models.user import User
+from app.db.session import SessionLocal
+
+
+def _report(label: str, samples: list, wall: float) -> None:
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    print(f"{label:<26} mean={statistics.mean(samples) * 1e6:9.1f} us  p50={statistics.median(samples) * 1e6:9.1f} us  "
+          f"p99={p99 * 1e6:9.1f} us  throughput={len(samples) / wall:9.0f} req/s")
+
+
+def old_path(token: str) -> User:
+    payload = decode_access_token(token)
+    with SessionLocal() as db:
+        return db.query(User).filter(User.id == payload["sub"]).first()
+
+
+def new_path(token: str):
+    return get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def run(fn, tokens: list, concurrency: int) -> tuple:
+    def one(token):
+        start = time.perf_counter()
+        fn(token)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        samples = list(pool.map(one, tokens))
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id, email = str(user.id), user.email
+
+    try:
+        hot = [create_access_token({"sub": user_id, "email": email})] * args.requests
+        legacy = [create_access_token({"sub": user_id})] * args.requests
+        # Distinct tokens: every request misses the verified-token cache.
+        fresh = [create_access_token({"sub": user_id, "email": email, "n": i}) for i in range(args.requests)]
+
+        _report("before (verify + SELECT)", *run(old_path, hot, args.concurrency))
+        _report("after, hot token", *run(new_path, hot, args.concurrency))
+        _report("after, legacy token", *run(new_path, legacy, args.concurrency))
+        _report("after, fresh tokens", *run(new_path, fresh, args.concurrency))
+    finally:
+        with SessionLocal() as db:
+            db.query(User).filter(User.id == user_id).delete()
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Wall time to generate quizzes for a cohort: the per-student loop teachers
+use today (one /quiz/generate per student) vs. generate_cohort_quizzes.
+
+The LLM is a local stub whose latency is `base + per_student * n` for a
+prompt covering n students, a rough stand-in for prefill plus decode.
+Needs DATABASE_URL; the benchmark creates throwaway users and deletes
+them (with their quizzes) afterwards. Run with the response cache off so
+repeated prompts aren't served from it:
+
+    LLM_CACHE_ENABLED=false uv run python -m benchmarks.cohort_generation --cohort 100
+"""
+import argparse
+import asyncio
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sqlalchemy import delete, select
+
+from app.api.quiz.services import AsyncQuizService
+from app.core.config import settings
+from app.db.models.profile import Profile
+from app.db.models.quiz import Question, Quiz
+from app.db.models.user import User
+from app.db.repositories.profile import AsyncProfileRepository
+from app.db.repositories.quiz import AsyncQuizRepository
+from app.db.session import AsyncSessionLocal, async_engine
+from app.LLMs.client import LLMClient
+
+
+QUESTIONS = [
+    {"question_text": f"Question {i}?", "question_type": t, "options": ["a", "b"] if t == "mcq" else None,
+     "correct_answer": "a" if t == "mcq" else None, "tags": ["bench"]}
+    for i, t in enumerate(["mcq", "mcq", "open_ended", "open_ended", "true_false", "true_false"])
+]
+
+
+def start_stub(base: float, per_student: float) -> str:
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            prompt = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["prompt"]
+            students = len(re.findall(r"^- Student \d+:", prompt, re.M))
+            time.sleep(base + per_student * max(1, students))
+            if students:
+                body = [{"student": i, "questions": QUESTIONS} for i in range(1, students + 1)]
+            else:
+                body = QUESTIONS
+            data = json.dumps({"response": json.dumps(body), "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/api/generate"
+
+
+def _profile(i: int) -> dict:
+    return {
+        "name": f"Student {i}", "age": 14 + i % 4, "gender": "Female" if i % 2 else "Male",
+        "education": ["Grade 9", "Grade 10"][i % 2], "city": "Pune",
+        "hobbies": [["football"], ["chess", "reading"], ["music"]][i % 3], "bio": None,
+    }
+
+
+async def _service(db, llm_url: str) -> AsyncQuizService:
+    return AsyncQuizService(AsyncProfileRepository(db), AsyncQuizRepository(db), LLMClient(base_url=llm_url), None, None)
+
+
+async def run(cohort: int, llm_url: str) -> None:
+    async with AsyncSessionLocal() as db:
+        users = [User(email=f"bench-{uuid.uuid4()}@example.com", hashed_password="x") for _ in range(cohort)]
+        db.add_all(users)
+        await db.commit()
+        user_ids = [u.id for u in users]
+
+    try:
+        async with AsyncSessionLocal() as db:
+            service = await _service(db, llm_url)
+            start = time.perf_counter()
+            for i, user_id in enumerate(user_ids):
+                await service.generate_quiz_for_user(user_id=user_id, profile_data=_profile(i))
+            loop_time = time.perf_counter() - start
+
+        async with AsyncSessionLocal() as db:
+            service = await _service(db, llm_url)
+            start = time.perf_counter()
+            result = await service.generate_cohort_quizzes(
+                [{"user_id": user_id, "profile": _profile(i)} for i, user_id in enumerate(user_ids)]
+            )
+            batch_time = time.perf_counter() - start
+
+        print(f"per-student loop  {loop_time:8.2f} s  llm_calls={cohort}")
+        print(f"cohort batch      {batch_time:8.2f} s  llm_calls={result['llm_calls']}  "
+              f"(pack={settings.QUIZ_BATCH_PACK_SIZE}, concurrency={settings.QUIZ_BATCH_CONCURRENCY})")
+        print(f"speed-up          {loop_time / batch_time:8.1f}x")
+    finally:
+        async with AsyncSessionLocal() as db:
+            quiz_ids = select(Quiz.id).where(Quiz.user_id.in_(user_ids))
+            await db.execute(delete(Question).where(Question.quiz_id.in_(quiz_ids)))
+            await db.execute(delete(Quiz).where(Quiz.user_id.in_(user_ids)))
+            await db.execute(delete(Profile).where(Profile.user_id.in_(user_ids)))
+            await db.execute(delete(User).where(User.id.in_(user_ids)))
+            await db.commit()
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cohort", type=int, default=100)
+    parser.add_argument("--base-latency", type=float, default=0.5)
+    parser.add_argument("--per-student-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    if settings.LLM_CACHE_ENABLED:
+        print("warning: LLM_CACHE_ENABLED is on; cached prompts will skew the comparison")
+    asyncio.run(run(args.cohort, start_stub(args.base_latency, args.per_student_latency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-request embedding latency: a fresh SentenceTransformer per request
+(the old behaviour of get_embedding_generator) vs. the shared model registry.
+
+    uv run python -m benchmarks.embedding_load --requests 20
+"""
+import argparse
+import statistics
+import time
+
+from sentence_transformers import SentenceTransformer
+
+from app.core.config import settings
+from app.vectorDB.embeddings import EmbeddingGenerator, warm_up
+
+
+TEXTS = ["Photosynthesis converts light into chemical energy.", "I don't know"]
+
+
+def _report(label: str, samples: list) -> None:
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{label:<10} mean={statistics.mean(samples) * 1000:8.1f} ms  "
+          f"p50={statistics.median(samples) * 1000:8.1f} ms  p95={p95 * 1000:8.1f} ms")
+
+
+def run_before(n: int) -> list:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        model.encode(TEXTS, show_progress_bar=False).tolist()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_after(n: int) -> list:
+    warm_up()
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        EmbeddingGenerator().embed(TEXTS)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    _report("before", run_before(args.requests))
+    _report("after", run_after(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+LLM router against local stub servers: a fast pool with one slow node,
+then one node dying and coming back. Compares single-endpoint dispatch,
+least-loaded routing and least-loaded routing with hedging.
+
+    uv run python -m benchmarks.llm_router --requests 200 --concurrency 16
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.LLMs.router import LLMRouter
+
+
+class StubServer:
+    """Ollama-shaped /api/generate that sleeps `latency` seconds per call."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.down = False
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._reply(503 if stub.down else 200, {"status": "ok"})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if stub.down:
+                    return self._reply(503, {"error": "down"})
+                time.sleep(stub.latency)
+                self._reply(200, {"response": "{}", "done": True})
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/generate"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def _post(url: str) -> dict:
+    response = requests.post(url, json={"prompt": "x"}, timeout=10)
+    if response.status_code >= 500:
+        raise Exception(f"LLM request failed: {response.status_code}")
+    return response.json()
+
+
+def _report(label: str, samples: list, errors: int, router: LLMRouter) -> None:
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    share = " ".join(f"{e['requests']:>4}" for e in router.stats()["endpoints"])
+    print(f"{label:<14} mean={statistics.mean(samples) * 1000:7.1f} ms  p95={p95 * 1000:7.1f} ms  "
+          f"p99={p99 * 1000:7.1f} ms  errors={errors:<3} hedged={router.hedged:<4} per-node=[{share}]")
+
+
+def run(router: LLMRouter, n: int, concurrency: int) -> tuple:
+    samples, errors = [], 0
+
+    def one(_):
+        start = time.perf_counter()
+        try:
+            router.call(_post)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        for latency in pool.map(one, range(n)):
+            if latency is None:
+                errors += 1
+            else:
+                samples.append(latency)
+    return samples, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    stubs = [StubServer(0.05), StubServer(0.05), StubServer(0.05), StubServer(0.4)]
+    urls = [s.url for s in stubs]
+
+    single = LLMRouter(urls[-1:])
+    _report("single(slow)", *run(single, args.requests, args.concurrency), single)
+
+    routed = LLMRouter(urls)
+    _report("least-loaded", *run(routed, args.requests, args.concurrency), routed)
+
+    hedged = LLMRouter(urls, hedge=True, hedge_percentile=90)
+    run(hedged, 50, args.concurrency)  # fill the latency window
+    _report("hedged", *run(hedged, args.requests, args.concurrency), hedged)
+
+    failover = LLMRouter(urls, probe_interval=0.2, eject_after=2)
+    failover.start()
+    stubs[0].down = True
+    _report("node down", *run(failover, args.requests, args.concurrency), failover)
+    stubs[0].down = False
+    time.sleep(0.5)
+    print("re-admitted:", [e["healthy"] for e in failover.stats()["endpoints"]])
+    failover.stop()
+
+
+if __name__ == "__main__":
+    main()
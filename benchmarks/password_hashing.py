@@ -0,0 +1,91 @@
+"""
+Login hashing cost: verify throughput per hashing process, and how a login
+storm affects the latency of unrelated (quiz) requests served by the same
+worker when bcrypt runs inline vs. in the PasswordHasher process pool.
+
+"Quiz requests" are short pure-Python tasks on a 40-thread pool, like
+Starlette's threadpool for sync endpoints.
+
+    uv run python -m benchmarks.password_hashing --rounds 12 --logins 64
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _quiz_request() -> float:
+    start = time.perf_counter()
+    sum(i * i for i in range(20000))
+    return time.perf_counter() - start
+
+
+def _percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    return f"p50={statistics.median(samples) * 1000:7.1f} ms  p99={p99 * 1000:7.1f} ms"
+
+
+def throughput(hasher, stored: str, logins: int) -> float:
+    with ThreadPoolExecutor(32) as pool:
+        start = time.perf_counter()
+        list(pool.map(lambda _: hasher.verify_and_update("correct horse", stored), range(logins)))
+    return logins / (time.perf_counter() - start)
+
+
+def quiz_latency_under_storm(hasher, stored: str, logins: int) -> list:
+    pool = ThreadPoolExecutor(40)
+    stop = threading.Event()
+    samples = []
+
+    def storm():
+        list(pool.map(lambda _: hasher.verify_and_update("correct horse", stored), range(logins)))
+        stop.set()
+
+    threading.Thread(target=storm).start()
+    while not stop.is_set():
+        submitted = time.perf_counter()
+        pool.submit(_quiz_request).result()
+        samples.append(time.perf_counter() - submitted)
+    pool.shutdown()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+
+    # Must be set before app.core.config is imported, here and in the pool's children.
+    os.environ["PASSWORD_BCRYPT_ROUNDS"] = str(args.rounds)
+    from app.core.password_hasher import PasswordHasher
+    from app.core.security import hash_password
+
+    stored = hash_password("correct horse")
+    cores = os.cpu_count() or 1
+
+    baseline = [_quiz_request() for _ in range(50)]
+    print(f"quiz request, idle           {_percentiles(baseline)}")
+
+    for workers in sorted({1, max(1, cores // 2), cores}):
+        hasher = PasswordHasher(workers=workers, max_concurrency=64, queue_timeout=600)
+        hasher.verify_and_update("warm up", stored)
+        rate = throughput(hasher, stored, args.logins)
+        print(f"offloaded, {workers} process(es)   {rate:7.1f} logins/s  ({rate / workers:6.1f} per core)")
+        hasher.shutdown()
+
+    inline = PasswordHasher(workers=0, max_concurrency=64, queue_timeout=600)
+    print(f"quiz during storm, inline    {_percentiles(quiz_latency_under_storm(inline, stored, args.logins))}")
+
+    offloaded = PasswordHasher(workers=max(1, cores // 2), max_concurrency=64, queue_timeout=600)
+    offloaded.verify_and_update("warm up", stored)
+    print(f"quiz during storm, offloaded {_percentiles(quiz_latency_under_storm(offloaded, stored, args.logins))}")
+    print(offloaded.stats())
+    offloaded.shutdown()
+
+
+if __name__ == "__main__":
+    main()
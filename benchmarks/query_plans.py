@@ -0,0 +1,144 @@
+"""
+Query plans and timings of the hot repository lookups at scale, with the
+secondary indexes from migration e2d9a4c71b08 and without them (dropped
+inside a transaction that is rolled back afterwards).
+
+Seeds users, profiles, quizzes, questions and answers with
+generate_series, runs each repository method against random seeded ids,
+prints the EXPLAIN (ANALYZE, BUFFERS) plan of one call and p50/p99
+latency over all of them. Needs DATABASE_URL (Postgres 13+) migrated to
+head; seeded rows are deleted at the end unless --keep is given.
+
+    uv run python -m benchmarks.query_plans --users 10000 --quizzes 10 --questions 10 --runs 200
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+import app.db.models  # noqa: F401  (registers every mapper)
+import app.db.models.profile  # noqa: F401
+from app.db.base import Base
+from app.db.repositories.profile import ProfileRepository
+from app.db.repositories.quiz import QuizRepository
+from app.db.session import engine
+
+MARKER = "@query-plans.invalid"
+INDEXES = ["ix_quizzes_user_id_created_at", "ix_questions_quiz_id", "ix_answers_quiz_id_user_id"]
+
+BENCH_USERS = f"SELECT id FROM users WHERE email LIKE 'bench-%{MARKER}'"
+
+SEED = [
+    f"""INSERT INTO users (id, email, hashed_password)
+        SELECT gen_random_uuid(), 'bench-' || g || '{MARKER}', 'x' FROM generate_series(1, :users) g""",
+    f"""INSERT INTO profiles (id, user_id, name, education)
+        SELECT gen_random_uuid(), id, 'bench', 'bsc' FROM ({BENCH_USERS}) u""",
+    f"""INSERT INTO quizzes (id, user_id, created_at, total_questions, quiz_type, tags)
+        SELECT gen_random_uuid(), u.id, now() - g * interval '1 hour', :questions, 'personalized', ARRAY['bench']
+        FROM ({BENCH_USERS}) u, generate_series(1, :quizzes) g""",
+    f"""INSERT INTO questions (id, quiz_id, question_text, question_type)
+        SELECT gen_random_uuid(), z.id, 'question ' || g, 'open_ended'
+        FROM quizzes z JOIN ({BENCH_USERS}) u ON u.id = z.user_id, generate_series(1, :questions) g""",
+    f"""INSERT INTO answers (id, user_id, quiz_id, question_id, answer_text, created_at, indexed_at)
+        SELECT gen_random_uuid(), z.user_id, z.id, q.id, 'answer', now(), now()
+        FROM questions q JOIN quizzes z ON z.id = q.quiz_id JOIN ({BENCH_USERS}) u ON u.id = z.user_id""",
+]
+
+CLEANUP = [
+    f"DELETE FROM answers WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM questions WHERE quiz_id IN (SELECT id FROM quizzes WHERE user_id IN ({BENCH_USERS}))",
+    f"DELETE FROM quizzes WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM profiles WHERE user_id IN ({BENCH_USERS})",
+    f"DELETE FROM users WHERE email LIKE 'bench-%{MARKER}'",
+]
+
+CASES = {
+    "QuizRepository.get_last_quiz_for_user": lambda db, user_id, quiz_id: QuizRepository(db).get_last_quiz_for_user(user_id),
+    "QuizRepository.get_questions_by_quiz": lambda db, user_id, quiz_id: QuizRepository(db).get_questions_by_quiz(quiz_id),
+    "QuizRepository.get_answers_by_quiz": lambda db, user_id, quiz_id: QuizRepository(db).get_answers_by_quiz(user_id, quiz_id),
+    "ProfileRepository.get_by_user_id": lambda db, user_id, quiz_id: ProfileRepository(db).get_by_user_id(user_id),
+}
+
+
+def _report(label: str, samples: list) -> None:
+    samples = sorted(samples)
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    print(f"  {label:<40} p50={statistics.median(samples) * 1000:8.2f} ms  p99={p99 * 1000:8.2f} ms")
+
+
+def seed(users: int, quizzes: int, questions: int) -> None:
+    with engine.begin() as conn:
+        started = time.perf_counter()
+        conn.exec_driver_sql("SET LOCAL statement_timeout = 0")
+        for statement in SEED:
+            conn.execute(text(statement), {"users": users, "quizzes": quizzes, "questions": questions})
+        conn.exec_driver_sql("ANALYZE users, profiles, quizzes, questions, answers")
+    print(f"seeded {users} users, {users * quizzes} quizzes, {users * quizzes * questions} questions/answers "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+def run_suite(conn, samples: list) -> None:
+    db = Session(bind=conn)
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    for name, call in CASES.items():
+        timings = []
+        for user_id, quiz_id in samples:
+            started = time.perf_counter()
+            call(db, user_id, quiz_id)
+            timings.append(time.perf_counter() - started)
+            db.expunge_all()
+        _report(name, timings)
+
+        event.listen(conn, "before_cursor_execute", capture)
+        call(db, *samples[0])
+        event.remove(conn, "before_cursor_execute", capture)
+        statement, parameters = captured.pop()
+        plan = conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters).scalars().all()
+        print("\n".join("      " + line for line in plan))
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--quizzes", type=int, default=10, help="quizzes per user")
+    parser.add_argument("--questions", type=int, default=10, help="questions (and answers) per quiz")
+    parser.add_argument("--runs", type=int, default=200, help="random (user, quiz) pairs per method")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded rows in place")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed(args.users, args.quizzes, args.questions)
+    try:
+        with engine.connect() as conn:
+            samples = conn.execute(
+                text(f"SELECT user_id, id FROM quizzes WHERE user_id IN ({BENCH_USERS}) ORDER BY random() LIMIT :n"),
+                {"n": args.runs},
+            ).all()
+            conn.rollback()
+
+            print("\nwith indexes")
+            run_suite(conn, samples)
+            conn.rollback()
+
+            print("\nwithout indexes")
+            for name in INDEXES:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+            run_suite(conn, samples)
+            conn.rollback()
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.exec_driver_sql("SET LOCAL statement_timeout = 0")
+                for statement in CLEANUP:
+                    conn.execute(text(statement))
+
+
+if __name__ == "__main__":
+    main()
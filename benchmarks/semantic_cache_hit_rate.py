@@ -0,0 +1,70 @@
+"""
+Replay a recorded feedback workload through SemanticFeedbackCache and
+report how many LLM calls it would have saved at each threshold.
+
+The workload is JSONL, one feedback request per line:
+
+    {"user_id": "...", "tags": ["python", "loops"], "topic": "Python", "context": ["answer one", "answer two"]}
+
+Entries are scoped per user; requests without a user_id share one.
+
+    uv run python -m benchmarks.semantic_cache_hit_rate workload.jsonl --thresholds 0.88 0.92 0.95
+"""
+import argparse
+import json
+import tempfile
+import uuid
+
+from app.api.feedback.semantic_cache import SemanticFeedbackCache, salient_text
+from app.vectorDB.embeddings import EmbeddingGenerator
+from app.vectorDB.vector_store import create_vector_store, close_vector_stores
+
+
+def replay(workload: list, threshold: float, persist_directory: str) -> dict:
+    cache = SemanticFeedbackCache(
+        EmbeddingGenerator(),
+        create_vector_store(
+            persist_directory=persist_directory,
+            collection_name=f"bench_{str(threshold).replace('.', '_')}",
+            collection_metadata={"hnsw:space": "cosine"},
+        ),
+        threshold=threshold,
+    )
+    hits = 0
+    similarities = []
+    for request in workload:
+        text = salient_text(request.get("tags", []), request.get("topic"), request.get("context", []))
+        embedding = cache.embed(text)
+        user_id = request.get("user_id", "anonymous")
+        match = cache.lookup(embedding, user_id)
+        if match:
+            hits += 1
+            similarities.append(match["similarity"])
+        else:
+            cache.store(embedding, text, uuid.uuid4(), {"feedback_text": "recorded", "follow_up_suggestion": ""}, user_id)
+    return {
+        "threshold": threshold,
+        "requests": len(workload),
+        "hits": hits,
+        "hit_rate": round(hits / len(workload), 4) if workload else 0,
+        "mean_hit_similarity": round(sum(similarities) / len(similarities), 4) if similarities else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("workload", help="JSONL file of recorded feedback requests")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.88, 0.92, 0.95])
+    args = parser.parse_args()
+
+    with open(args.workload, "r", encoding="utf-8") as f:
+        workload = [json.loads(line) for line in f if line.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for threshold in args.thresholds:
+            print(json.dumps(replay(workload, threshold, tmp)))
+        close_vector_stores()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Query latency of user-scoped similarity search as the total number of
+users grows. Each user owns the same number of answers. Per-user latency
+should stay roughly flat while the unfiltered scan grows with the
+collection.
+
+    uv run python -m benchmarks.user_scoped_search --users 100 1000 10000 --answers-per-user 20
+"""
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from app.vectorDB.vector_store import VectorStore, create_vector_store, close_vector_stores
+
+DIM = 384
+
+
+def _populate(store: VectorStore, start_user: int, end_user: int, answers_per_user: int, rng):
+    batch = []
+    for user in range(start_user, end_user):
+        vectors = rng.standard_normal((answers_per_user, DIM), dtype=np.float32)
+        for i, vector in enumerate(vectors):
+            batch.append({
+                "id": f"u{user}-a{i}",
+                "embedding": vector.tolist(),
+                "metadata": {"user_id": f"user-{user}", "quiz_id": f"quiz-{user}", "answer_text": f"answer {i} of user {user}"},
+            })
+            if len(batch) >= 5000:
+                store.add_documents(batch)
+                batch = []
+    if batch:
+        store.add_documents(batch)
+
+
+def _time_queries(store: VectorStore, users: int, queries: int, rng, scoped: bool) -> list:
+    samples = []
+    for _ in range(queries):
+        query = rng.standard_normal(DIM, dtype=np.float32).tolist()
+        where = {"user_id": f"user-{int(rng.integers(users))}"} if scoped else None
+        start = time.perf_counter()
+        store.similarity_search(query, top_k=5, where=where)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--answers-per-user", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--backend", default=None, help="chroma | hnsw (defaults to VECTOR_BACKEND)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = create_vector_store(collection_name="bench_answers", backend=args.backend, persist_directory=tmp)
+        populated = 0
+        for users in sorted(args.users):
+            _populate(store, populated, users, args.answers_per_user, rng)
+            populated = users
+            for scoped in (True, False):
+                samples = sorted(_time_queries(store, users, args.queries, rng, scoped))
+                print(f"users={users:<7} docs={users * args.answers_per_user:<9} "
+                      f"{'scoped' if scoped else 'global':<7} "
+                      f"p50={statistics.median(samples) * 1000:7.2f} ms  "
+                      f"p99={samples[int(len(samples) * 0.99) - 1] * 1000:7.2f} ms")
+        close_vector_stores()
+
+
+if __name__ == "__main__":
+    main()
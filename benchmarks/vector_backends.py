@@ -0,0 +1,93 @@
+"""
+Compare vector store backends on insert throughput, query latency and
+resident memory. Each backend runs in its own process so RSS numbers
+don't bleed into each other.
+
+    uv run python -m benchmarks.vector_backends --n 1000000 --backends chroma hnsw
+"""
+import argparse
+import multiprocessing
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+DIM = 384
+USERS = 10000
+
+
+def _rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run(backend: str, n: int, batch: int, queries: int, out):
+    from app.vectorDB.vector_store import create_vector_store, close_vector_stores
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = create_vector_store(collection_name="bench_answers", backend=backend, persist_directory=tmp)
+
+        start = time.perf_counter()
+        for offset in range(0, n, batch):
+            size = min(batch, n - offset)
+            vectors = rng.standard_normal((size, DIM), dtype=np.float32)
+            store.add_documents([
+                {
+                    "id": f"a{offset + i}",
+                    "embedding": vectors[i].tolist(),
+                    "metadata": {"user_id": f"user-{(offset + i) % USERS}", "answer_text": f"answer {offset + i}"},
+                }
+                for i in range(size)
+            ])
+        insert_seconds = time.perf_counter() - start
+
+        results = {}
+        for label, scoped in (("global", False), ("scoped", True)):
+            samples = []
+            for _ in range(queries):
+                query = rng.standard_normal(DIM, dtype=np.float32).tolist()
+                where = {"user_id": f"user-{int(rng.integers(USERS))}"} if scoped else None
+                t0 = time.perf_counter()
+                store.similarity_search(query, top_k=5, where=where)
+                samples.append(time.perf_counter() - t0)
+            samples.sort()
+            results[label] = (statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000)
+
+        store.snapshot()
+        close_vector_stores()
+
+    out.put({
+        "backend": backend,
+        "n": n,
+        "insert_per_s": round(n / insert_seconds),
+        "global_p50_ms": round(results["global"][0], 2),
+        "global_p99_ms": round(results["global"][1], 2),
+        "scoped_p50_ms": round(results["scoped"][0], 2),
+        "scoped_p99_ms": round(results["scoped"][1], 2),
+        "max_rss_mb": round(_rss_mb()),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--backends", nargs="+", default=["chroma", "hnsw"])
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    for backend in args.backends:
+        out = ctx.Queue()
+        proc = ctx.Process(target=_run, args=(backend, args.n, args.batch, args.queries, out))
+        proc.start()
+        print(out.get())
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
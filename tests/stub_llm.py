@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class StubLLMServer:
+    """
+    Ollama-shaped /api/generate on a local port. Each POST consumes the next
+    scripted step: an int status to fail with, ("sleep", seconds) to stall
+    before answering, or None to answer normally. Once the script runs out
+    every call succeeds.
+    """
+
+    def __init__(self, script: Optional[List] = None, response: str = "{}", health_status: int = 200):
+        self.script = list(script or [])
+        self.response = response
+        self.health_status = health_status
+        self.calls = 0
+        self.call_times: List[float] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client timed out and hung up.
+                    pass
+
+            def do_GET(self):
+                self._reply(stub.health_status, {"status": "ok"})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                step = stub._next_step()
+                if isinstance(step, int):
+                    return self._reply(step, {"error": "scripted failure"})
+                if isinstance(step, tuple) and step[0] == "sleep":
+                    time.sleep(step[1])
+                self._reply(200, {"response": stub.response, "done": True})
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/api/generate"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def _next_step(self):
+        with self._lock:
+            self.calls += 1
+            self.call_times.append(time.monotonic())
+            return self.script.pop(0) if self.script else None
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
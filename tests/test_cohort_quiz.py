@@ -0,0 +1,119 @@
+import asyncio
+import json
+import uuid
+
+from app.api.quiz.services import AsyncQuizService, _unpack_cohort_response
+from app.core.config import settings
+
+QUESTIONS = [
+    {"question_text": "What is 2 + 2?", "question_type": "mcq", "options": ["3", "4"], "correct_answer": "4", "tags": ["math"]},
+    {"question_text": "Explain recursion.", "question_type": "open_ended", "tags": ["cs"]},
+]
+
+
+def test_unpack_matches_students_by_number():
+    raw = json.dumps([{"student": 2, "questions": QUESTIONS[:1]}, {"student": 1, "questions": QUESTIONS[1:]}])
+    assert _unpack_cohort_response(raw, 2) == [QUESTIONS[1:], QUESTIONS[:1]]
+
+
+def test_unpack_treats_flat_question_list_as_failure():
+    assert _unpack_cohort_response(json.dumps(QUESTIONS), 2) == [[], []]
+
+
+class FakeDB:
+    async def commit(self):
+        pass
+
+
+class FakeProfileRepo:
+    db = FakeDB()
+
+    def __init__(self, user_ids):
+        self.user_ids = set(user_ids)
+        self.upserted = []
+
+    async def existing_user_ids(self, user_ids):
+        return self.user_ids & set(user_ids)
+
+    async def upsert_many(self, profiles):
+        self.upserted.extend(profiles)
+
+
+class FakeQuizRepo:
+    def __init__(self):
+        self.quiz_rows = []
+
+    async def bulk_create(self, quiz_rows, question_rows):
+        self.quiz_rows.extend(quiz_rows)
+
+
+class ScriptedLLM:
+    """Answers a packed prompt with a flat question list; single prompts by student name."""
+
+    def __init__(self, by_name):
+        self.by_name = by_name
+        self.prompts = []
+
+    async def achat(self, prompt, expect_json=False, default_keys=None, use_cache=True):
+        self.prompts.append(prompt)
+        for name, response in self.by_name.items():
+            if f"Name: {name}" in prompt:
+                return response
+        return json.dumps(QUESTIONS)
+
+
+def _profile(name):
+    return {"name": name, "age": 15, "gender": "Female", "education": "Grade 10", "city": "Pune", "hobbies": ["chess"], "bio": None}
+
+
+def test_unparseable_retry_fails_only_that_student(monkeypatch):
+    monkeypatch.setattr(settings, "QUIZ_BATCH_PACK_SIZE", 2)
+    monkeypatch.setattr(settings, "QUIZ_POOL_ENABLED", False)
+    ada, bob = uuid.uuid4(), uuid.uuid4()
+    profile_repo, quiz_repo = FakeProfileRepo([ada, bob]), FakeQuizRepo()
+    llm = ScriptedLLM({"Ada": json.dumps({"questions": QUESTIONS}), "Bob": "not a quiz"})
+    service = AsyncQuizService(profile_repo, quiz_repo, llm, None, None)
+
+    result = asyncio.run(service.generate_cohort_quizzes([
+        {"user_id": ada, "profile": _profile("Ada")},
+        {"user_id": bob, "profile": _profile("Bob")},
+    ]))
+
+    # One packed prompt, then each student on their own.
+    assert result["llm_calls"] == 3
+    assert [q["user_id"] for q in result["quizzes"]] == [ada]
+    assert result["quizzes"][0]["total_questions"] == len(QUESTIONS)
+    assert result["failed"] == [bob]
+    assert [p["name"] for p in profile_repo.upserted] == ["Ada"]
+    assert [row["user_id"] for row in quiz_repo.quiz_rows] == [ada]
+
+
+class OverloadedLLM(ScriptedLLM):
+    """Raises for prompts naming `down`, like an overloaded or unreachable LLM."""
+
+    def __init__(self, down):
+        super().__init__({})
+        self.down = down
+
+    async def achat(self, prompt, expect_json=False, default_keys=None, use_cache=True):
+        self.prompts.append(prompt)
+        if f"Name: {self.down}" in prompt:
+            raise RuntimeError("LLM overloaded")
+        return json.dumps({"questions": QUESTIONS})
+
+
+def test_llm_failure_fails_only_that_students_quiz(monkeypatch):
+    monkeypatch.setattr(settings, "QUIZ_BATCH_PACK_SIZE", 1)
+    monkeypatch.setattr(settings, "QUIZ_POOL_ENABLED", False)
+    ada, bob = uuid.uuid4(), uuid.uuid4()
+    profile_repo, quiz_repo = FakeProfileRepo([ada, bob]), FakeQuizRepo()
+    service = AsyncQuizService(profile_repo, quiz_repo, OverloadedLLM("Bob"), None, None)
+
+    result = asyncio.run(service.generate_cohort_quizzes([
+        {"user_id": ada, "profile": _profile("Ada")},
+        {"user_id": bob, "profile": _profile("Bob")},
+    ]))
+
+    assert [q["user_id"] for q in result["quizzes"]] == [ada]
+    assert result["failed"] == [bob]
+    assert [row["user_id"] for row in quiz_repo.quiz_rows] == [ada]
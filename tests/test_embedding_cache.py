@@ -0,0 +1,32 @@
+import threading
+
+from app.vectorDB import embedding_cache as cache_module
+from app.vectorDB.embedding_cache import EmbeddingCache
+
+
+def test_concurrent_open_disk_creates_one_store(tmp_path, monkeypatch):
+    created = []
+    store_class = cache_module.DiskEmbeddingStore
+
+    def counting_store(directory, dim):
+        created.append(directory)
+        return store_class(directory, dim)
+
+    monkeypatch.setattr(cache_module, "DiskEmbeddingStore", counting_store)
+    cache = EmbeddingCache(max_entries=10, disk_directory=str(tmp_path))
+    barrier = threading.Barrier(8)
+
+    def open_disk():
+        barrier.wait()
+        cache.open_disk(4)
+
+    threads = [threading.Thread(target=open_disk) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    cache.put_many({"k": [0.1, 0.2, 0.3, 0.4]})
+    assert len(created) == 1
+    assert set(cache.get_many(["k"])) == {"k"}
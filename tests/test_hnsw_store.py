@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("hnswlib")
+
+from app.vectorDB.hnsw_store import _HNSWCollection  # noqa: E402
+
+
+def _doc(doc_id, embedding):
+    return {"id": doc_id, "embedding": embedding, "metadata": {"user_id": "u1", "answer_text": doc_id}}
+
+
+def _crash(collection):
+    # Drop the collection without the snapshot close() would take.
+    collection.db.close()
+    collection._owner.close()
+
+
+def test_reopen_reindexes_vectors_overwritten_since_snapshot(tmp_path):
+    collection = _HNSWCollection(str(tmp_path))
+    collection.upsert([_doc("a", [1, 0, 0, 0]), _doc("b", [0, 1, 0, 0])])
+    collection.snapshot()
+    collection.upsert([_doc("a", [0, 0, 1, 0])])
+    _crash(collection)
+
+    reopened = _HNSWCollection(str(tmp_path))
+    try:
+        result = reopened.search([0, 0, 1, 0], top_k=1, where=None)
+        assert result["ids"] == [["a"]]
+        assert result["distances"][0][0] == pytest.approx(0)
+    finally:
+        reopened.close()
+
+
+def test_second_process_handle_is_refused(tmp_path):
+    collection = _HNSWCollection(str(tmp_path))
+    try:
+        with pytest.raises(RuntimeError, match="another process"):
+            _HNSWCollection(str(tmp_path))
+    finally:
+        collection.close()
@@ -0,0 +1,34 @@
+import contextlib
+import time
+import uuid
+
+from app.core.config import settings
+from app.jobs import worker
+
+
+class FakeJobRepository:
+    renewals = []
+
+    def __init__(self, db):
+        pass
+
+    def renew_lease(self, job_id, worker_id, lease_seconds):
+        self.renewals.append((job_id, worker_id, time.monotonic()))
+        return True
+
+
+def test_lease_is_renewed_while_the_handler_runs(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(worker, "SessionLocal", contextlib.nullcontext)
+    monkeypatch.setattr(worker, "JobRepository", FakeJobRepository)
+    monkeypatch.setitem(worker.HANDLERS, "slow", lambda db, user_id, payload: time.sleep(0.65) or {"ok": True})
+    job_id = uuid.uuid4()
+
+    assert worker._run_handler("slow", None, uuid.uuid4(), {}, job_id, "w1") == {"ok": True}
+    renewed = len(FakeJobRepository.renewals)
+    assert renewed >= 3
+    assert all(entry[:2] == (job_id, "w1") for entry in FakeJobRepository.renewals)
+
+    # The keeper stops with the handler.
+    time.sleep(0.3)
+    assert len(FakeJobRepository.renewals) == renewed
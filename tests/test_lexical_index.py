@@ -0,0 +1,73 @@
+import threading
+
+from app.vectorDB.hybrid import LexicalIndex
+
+
+class FakeStore:
+    """Holds answers per user; `gate` lets a test pause get_documents mid-fetch."""
+
+    def __init__(self):
+        self.docs = {}
+        self.fetches = 0
+        self.gate = None
+        self.fetching = threading.Event()
+
+    def put(self, user_id, doc_id, text):
+        self.docs.setdefault(user_id, {})[doc_id] = text
+
+    def get_documents(self, where=None):
+        self.fetches += 1
+        snapshot = dict(self.docs.get(where["user_id"], {}))
+        self.fetching.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return {"ids": list(snapshot), "documents": list(snapshot.values())}
+
+
+def _doc(user_id, doc_id, text):
+    return {"id": doc_id, "metadata": {"user_id": user_id, "answer_text": text}}
+
+
+def test_partition_reloads_after_ttl():
+    store = FakeStore()
+    store.put("u1", "a1", "recursion base case")
+    index = LexicalIndex(ttl_seconds=0, max_partitions=10)
+    assert [d for d, _ in index.search("u1", "recursion", 5, store)] == ["a1"]
+
+    # Written by another process: only visible after a reload.
+    store.put("u1", "a2", "recursion stack depth")
+    assert {d for d, _ in index.search("u1", "recursion", 5, store)} == {"a1", "a2"}
+    assert store.fetches == 2
+
+
+def test_least_recently_used_partition_is_evicted():
+    store = FakeStore()
+    index = LexicalIndex(ttl_seconds=300, max_partitions=2)
+    index.partition("u1", store)
+    index.partition("u2", store)
+    index.partition("u1", store)
+    index.partition("u3", store)
+
+    assert index.stats()["partitions"] == 2
+    assert index.stats()["evictions"] == 1
+    index.partition("u1", store)
+    assert store.fetches == 3
+    index.partition("u2", store)
+    assert store.fetches == 4
+
+
+def test_documents_added_during_load_are_kept():
+    store = FakeStore()
+    store.put("u1", "a1", "sorting algorithms")
+    store.gate = threading.Event()
+    index = LexicalIndex(ttl_seconds=300, max_partitions=10)
+
+    loader = threading.Thread(target=index.partition, args=("u1", store))
+    loader.start()
+    assert store.fetching.wait(5)
+    index.add_documents([_doc("u1", "a2", "sorting with heaps")])
+    store.gate.set()
+    loader.join(5)
+
+    assert {d for d, _ in index.search("u1", "sorting", 5, store)} == {"a1", "a2"}
+    assert store.fetches == 1
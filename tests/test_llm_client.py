@@ -0,0 +1,104 @@
+import asyncio
+import socket
+import time
+
+import httpx
+import pytest
+import requests
+
+from app.core.config import settings
+from app.LLMs import client as llm_client
+from app.LLMs.client import LLMClient
+from tests.stub_llm import StubLLMServer
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def make(script=None, response='{"questions": []}'):
+        server = StubLLMServer(script, response=response)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.close()
+    # Pooled clients are process-wide; don't carry connections (or an
+    # event-loop-bound httpx client) from one test into the next.
+    llm_client.close_session()
+
+
+def _run(coro):
+    async def run():
+        try:
+            return await coro
+        finally:
+            await llm_client.close_async_client()
+
+    return asyncio.run(run())
+
+
+def test_chat_returns_response_text(stub):
+    server = stub()
+    assert LLMClient(base_url=server.url).chat("hello", use_cache=False) == '{"questions": []}'
+    assert server.calls == 1
+
+
+def test_chat_retries_server_errors_then_succeeds(stub):
+    server = stub([503, 502])
+    assert LLMClient(base_url=server.url).chat("hello", use_cache=False) == '{"questions": []}'
+    assert server.calls == 3
+
+
+def test_chat_gives_up_after_max_retries(stub):
+    server = stub([503] * 10)
+    with pytest.raises(Exception, match="LLM request failed"):
+        LLMClient(base_url=server.url).chat("hello", use_cache=False)
+    assert server.calls == settings.LLM_MAX_RETRIES + 1
+
+
+def test_chat_read_timeout_is_not_resent(stub):
+    stall = ("sleep", settings.LLM_READ_TIMEOUT * 3)
+    server = stub([stall] * 10)
+    with pytest.raises(requests.exceptions.RequestException):
+        LLMClient(base_url=server.url).chat("hello", use_cache=False)
+    assert server.calls == 1
+
+
+def test_achat_retries_with_exponential_backoff(stub):
+    server = stub([503, 503])
+    assert _run(LLMClient(base_url=server.url).achat("hello", use_cache=False)) == '{"questions": []}'
+    assert server.calls == 3
+    gaps = [later - earlier for earlier, later in zip(server.call_times, server.call_times[1:])]
+    assert gaps[0] >= settings.LLM_BACKOFF_FACTOR
+    assert gaps[1] >= 2 * settings.LLM_BACKOFF_FACTOR
+
+
+def test_achat_gives_up_after_max_retries(stub):
+    server = stub([500] * 10)
+    with pytest.raises(Exception, match="LLM request failed"):
+        _run(LLMClient(base_url=server.url).achat("hello", use_cache=False))
+    assert server.calls == settings.LLM_MAX_RETRIES + 1
+
+
+def test_achat_read_timeout_is_not_resent(stub):
+    stall = ("sleep", settings.LLM_READ_TIMEOUT * 3)
+    server = stub([stall] * 10)
+    started = time.monotonic()
+    with pytest.raises(httpx.ReadTimeout):
+        _run(LLMClient(base_url=server.url).achat("hello", use_cache=False))
+    assert server.calls == 1
+    assert time.monotonic() - started < settings.LLM_READ_TIMEOUT + 2
+
+
+def test_achat_retries_refused_connections():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    started = time.monotonic()
+    with pytest.raises(httpx.ConnectError):
+        _run(LLMClient(base_url=f"http://127.0.0.1:{port}/api/generate").achat("hello", use_cache=False))
+    # Every retry waited out its backoff before giving up.
+    backoff = sum(settings.LLM_BACKOFF_FACTOR * 2 ** attempt for attempt in range(settings.LLM_MAX_RETRIES))
+    assert time.monotonic() - started >= backoff
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from app.LLMs import client as llm_client
+from app.LLMs.client import LLMClient
+from app.LLMs.limiter import AdaptiveLimiter
+from app.LLMs.router import LLMRouter
+from tests.stub_llm import StubLLMServer
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def make(script=None, response='{"questions": []}', health_status=200):
+        server = StubLLMServer(script, response=response, health_status=health_status)
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.close()
+    llm_client.close_session()
+
+
+def _client(router: LLMRouter) -> LLMClient:
+    client = LLMClient(base_url=router.endpoints[0].url)
+    client.router = router
+    return client
+
+
+def test_failing_endpoint_is_ejected_and_traffic_fails_over(stub):
+    bad, good = stub([503] * 100), stub()
+    router = LLMRouter([bad.url, good.url], eject_after=2)
+    client = _client(router)
+
+    outcomes = []
+    for _ in range(6):
+        try:
+            outcomes.append(client.chat("hello", use_cache=False))
+        except Exception:
+            outcomes.append(None)
+
+    bad_endpoint, good_endpoint = router.endpoints
+    assert not bad_endpoint.healthy
+    assert bad_endpoint.ejections == 1
+    # Once ejected, every call lands on the healthy node.
+    assert outcomes[-3:] == ['{"questions": []}'] * 3
+    assert good.calls >= 3
+    calls_at_ejection = bad.calls
+    client.chat("hello", use_cache=False)
+    assert bad.calls == calls_at_ejection
+
+
+def test_ejected_endpoint_is_readmitted_by_probe(stub):
+    bad, good = stub([503] * 3, health_status=503), stub()
+    router = LLMRouter([bad.url, good.url], eject_after=1)
+    with pytest.raises(Exception):
+        _client(router).chat("hello", use_cache=False)
+    assert not router.endpoints[0].healthy
+
+    router.probe()
+    assert not router.endpoints[0].healthy
+    bad.health_status = 200
+    router.probe()
+    assert router.endpoints[0].healthy
+
+
+def test_hedged_call_holds_limiter_slot_until_loser_finishes(stub, monkeypatch):
+    slow, fast = stub([("sleep", 0.4)]), stub()
+    router = LLMRouter([slow.url, fast.url], hedge=True, hedge_min_samples=1)
+    router.endpoints[0].latency_ewma, router.endpoints[1].latency_ewma = 0.01, 1.0
+    router._latencies.append(0.05)
+    limiter = AdaptiveLimiter(initial_limit=4)
+    monkeypatch.setattr(llm_client, "limiter", limiter)
+
+    released = threading.Event()
+    release = limiter.release
+    monkeypatch.setattr(limiter, "release", lambda latency, ok: (release(latency, ok), released.set()))
+
+    started = time.monotonic()
+    assert _client(router).chat("hello", use_cache=False) == '{"questions": []}'
+    assert time.monotonic() - started < 0.35
+    assert router.hedge_wins == 1
+    # The slow attempt is still on the server, so its slot is still taken.
+    assert limiter.in_flight == 1
+    assert released.wait(2)
+    assert limiter.in_flight == 0
+    router.stop()
+
+
+def test_single_ejected_endpoint_is_readmitted_by_a_successful_call(stub):
+    server = stub([503] * 3)
+    router = LLMRouter([server.url], eject_after=1)
+    client = _client(router)
+    with pytest.raises(Exception):
+        client.chat("hello", use_cache=False)
+    assert not router.endpoints[0].healthy
+
+    # No prober runs for one endpoint; fail-open routing reaches it anyway.
+    assert client.chat("hello", use_cache=False) == '{"questions": []}'
+    assert router.endpoints[0].healthy
@@ -0,0 +1,96 @@
+import time
+import uuid
+
+import app.db.models  # noqa: F401  (registers every mapper)
+import app.db.models.profile  # noqa: F401
+from app.core.principal import PrincipalCache
+from app.core.security import create_access_token, decode_access_token
+from app.db.models.user import User
+
+
+def _cache(users, token_lifetime_seconds=3600):
+    lookups = []
+
+    def load_user(sub):
+        lookups.append(sub)
+        return users.get(sub)
+
+    return PrincipalCache(load_user, ttl_seconds=60, token_lifetime_seconds=token_lifetime_seconds), lookups
+
+
+def test_token_issued_before_change_falls_back_to_database():
+    user = User(id=uuid.uuid4(), email="new@example.com", hashed_password="x")
+    cache, lookups = _cache({str(user.id): user})
+    payload = decode_access_token(create_access_token({"sub": str(user.id), "email": "old@example.com"}))
+
+    cache.invalidate(user.id)
+    assert cache.resolve(payload).email == "new@example.com"
+    assert lookups == [str(user.id)]
+
+
+def test_change_records_expire_with_token_lifetime(monkeypatch):
+    cache, _ = _cache({}, token_lifetime_seconds=60)
+    now = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    for _ in range(100):
+        cache.invalidate(uuid.uuid4())
+    assert cache.stats()["changed_users"] == 100
+
+    now[0] += 61
+    cache.invalidate(uuid.uuid4())
+    assert cache.stats()["changed_users"] == 1
+
+
+def test_rehash_is_not_a_credential_change(monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.core import principal
+    from app.db.repositories.user import UserRepository
+
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    invalidated = []
+    monkeypatch.setattr(principal.principals, "invalidate", invalidated.append)
+
+    with Session(engine) as db:
+        user = User(id=uuid.uuid4(), email="a@example.com", hashed_password="old")
+        db.add(user)
+        db.commit()
+        repo = UserRepository(db)
+
+        repo.rehash_password(user, "rehashed")
+        assert invalidated == []
+        assert repo.get_by_id(user.id).hashed_password == "rehashed"
+
+        user.email = "b@example.com"
+        db.commit()
+        assert invalidated == [user.id]
+
+
+def test_token_without_role_claim_loads_role_from_database():
+    user = User(id=uuid.uuid4(), email="t@example.com", hashed_password="x", role="teacher")
+    cache, lookups = _cache({str(user.id): user})
+    payload = decode_access_token(create_access_token({"sub": str(user.id), "email": user.email}))
+
+    principal = cache.resolve(payload)
+    assert principal.role == "teacher" and principal.is_staff
+    assert lookups == [str(user.id)]
+
+
+def test_claims_are_rechecked_against_database_after_ttl(monkeypatch):
+    user = User(id=uuid.uuid4(), email="a@example.com", hashed_password="x", role="teacher")
+    cache, lookups = _cache({str(user.id): user})
+    payload = decode_access_token(create_access_token({"sub": str(user.id), "email": user.email, "role": "teacher"}))
+    now = [time.time()]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    assert cache.resolve(payload).is_staff
+    assert lookups == []
+
+    # Demoted by another process: no invalidation reaches this cache.
+    user.role = "student"
+    now[0] = payload["iat"] + 61
+    assert not cache.resolve(payload).is_staff
+    assert lookups == [str(user.id)]
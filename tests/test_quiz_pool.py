@@ -0,0 +1,42 @@
+import threading
+from types import SimpleNamespace
+
+from app.api.quiz.pool import QuizPool, profile_fingerprint
+from app.core import prompts
+
+PROFILE = {
+    "user_id": "8d5b6c1e-0000-0000-0000-000000000001",
+    "name": "Priya Sharma", "age": 16, "gender": "Female", "education": "Grade 10",
+    "city": "Nagpur", "hobbies": ["Chess", "astronomy"], "bio": "Lives near the old fort",
+}
+
+
+def test_refill_prompt_carries_no_identifying_fields():
+    generated = []
+    done = threading.Event()
+
+    def generate(profile_data):
+        generated.append(profile_data)
+        done.set()
+        return [{"question_text": "Q?"}]
+
+    pool = QuizPool(generate, max_per_fingerprint=1)
+    pool.start()
+    try:
+        pool.take(PROFILE)
+        assert done.wait(5)
+    finally:
+        pool.stop()
+
+    template = generated[0]
+    assert profile_fingerprint(template) == profile_fingerprint(PROFILE)
+    prompt = prompts.build_quiz_prompt(SimpleNamespace(**template))
+    for value in ("Priya", "Sharma", "Female", "Nagpur", "old fort", PROFILE["user_id"]):
+        assert value not in prompt
+
+
+def test_take_does_not_queue_refills_when_pool_is_not_running():
+    pool = QuizPool(lambda profile_data: [{"question_text": "Q?"}])
+    assert pool.take(PROFILE) is None
+    assert pool.stats()["refill_queue"] == 0
+    assert all(entry.refilling == 0 for entry in pool._entries.values())
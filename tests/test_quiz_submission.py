@@ -0,0 +1,12 @@
+import asyncio
+import uuid
+
+from app.api.quiz.services import AsyncQuizService, QuizService
+
+
+def test_empty_submission_touches_nothing():
+    # No repositories or vector store: an empty submission must return before using them.
+    user_id, quiz_id = uuid.uuid4(), uuid.uuid4()
+    expected = {"status": "saved", "embedded": 0}
+    assert QuizService(None, None, None, None, None).process_quiz_response(user_id, quiz_id, []) == expected
+    assert asyncio.run(AsyncQuizService(None, None, None, None, None).process_quiz_response(user_id, quiz_id, [])) == expected
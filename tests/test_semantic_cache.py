@@ -0,0 +1,51 @@
+import hashlib
+import uuid
+
+import pytest
+
+from app.api.feedback.semantic_cache import SemanticFeedbackCache, salient_text
+from app.vectorDB.vector_store import ChromaVectorStore, close_vector_stores
+
+
+class HashEmbedder:
+    """Deterministic stand-in for the sentence model: equal text, equal vector."""
+
+    def embed(self, texts):
+        return [[b / 255 for b in hashlib.sha256(text.encode()).digest()[:16]] for text in texts]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    store = ChromaVectorStore(
+        persist_directory=str(tmp_path),
+        collection_name="feedback_cache_test",
+        collection_metadata={"hnsw:space": "cosine"},
+    )
+    yield SemanticFeedbackCache(HashEmbedder(), store, threshold=0.92)
+    close_vector_stores()
+
+
+def _store(cache, text, user_id, feedback_text="Keep practising loops, Alice."):
+    embedding = cache.embed(text)
+    cache.store(embedding, text, uuid.uuid4(), {"feedback_text": feedback_text, "follow_up_suggestion": ""}, user_id)
+    return embedding
+
+
+def test_same_user_same_request_hits(cache):
+    user = uuid.uuid4()
+    text = salient_text(["python", "loops"], None, ["No similar answers found in vector DB."])
+    embedding = _store(cache, text, user)
+
+    match = cache.lookup(embedding, user)
+    assert match is not None
+    assert match["feedback_text"] == "Keep practising loops, Alice."
+
+
+def test_other_user_with_same_tags_misses(cache):
+    alice, bob = uuid.uuid4(), uuid.uuid4()
+    # Users with no prior answers produce identical salient text.
+    text = salient_text(["python", "loops"], None, ["No similar answers found in vector DB."])
+    _store(cache, text, alice)
+
+    assert salient_text(["loops", "python"], None, ["No similar answers found in vector DB."]) == text
+    assert cache.lookup(cache.embed(text), bob) is None
@@ -0,0 +1,29 @@
+import pytest
+
+from app.jobs.webhooks import check_webhook_url
+
+
+@pytest.mark.parametrize("url", [
+    "http://8.8.8.8/hook",
+    "https://127.0.0.1/hook",
+    "https://10.0.0.5/hook",
+    "https://169.254.169.254/latest/meta-data",
+    "https://[::1]/hook",
+    "https://[::ffff:192.168.1.1]/hook",
+    "https://localhost/hook",
+])
+def test_rejects_non_https_and_internal_targets(url):
+    with pytest.raises(ValueError):
+        check_webhook_url(url)
+
+
+def test_accepts_public_https_target():
+    check_webhook_url("https://8.8.8.8/hook")
+
+
+def test_allowlist_restricts_hosts(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "JOB_WEBHOOK_ALLOWED_HOSTS", "hooks.example.com")
+    with pytest.raises(ValueError, match="not allowed"):
+        check_webhook_url("https://8.8.8.8/hook")